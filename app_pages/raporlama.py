@@ -0,0 +1,337 @@
+import streamlit as st
+import db_manager
+import apa_formatter
+import citation_styles
+import report_builder
+import report_export
+import rerun_profiler
+from datetime import date
+
+st.title("📊 Yönetici Rapor Ekranı")
+
+# Start loading the publications in the background while the admin logs in
+# and picks the filters; "Raporu Getir" then usually finds them in memory
+db_manager.warm_up()
+
+if 'admin_unlocked' not in st.session_state:
+    st.session_state.admin_unlocked = False
+
+if not st.session_state.admin_unlocked:
+    password = st.text_input("Yönetici Şifresi", type="password")
+    if st.button("Giriş Yap"):
+        if password == "1379":
+            st.session_state.admin_unlocked = True
+            st.rerun()
+        else:
+            st.error("Hatalı Şifre!")
+else:
+    if st.button("Çıkış Yap"):
+        st.session_state.admin_unlocked = False
+        st.rerun()
+
+    st.markdown("---")
+
+    # Full-text search
+    with st.expander("🔎 Tam Metin Arama", expanded=False):
+        st.caption("Başlık, dergi, kitap adı, yayınevi ve yazar adlarında arar. Türkçe karakter ve büyük/küçük harf duyarsızdır.")
+        search_query = st.text_input(
+            "Arama",
+            placeholder="Örn: kamu politikası",
+            key="fts_query",
+            label_visibility="collapsed"
+        )
+        if search_query.strip():
+            with rerun_profiler.section("Arama"):
+                search_results = db_manager.search_publications(search_query)
+            if search_results:
+                st.success(f"✅ {len(search_results)} yayın bulundu (en ilgili üstte):")
+                for idx, pub in enumerate(search_results, 1):
+                    citation = apa_formatter.get_citation(pub)
+                    ptype = pub.get('publication_type', 'Makale')
+                    st.markdown(f"**{idx}. [{ptype}]** {citation}")
+            else:
+                st.warning(f"'{search_query}' için sonuç bulunamadı.")
+
+    # Stored citations made by an older formatter version
+    with st.expander("🛠️ Atıf Bakımı", expanded=False):
+        st.caption("Atıflar kayıt sırasında hesaplanıp saklanır. Biçimlendirici güncellendiğinde "
+                   "eski sürümle üretilmiş atıfları buradan toplu olarak yenileyebilirsiniz.")
+        if st.button("Eski Atıfları Yenile"):
+            progress_bar = st.progress(0.0, text="Atıflar yenileniyor...")
+            try:
+                updated = db_manager.regenerate_citations(
+                    on_progress=lambda done, total: progress_bar.progress(done / total, text=f"Atıflar yenileniyor ({done}/{total})")
+                )
+            except db_manager.StorageError as e:
+                st.error(str(e))
+            else:
+                progress_bar.empty()
+                if updated:
+                    st.success(f"✅ {updated} atıf yenilendi.")
+                else:
+                    st.info("Tüm atıflar güncel.")
+
+    # Per-rerun timings for diagnosing slow pages, shown in the sidebar
+    with st.expander("⏱️ Performans Profili", expanded=False):
+        st.caption("Açıkken bu oturumdaki her yeniden çalıştırmanın bölüm süreleri kenar çubuğunda "
+                   "gösterilir ve indirilebilir. Yalnızca sizin oturumunuzu etkiler; çıkış yapınca kapanır.")
+        profiling = st.checkbox("Profillemeyi aç", value=rerun_profiler.is_enabled(st.session_state))
+        use_cprofile = st.checkbox(
+            "cProfile çıktısı da topla (sayfayı yavaşlatır)",
+            value=bool(st.session_state.get(rerun_profiler.CPROFILE_KEY)),
+            disabled=not profiling
+        )
+        rerun_profiler.configure(st.session_state, profiling, use_cprofile)
+
+    st.markdown("---")
+    st.markdown("### Rapor Filtreleme")
+
+    # Department Selection
+    st.markdown("#### 🏛️ Bölüm Seçimi")
+    selected_department = st.selectbox(
+        "Bölüm Seçiniz:",
+        [
+            "Tümü",
+            "Siyaset Bilimi ve Kamu Yönetimi",
+            "İktisat",
+            "İşletme",
+            "Maliye",
+            "Ekonometri",
+            "Uluslararası İlişkiler"
+        ]
+    )
+
+    st.markdown("---")
+
+    # Report Type Selection
+    report_type = st.selectbox(
+        "Raporlama Türü",
+        ["Bölüm ve Tür Bazında Detaylı Rapor", "Tüm Yayınlar", "Yayın Türü Bazında", "Kişi Bazında"]
+    )
+
+    citation_style = st.selectbox(
+        "Atıf Stili",
+        list(citation_styles.STYLES),
+        format_func=citation_styles.STYLE_LABELS.get
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Başlangıç Tarihi", value=date(2025, 1, 1))
+    with col2:
+        end_date = st.date_input("Bitiş Tarihi", value=date(2026, 1, 1))
+
+    # Additional filters based on report type
+    selected_pub_type = None
+    selected_person = None
+
+    if report_type == "Yayın Türü Bazında":
+        selected_pub_type = st.selectbox(
+            "Yayın Türü Seçiniz",
+            ["Makale", "Kitap", "Kitap Bölümü", "Bildiri", "Proje"]
+        )
+    elif report_type == "Kişi Bazında":
+        st.info("Yazar soyadını yazınız (Örn: Yılmaz). Yılmaz / Yilmaz / YILMAZ gibi yazım farkları aynı kişi olarak birleştirilir.")
+        selected_person = st.text_input("Yazar Soyadı")
+
+    with st.expander("📈 Yayın Sayıları (Bölüm × Tür × Yıl)", expanded=False):
+        st.caption("Seçilen tarih aralığındaki yayın sayıları; kayıtların tamamı indirilmeden sunucuda hesaplanır.")
+        if st.button("Sayıları Getir"):
+            with rerun_profiler.section("Yayın sayıları"):
+                counts = db_manager.get_publication_counts(start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+            if selected_department != "Tümü":
+                counts = [c for c in counts if c['department'] == selected_department]
+            if counts:
+                st.markdown(f"**Toplam: {sum(c['count'] for c in counts)} yayın**")
+                st.dataframe(
+                    [
+                        {"Bölüm": c['department'] or "Belirtilmemiş", "Tür": c['publication_type'],
+                         "Yıl": c['year'], "Sayı": c['count']}
+                        for c in counts
+                    ],
+                    hide_index=True,
+                    use_container_width=True
+                )
+            else:
+                st.warning("Bu tarih aralığında yayın bulunamadı.")
+
+    if st.button("Raporu Getir"):
+        s_date_str = start_date.strftime("%Y-%m-%d")
+        e_date_str = end_date.strftime("%Y-%m-%d")
+
+        with st.spinner("Google Sheets'ten veriler çekiliyor..."), rerun_profiler.section("Veri yükleme"):
+            query = db_manager.query_publications(s_date_str, e_date_str)
+
+        # Conditions are only collected here; the records are read once, below
+        if not query.exists():
+            st.warning("Bu tarih aralığında yayın bulunamadı.")
+        else:
+            # Apply department filter first
+            if selected_department != "Tümü":
+                query = query.where(department=selected_department)
+
+            if not query.exists():
+                st.warning(f"{selected_department} bölümünde bu tarih aralığında yayın bulunamadı.")
+            else:
+                # Apply additional filters
+                person_sections = None
+
+                if report_type == "Yayın Türü Bazında" and selected_pub_type:
+                    filtered_pubs = query.where(publication_type=selected_pub_type).to_list()
+
+                elif report_type == "Kişi Bazında" and selected_person:
+                    # Resolve spelling variants ("Yılmaz, Ahmet" / "Yilmaz, A.") to canonical authors
+                    publications = query.to_list()
+                    with rerun_profiler.section("Yazar eşleştirme"):
+                        resolver = db_manager.resolve_authors(publications)
+                        filtered_pubs, person_sections = report_builder.group_by_person(resolver, publications, selected_person)
+
+                else:
+                    filtered_pubs = query.to_list()
+
+                if not filtered_pubs:
+                    st.warning("Seçilen kriterlere uygun yayın bulunamadı.")
+                else:
+                    # Big reports are formatted and rendered in a process pool
+                    executor = report_builder.get_process_pool() if report_builder.should_parallelize(filtered_pubs) else None
+                    progress_bar = st.progress(0.0, text="Rapor hazırlanıyor...") if executor else None
+
+                    def show_progress(label):
+                        def on_progress(done, total):
+                            progress_bar.progress(done / total, text=f"{label} ({done}/{total})")
+                        return on_progress if progress_bar else None
+
+                    with rerun_profiler.section("Rapor gruplama ve atıflar"):
+                        chunk_blocks = report_builder.build_report(
+                            filtered_pubs, report_type, person_sections,
+                            executor=executor, on_progress=show_progress("Atıflar biçimlendiriliyor"),
+                            style=citation_style
+                        )
+                        report_text = "".join(report_builder.blocks_to_markdown(blocks) for blocks in chunk_blocks)
+
+                    if report_type == "Bölüm ve Tür Bazında Detaylı Rapor":
+                        st.subheader(f"📊 Detaylı Rapor - Toplam {len(filtered_pubs)} Yayın")
+                    elif report_type == "Tüm Yayınlar":
+                        st.subheader(f"Bulunan Yayınlar ({len(filtered_pubs)})")
+                    elif report_type == "Yayın Türü Bazında":
+                        st.subheader(f"{selected_pub_type} - {len(filtered_pubs)} Yayın")
+                    elif report_type == "Kişi Bazında":
+                        st.subheader(f"{selected_person} - {len(filtered_pubs)} Yayın")
+
+                    # One markdown element per chunk instead of one per citation
+                    with rerun_profiler.section("Rapor ekranı"):
+                        h2_icon = {"Bölüm ve Tür Bazında Detaylı Rapor": "📄 ", "Kişi Bazında": "👤 "}.get(report_type, "")
+                        for blocks in chunk_blocks:
+                            lines = []
+                            for block in blocks:
+                                if block[0] == 'h1':
+                                    lines.append(f"### 🏛️ {block[1]}")
+                                elif block[0] == 'h2':
+                                    lines.append(f"#### {h2_icon}{block[1]}")
+                                else:
+                                    _, idx, ptype, citation = block
+                                    if ptype:
+                                        lines.append(f"**{idx}. [{ptype}]** {citation}")
+                                    else:
+                                        lines.append(f"**{idx}.** {citation}")
+                            st.markdown("\n\n".join(lines))
+                            if report_type == "Bölüm ve Tür Bazında Detaylı Rapor":
+                                st.markdown("---")
+
+                    st.markdown("---")
+                    st.subheader("📥 Dışa Aktarma")
+
+                    col_exp1, col_exp2, col_exp3 = st.columns(3)
+
+                    with col_exp1:
+                        # Word Export
+                        try:
+                            with rerun_profiler.section("Word belgesi"):
+                                docx_buffer = report_builder.build_docx(
+                                    chunk_blocks, executor=executor, on_progress=show_progress("Word belgesi oluşturuluyor")
+                                )
+
+                            st.download_button(
+                                label="📄 Word İndir (.docx)",
+                                data=docx_buffer,
+                                file_name=f"yayin_raporu_{start_date.strftime('%Y%m%d')}.docx",
+                                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                                use_container_width=True
+                            )
+                        except ImportError:
+                            st.warning("Word export için 'python-docx' paketi gerekli. Lütfen yükleyin: pip install python-docx")
+
+                    with col_exp2:
+                        # PDF Export with Turkish support
+                        # (page layout is sequential, so the PDF is always built in this process)
+                        try:
+                            with rerun_profiler.section("PDF belgesi"):
+                                pdf_buffer = report_export.build_pdf(report_text)
+
+                            st.download_button(
+                                label="📕 PDF İndir (.pdf)",
+                                data=pdf_buffer,
+                                file_name=f"yayin_raporu_{start_date.strftime('%Y%m%d')}.pdf",
+                                mime="application/pdf",
+                                use_container_width=True
+                            )
+                        except Exception as e:
+                            st.error(f"PDF oluşturulurken hata: {str(e)}")
+                            st.warning("PDF export için 'reportlab' paketi gerekli.")
+
+                    with col_exp3:
+                        # BibTeX is generated only when the button is clicked
+                        # (download callables must return str, bytes or an io buffer)
+                        def bibtex_file(pubs=filtered_pubs):
+                            import bibtex_export
+                            return "".join(bibtex_export.iter_bibtex(pubs)).encode('utf-8')
+
+                        st.download_button(
+                            label="📚 BibTeX İndir (.bib)",
+                            data=bibtex_file,
+                            file_name=f"yayinlar_{start_date.strftime('%Y%m%d')}.bib",
+                            mime="application/x-bibtex",
+                            use_container_width=True
+                        )
+
+                    # Tabular export: one row per publication, generated only when a button is clicked
+                    st.caption("Tablo olarak (her satırda bir yayın; yazarlar ve editörler tek hücrede):")
+                    col_tab1, col_tab2 = st.columns(2)
+
+                    with col_tab1:
+                        def csv_file(pubs=filtered_pubs, style=citation_style):
+                            import tabular_export
+                            # utf-8-sig so that Excel shows Turkish characters correctly
+                            return "".join(tabular_export.iter_csv_chunks(pubs, style=style)).encode('utf-8-sig')
+
+                        st.download_button(
+                            label="🧾 CSV İndir (.csv)",
+                            data=csv_file,
+                            file_name=f"yayin_tablosu_{start_date.strftime('%Y%m%d')}.csv",
+                            mime="text/csv",
+                            use_container_width=True
+                        )
+
+                    with col_tab2:
+                        try:
+                            import openpyxl  # noqa: F401  (only checks that Excel export is available)
+
+                            def xlsx_file(pubs=filtered_pubs, style=citation_style):
+                                import io
+                                import tabular_export
+                                buffer = io.BytesIO()
+                                tabular_export.write_xlsx(pubs, buffer, style=style)
+                                return buffer.getvalue()
+
+                            st.download_button(
+                                label="📗 Excel İndir (.xlsx)",
+                                data=xlsx_file,
+                                file_name=f"yayin_tablosu_{start_date.strftime('%Y%m%d')}.xlsx",
+                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                                use_container_width=True
+                            )
+                        except ImportError:
+                            st.warning("Excel export için 'openpyxl' paketi gerekli. Lütfen yükleyin: pip install openpyxl")
+
+                    if progress_bar:
+                        progress_bar.empty()
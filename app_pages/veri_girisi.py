@@ -0,0 +1,470 @@
+import streamlit as st
+import db_manager
+import apa_formatter
+import turkish_text
+import rerun_profiler
+from datetime import date
+
+# --- Session State for Dynamic Rows ---
+if 'num_authors' not in st.session_state:
+    st.session_state.num_authors = 1
+if 'num_editors' not in st.session_state:
+    st.session_state.num_editors = 1
+
+# --- Pre-fill State Helper ---
+def prefill_state(key, value):
+    if value:
+        st.session_state[key] = value
+
+# --- Autocomplete Helper ---
+def apply_suggestion(key):
+    if st.session_state.get(f"ac_{key}"):
+        st.session_state[key] = st.session_state[f"ac_{key}"]
+
+def show_suggestions(field, key, value):
+    """Stored spellings starting with what was typed into `key`; picking one fills the field."""
+    with rerun_profiler.section("Otomatik tamamlama"):
+        typed = turkish_text.search_key(value.strip()) if value else ""
+        options = [s for s in db_manager.suggest(field, value) if turkish_text.search_key(s) != typed]
+    if options:
+        st.pills("Öneriler", options, key=f"ac_{key}", label_visibility="collapsed",
+                 on_change=apply_suggestion, args=(key,))
+
+st.title("📚 Yayın Veri Girişi")
+
+# Session State
+if 'reset_counter' not in st.session_state:
+    st.session_state.reset_counter = 0
+rk = str(st.session_state.reset_counter)
+
+# Success message (compact)
+if 'success_msg' in st.session_state:
+    st.success(st.session_state.success_msg)
+
+# My Publications Search Section
+with st.expander("🔍 Kayıtlarımı Görüntüle", expanded=False):
+    st.markdown("**Daha önce girdiğiniz yayınları görmek için soyadınızı yazın:**")
+
+    col_search1, col_search2 = st.columns([3, 1])
+    with col_search1:
+        search_surname = st.text_input(
+            "Soyad",
+            placeholder="Örn: Yılmaz",
+            key="search_surname_input",
+            label_visibility="collapsed"
+        )
+    with col_search2:
+        search_button = st.button("🔎 Ara", use_container_width=True)
+
+    if search_button and search_surname:
+        # Search publications by surname
+        all_pubs = db_manager.get_all_publications()
+
+        if all_pubs:
+            # Filter by surname (Turkish case- and diacritic-insensitive)
+            search_lower = turkish_text.search_key(search_surname.strip())
+            matching_pubs = []
+
+            for pub in all_pubs:
+                authors = pub.get('authors', [])
+                if isinstance(authors, list):
+                    for author in authors:
+                        surname = turkish_text.search_key(author.get('surname', '').strip())
+                        if search_lower in surname or surname in search_lower:
+                            matching_pubs.append(pub)
+                            break
+
+            if matching_pubs:
+                st.success(f"✅ {len(matching_pubs)} yayın bulundu:")
+
+                # Group by type
+                grouped = {}
+                for pub in matching_pubs:
+                    ptype = pub.get('publication_type', 'Diğer')
+                    if ptype not in grouped:
+                        grouped[ptype] = []
+                    grouped[ptype].append(pub)
+
+                # Display grouped publications
+                for ptype in ["Makale", "Kitap", "Kitap Bölümü", "Bildiri", "Proje", "Diğer"]:
+                    if ptype in grouped:
+                        st.markdown(f"**{ptype} ({len(grouped[ptype])})**")
+                        for idx, pub in enumerate(grouped[ptype], 1):
+                            citation = apa_formatter.get_citation(pub)
+                            st.markdown(f"{idx}. {citation}")
+                        st.markdown("")
+            else:
+                st.warning(f"'{search_surname}' soyadıyla kayıt bulunamadı.")
+        else:
+            st.info("Henüz hiç yayın kaydedilmemiş.")
+    elif search_button and not search_surname:
+        st.warning("Lütfen soyadınızı girin.")
+
+st.markdown("---")
+
+
+# Top row: Department, Type, New Button
+col_t1, col_t2, col_t3 = st.columns([2, 2, 1])
+
+with col_t1:
+    department = st.selectbox(
+        "Bölüm",
+        [
+            "Siyaset Bilimi ve Kamu Yönetimi",
+            "İktisat",
+            "İşletme",
+            "Maliye",
+            "Ekonometri",
+            "Uluslararası İlişkiler"
+        ]
+    )
+
+with col_t2:
+    # Handle BibTeX publication type
+    pub_types = ["Makale", "Kitap", "Kitap Bölümü", "Bildiri", "Proje"]
+
+    # If BibTeX type exists, set it in session state for the widget
+    if 'bibtex_pub_type' in st.session_state:
+        bibtex_type = st.session_state['bibtex_pub_type']
+        if bibtex_type in pub_types:
+            # Set the widget's session state value directly
+            st.session_state['pub_type_selectbox'] = bibtex_type
+        # Clear the flag
+        del st.session_state['bibtex_pub_type']
+
+    # Initialize if not present
+    if 'pub_type_selectbox' not in st.session_state:
+        st.session_state['pub_type_selectbox'] = "Makale"
+
+    pub_type = st.selectbox(
+        "Yayın Türü",
+        pub_types,
+        key='pub_type_selectbox'
+    )
+
+with col_t3:
+    if st.button("🆕 Yeni", type="secondary", use_container_width=True, help="Formu temizle"):
+        # Increment reset counter
+        st.session_state.reset_counter += 1
+
+        # Clear ALL form-related session state keys
+        keys_to_delete = []
+        for key in list(st.session_state.keys()):
+            # Comprehensive pattern matching
+            if any(pattern in key for pattern in [
+                'input_', 'surname_', 'name_', 'ed_surname_', 'ed_name_',
+                'last_bib_file', 'show_date_msg', 'success_msg', 
+                'bibtex_pub_type', 'pub_type_selectbox', 'bibtex_uploader_', 'bib_entries', 'bib_errors',
+                'duplicate_confirmed',
+                'del_auth_', 'del_ed_', 'add_auth_', 'add_ed_'
+            ]):
+                keys_to_delete.append(key)
+
+        for key in keys_to_delete:
+            del st.session_state[key]
+
+        # Reset counters
+        st.session_state.num_authors = 1
+        st.session_state.num_editors = 1
+
+        st.rerun()
+
+# BibTeX Upload (Compact Expander)
+with st.expander("📂 BibTeX Yükle", expanded=False):
+    # Use reset_counter in key to force recreation
+    uploaded_file = st.file_uploader("", type=['bib'], label_visibility="collapsed", key=f'bibtex_uploader_{rk}')
+
+    if uploaded_file is None:
+        if 'last_bib_file' in st.session_state:
+            del st.session_state.last_bib_file
+        if 'bib_entries' in st.session_state:
+            del st.session_state.bib_entries
+        st.session_state.pop('bib_errors', None)
+    else:
+        file_signature = f"{uploaded_file.name}_{uploaded_file.size}"
+        if 'last_bib_file' not in st.session_state or st.session_state.last_bib_file != file_signature:
+            # Imported lazily: bibtexparser is only needed once a file is uploaded
+            import bibtex_helper
+            string_data = uploaded_file.getvalue().decode("utf-8")
+            with st.spinner("BibTeX dosyası okunuyor..."), rerun_profiler.section("BibTeX okuma"):
+                try:
+                    # Large files are parsed in worker processes; broken entries are reported, not fatal
+                    entries, bib_errors = bibtex_helper.parse_bibtex_file(string_data)
+                except Exception as e:
+                    print(f"BibTeX Error: {e}")
+                    entries, bib_errors = [], []
+            st.session_state.bib_errors = bib_errors
+            parsed = entries[0] if len(entries) == 1 else None
+
+            if len(entries) > 1:
+                # Multi-entry file: offered for bulk import below instead of prefilling the form
+                st.session_state.last_bib_file = file_signature
+                st.session_state.bib_entries = entries
+            elif parsed:
+                st.session_state.last_bib_file = file_signature
+                st.success("✅ Yüklendi!")
+
+                # Store publication type separately (will be used in selectbox index)
+                if 'publication_type' in parsed:
+                    st.session_state['bibtex_pub_type'] = parsed['publication_type']
+
+                prefill_state(f'title_input_{rk}', parsed.get('title'))
+
+                if 'publication_date' in parsed:
+                    st.session_state[f'pub_date_input_{rk}'] = parsed['publication_date']
+                    st.session_state['show_date_msg'] = True
+
+                if 'authors' in parsed and parsed['authors']:
+                    auths = parsed['authors']
+                    st.session_state.num_authors = len(auths)
+                    for idx, auth in enumerate(auths, 1):
+                        prefill_state(f"surname_{idx}_{rk}", auth.get('surname'))
+                        prefill_state(f"name_{idx}_{rk}", auth.get('name'))
+
+                if 'editors' in parsed and parsed['editors']:
+                    eds = parsed['editors']
+                    st.session_state.num_editors = len(eds)
+                    for idx, ed in enumerate(eds, 1):
+                        prefill_state(f"ed_surname_{idx}_{rk}", ed.get('surname'))
+                        prefill_state(f"ed_name_{idx}_{rk}", ed.get('name'))
+
+                prefill_state(f'journal_name_input_{rk}', parsed.get('journal_name'))
+                prefill_state(f'volume_input_{rk}', parsed.get('volume'))
+                prefill_state(f'issue_input_{rk}', parsed.get('issue'))
+                prefill_state(f'pages_input_{rk}', parsed.get('pages'))
+                prefill_state(f'publisher_input_{rk}', parsed.get('publisher'))
+                prefill_state(f'location_input_{rk}', parsed.get('location'))
+                prefill_state(f'book_title_input_{rk}', parsed.get('book_title'))
+
+                st.rerun()
+            else:
+                st.warning("Dosya okunamadı")
+
+        if st.session_state.get('bib_entries'):
+            entries = st.session_state.bib_entries
+            st.info(f"📚 Dosyada {len(entries)} kayıt bulundu. Tümü '{department}' bölümüne aktarılabilir; kayıtlı bir yayının tekrarı olanlar atlanır.")
+            bib_errors = st.session_state.get('bib_errors') or []
+            if bib_errors:
+                st.warning(f"{len(bib_errors)} kayıt okunamadı:")
+                for number, key, message in bib_errors[:20]:
+                    st.markdown(f"- {number}. kayıt ({key or 'anahtarsız'}): {message}")
+                if len(bib_errors) > 20:
+                    st.caption(f"... ve {len(bib_errors) - 20} kayıt daha.")
+
+            if st.button("📥 Tümünü İçe Aktar", key=f"bulk_import_{rk}"):
+                records = []
+                incomplete = 0
+                for entry in entries:
+                    if not entry.get('title') or not entry.get('authors') or not entry.get('publication_type'):
+                        incomplete += 1
+                        continue
+                    record = turkish_text.title_case_publication({**entry, 'department': department})
+                    if entry.get('publication_date'):
+                        record['publication_date'] = entry['publication_date'].strftime("%Y-%m-%d")
+                    records.append(record)
+
+                with st.spinner(f"{len(records)} kayıt aktarılıyor..."), rerun_profiler.section("Toplu içe aktarma"):
+                    added, skipped, failed = db_manager.import_publications(records)
+
+                st.success(f"✅ {added} kayıt eklendi.")
+                if skipped:
+                    st.warning(f"{len(skipped)} kayıt, kayıtlı bir yayının tekrarı olduğu için atlandı:")
+                    for record, duplicates in skipped:
+                        st.markdown(f"- {apa_formatter.get_citation(record)}")
+                if incomplete:
+                    st.warning(f"{incomplete} kayıt eksik bilgi (başlık, yazar veya tür) nedeniyle atlandı.")
+                if failed:
+                    st.error(f"{failed} kayıt kaydedilemedi.")
+                del st.session_state.bib_entries
+
+# Main form in 2 columns
+col_left, col_right = st.columns([1, 1])
+
+with col_left:
+    # Title and Date
+    title = st.text_input("📝 Başlık", key=f'title_input_{rk}')
+
+    # Initialize date in session state if not present
+    if f'pub_date_input_{rk}' not in st.session_state:
+        st.session_state[f'pub_date_input_{rk}'] = date.today()
+
+    publication_date = st.date_input("📅 Tarih", key=f'pub_date_input_{rk}')
+
+    if st.session_state.get('show_date_msg'):
+        st.info("📅 BibTeX kaydında yayının tarih bilgisi yalnızca yıl olarak yer aldığından o yılın 1 Ocak tarihi olarak belirlenmiştir. Yukarıdaki alandan tarih bilgisini gün ve ayı içerecek şekilde değiştirebilirsiniz.")
+
+    # Authors (Compact)
+    st.markdown("**👥 Yazarlar**")
+    authors_data = []
+    for i in range(1, st.session_state.num_authors + 1):
+        col_a1, col_a2, col_a3 = st.columns([2, 2, 0.5])
+        with col_a1:
+            surname = st.text_input("Soyad", key=f"surname_{i}_{rk}", label_visibility="collapsed", placeholder=f"{i}. Soyadı")
+            show_suggestions('surname', f"surname_{i}_{rk}", surname)
+        with col_a2:
+            name = st.text_input("Ad", key=f"name_{i}_{rk}", label_visibility="collapsed", placeholder=f"{i}. Adı")
+            show_suggestions('name', f"name_{i}_{rk}", name)
+        with col_a3:
+            if i > 1 and st.button("✖", key=f"del_auth_{i}_{rk}", help="Çıkar"):
+                st.session_state.num_authors -= 1
+                st.rerun()
+
+        if surname and name:
+            authors_data.append({'surname': surname, 'name': name})
+
+    if st.session_state.num_authors < 5:
+        if st.button("➕ Yazar Ekle", key=f"add_auth_{rk}"):
+            st.session_state.num_authors += 1
+            st.rerun()
+
+with col_right:
+    # Type-specific fields
+    data = {}
+    missing_fields = []
+    editors_data = []
+
+    st.markdown(f"**📋 {pub_type} Bilgileri**")
+
+    if pub_type == "Makale":
+        journal_name = st.text_input("Dergi", key=f'journal_name_input_{rk}')
+        show_suggestions('journal_name', f'journal_name_input_{rk}', journal_name)
+        col_v1, col_v2, col_v3 = st.columns(3)
+        with col_v1:
+            volume = st.text_input("Cilt", key=f'volume_input_{rk}')
+        with col_v2:
+            issue = st.text_input("Sayı", key=f'issue_input_{rk}')
+        with col_v3:
+            pages = st.text_input("Sayfa", key=f'pages_input_{rk}')
+
+        if not journal_name: missing_fields.append("Dergi")
+        data.update({'journal_name': journal_name, 'volume': volume, 'issue': issue, 'pages': pages})
+
+    elif pub_type == "Kitap":
+        publisher = st.text_input("Yayınevi", key=f'publisher_input_{rk}')
+        show_suggestions('publisher', f'publisher_input_{rk}', publisher)
+        location = st.text_input("Basım Yeri", key=f'location_input_{rk}')
+        show_suggestions('location', f'location_input_{rk}', location)
+
+        if not publisher: missing_fields.append("Yayınevi")
+        if not location: missing_fields.append("Basım Yeri")
+        data.update({'publisher': publisher, 'location': location})
+
+    elif pub_type == "Kitap Bölümü":
+        book_title = st.text_input("Kitap Adı", key=f'book_title_input_{rk}')
+        show_suggestions('book_title', f'book_title_input_{rk}', book_title)
+        col_p1, col_p2 = st.columns(2)
+        with col_p1:
+            publisher = st.text_input("Yayınevi", key=f'publisher_input_{rk}')
+            show_suggestions('publisher', f'publisher_input_{rk}', publisher)
+        with col_p2:
+            location = st.text_input("Basım Yeri", key=f'location_input_{rk}')
+            show_suggestions('location', f'location_input_{rk}', location)
+        pages = st.text_input("Sayfa", key=f'pages_input_{rk}')
+
+        # Editors in expander
+        with st.expander("✏️ Editörler"):
+            for j in range(1, st.session_state.num_editors + 1):
+                col_e1, col_e2, col_e3 = st.columns([2, 2, 0.5])
+                with col_e1:
+                    e_surname = st.text_input("Soyad", key=f"ed_surname_{j}_{rk}", label_visibility="collapsed", placeholder=f"{j}. Ed. Soyadı")
+                    show_suggestions('surname', f"ed_surname_{j}_{rk}", e_surname)
+                with col_e2:
+                    e_name = st.text_input("Ad", key=f"ed_name_{j}_{rk}", label_visibility="collapsed", placeholder=f"{j}. Ed. Adı")
+                    show_suggestions('name', f"ed_name_{j}_{rk}", e_name)
+                with col_e3:
+                    if j > 1 and st.button("✖", key=f"del_ed_{j}_{rk}", help="Çıkar"):
+                        st.session_state.num_editors -= 1
+                        st.rerun()
+
+                if e_surname and e_name:
+                    editors_data.append({'surname': e_surname, 'name': e_name})
+
+            if st.session_state.num_editors < 5:
+                if st.button("➕ Editör Ekle", key=f"add_ed_{rk}"):
+                    st.session_state.num_editors += 1
+                    st.rerun()
+
+        if not book_title: missing_fields.append("Kitap Adı")
+        if not publisher: missing_fields.append("Yayınevi")
+
+        data.update({
+            'book_title': book_title,
+            'publisher': publisher,
+            'location': location,
+            'pages': pages,
+            'editors': editors_data
+        })
+
+    elif pub_type == "Bildiri":
+        conf_name = st.text_input("Konferans", key=f'book_title_input_{rk}')
+        show_suggestions('book_title', f'book_title_input_{rk}', conf_name)
+        col_c1, col_c2 = st.columns(2)
+        with col_c1:
+            location = st.text_input("Yer", key=f'location_input_{rk}')
+            show_suggestions('location', f'location_input_{rk}', location)
+        with col_c2:
+            publisher = st.text_input("Organizasyon", key=f'publisher_input_{rk}')
+            show_suggestions('publisher', f'publisher_input_{rk}', publisher)
+
+        if not conf_name: missing_fields.append("Konferans")
+        data.update({'book_title': conf_name, 'location': location, 'publisher': publisher})
+
+    elif pub_type == "Proje":
+        funding_agency = st.text_input("Destekleyen Kurum", key=f'funding_agency_input_{rk}')
+        project_status = st.text_input("Proje No", key=f'project_status_input_{rk}')
+        if not funding_agency: missing_fields.append("Kurum")
+        data.update({'funding_agency': funding_agency, 'project_status': project_status})
+
+# Save button at bottom
+st.markdown("---")
+
+# Show success message here too
+if 'success_msg' in st.session_state:
+    st.success(st.session_state.success_msg)
+
+submitted = st.button("💾 Yayını Kaydet", type="primary")
+
+if submitted:
+    if not authors_data:
+        st.error("En az 1 yazar girmelisiniz.")
+    elif pub_type == "Kitap Bölümü" and not editors_data:
+         st.error("En az 1 editör girmelisiniz.")
+    elif not title:
+        st.error("Başlık girmelisiniz.")
+    elif missing_fields:
+        st.error(f"Eksik alanlar: {', '.join(missing_fields)}")
+    else:
+        # Normalize all text fields (authors, editors, title, venue...) to Title Case
+        full_data = turkish_text.title_case_publication({
+            'department': department,
+            'publication_type': pub_type,
+            'authors': authors_data,
+            'publication_date': publication_date.strftime("%Y-%m-%d"),
+            'title': title,
+            **data
+        })
+
+        # Near-duplicate check: a second click on the same data confirms the save
+        with rerun_profiler.section("Tekrar kontrolü"):
+            duplicates = db_manager.find_duplicates(full_data)
+        data_signature = repr(sorted(full_data.items()))
+
+        if duplicates and st.session_state.get('duplicate_confirmed') != data_signature:
+            st.session_state.duplicate_confirmed = data_signature
+            st.warning("⚠️ Bu yayın daha önce kaydedilmiş olabilir (ör. başka bir bölümden ortak yazar tarafından):")
+            for dup, similarity in duplicates[:3]:
+                st.markdown(f"- [{dup.get('department', '')}] {apa_formatter.get_citation(dup)} (benzerlik: %{similarity * 100:.0f})")
+            st.info("Farklı bir yayınsa kaydetmek için '💾 Yayını Kaydet' butonuna tekrar basın.")
+        else:
+            # The citation is formatted once here and stored with the record
+            with rerun_profiler.section("Kaydetme"):
+                full_data = apa_formatter.with_citation(full_data)
+                success = db_manager.add_publication(full_data)
+
+            if success:
+                st.session_state.pop('duplicate_confirmed', None)
+                st.toast("✅ Yayın başarıyla kaydedildi!", icon="✅")
+                apa_citation = full_data['citation']
+                st.session_state.success_msg = f"**{pub_type} başarıyla veritabanına kaydedildi!**\n\n**APA Formatı:** {apa_citation}"
+                st.success(st.session_state.success_msg)
+                st.info("💡 Yeni yayın eklemek için yukarıdaki '🆕 Yeni' butonuna basın.")
@@ -1,122 +1,589 @@
-function doPost(e) {
-    var lock = LockService.getScriptLock();
-    lock.tryLock(10000);
-
-    try {
-        var doc = SpreadsheetApp.getActiveSpreadsheet();
-        var sheet = doc.getSheetByName('Yayinlar');
-
-        // Eğer sayfa yoksa oluştur ve başlıkları ekle
-        if (!sheet) {
-            sheet = doc.insertSheet('Yayinlar');
-            var headers = [
-                "id", "department", "publication_type", "authors_json", "publication_date", "title",
-                "journal_name", "volume", "issue", "pages", "publisher",
-                "location", "editors", "book_title", "project_status", "funding_agency",
-                "created_at"
-            ];
-            sheet.appendRow(headers);
-        }
-
-        var data = JSON.parse(e.postData.contents);
-
-        // Yeni bir ID oluştur (son satırdaki ID + 1)
-        var lastRow = sheet.getLastRow();
-        var newId = 1;
-        if (lastRow > 1) {
-            var lastId = sheet.getRange(lastRow, 1).getValue();
-            if (!isNaN(lastId)) {
-                newId = lastId + 1;
-            }
-        }
-
-        var row = [
-            newId,
-            data.department || "",
-            data.publication_type || "",
-            JSON.stringify(data.authors) || "[]", // Yazarları JSON string olarak sakla
-            data.publication_date || "",
-            data.title || "",
-            data.journal_name || "",
-            data.volume || "",
-            data.issue || "",
-            data.pages || "",
-            data.publisher || "",
-            data.location || "",
-            data.editors || "",
-            data.book_title || "",
-            data.project_status || "",
-            data.funding_agency || "",
-            new Date().toISOString().slice(0, 10) // created_at (YYYY-MM-DD)
-        ];
-
-        sheet.appendRow(row);
-
-        return ContentService
-            .createTextOutput(JSON.stringify({ "result": "success", "id": newId }))
-            .setMimeType(ContentService.MimeType.JSON);
-
-    } catch (e) {
-        return ContentService
-            .createTextOutput(JSON.stringify({ "result": "error", "error": e }))
-            .setMimeType(ContentService.MimeType.JSON);
-    } finally {
-        lock.releaseLock();
-    }
-}
-
-function doGet(e) {
-    var lock = LockService.getScriptLock();
-    lock.tryLock(10000);
-
-    try {
-        var doc = SpreadsheetApp.getActiveSpreadsheet();
-        var sheet = doc.getSheetByName('Yayinlar');
-
-        if (!sheet) {
-            return ContentService
-                .createTextOutput(JSON.stringify([]))
-                .setMimeType(ContentService.MimeType.JSON);
-        }
-
-        var data = sheet.getDataRange().getValues();
-        var headers = data[0];
-        var jsonData = [];
-
-        // 1. satır başlıklar, 2. satırdan itibaren veriler
-        for (var i = 1; i < data.length; i++) {
-            var row = data[i];
-            var record = {};
-
-            for (var j = 0; j < headers.length; j++) {
-                var header = headers[j];
-                var value = row[j];
-
-                // authors_json alanını tekrar nesneye çevir
-                if (header === "authors_json" && value) {
-                    try {
-                        record['authors'] = JSON.parse(value);
-                    } catch (err) {
-                        record['authors'] = [];
-                    }
-                } else {
-                    record[header] = value;
-                }
-            }
-            // 'authors' zaten işlendi, 'authors_json' key'ine gerek yok veya tutabiliriz.
-            // Python tarafı 'authors' bekliyor.
-            jsonData.push(record);
-        }
-
-        return ContentService
-            .createTextOutput(JSON.stringify(jsonData))
-            .setMimeType(ContentService.MimeType.JSON);
-
-    } catch (e) {
-        return ContentService
-            .createTextOutput(JSON.stringify({ "result": "error", "error": e }))
-            .setMimeType(ContentService.MimeType.JSON);
-    } finally {
-        lock.releaseLock();
-    }
-}
+// Veri sürümü: her başarılı kayıtta bir artar. İstemciler ?mode=version ile
+// bu sayıyı sorup değişmediyse tüm veriyi yeniden indirmekten kaçınır.
+var DATA_VERSION_KEY = "DATA_VERSION";
+
+function getDataVersion_() {
+    return Number(PropertiesService.getScriptProperties().getProperty(DATA_VERSION_KEY) || 0);
+}
+
+function bumpDataVersion_() {
+    var version = getDataVersion_() + 1;
+    PropertiesService.getScriptProperties().setProperty(DATA_VERSION_KEY, String(version));
+    return version;
+}
+
+// Kayıt anında hesaplanan APA atfı ve onu üreten biçimlendirici sürümü.
+// Bu sütunlardan önce oluşturulmuş sayfalarda başlıkların sonuna eklenir.
+var CITATION_COLUMNS = ["citation", "citation_version"];
+
+// Bölümleme: yayınlar tek sayfada değil, yıl bazında ayrı sayfalarda tutulur
+// (Yayinlar_2024, Yayinlar_2023, ...; tarihi olmayanlar Yayinlar_tarihsiz).
+// PARTITION_BY_DEPARTMENT true yapılırsa her yıl bölümlere de ayrılır
+// (Yayinlar_2024_İktisat). Okumalar yalnızca istenen tarih aralığı ve bölümle
+// kesişen sayfalara dokunur. Eski tek sayfa (Yayinlar) okunmaya devam eder;
+// partitionLegacySheet() ile bölümlere ayrılabilir.
+var LEGACY_SHEET = "Yayinlar";
+var PARTITION_PREFIX = "Yayinlar_";
+var UNDATED_PARTITION = "tarihsiz";
+var PARTITION_BY_DEPARTMENT = false;
+
+var HEADERS = [
+    "id", "department", "publication_type", "authors_json", "publication_date", "title",
+    "journal_name", "volume", "issue", "pages", "publisher",
+    "location", "editors", "book_title", "project_status", "funding_agency",
+    "created_at"
+].concat(CITATION_COLUMNS);
+
+// Sayfalar arasında tekil ID: bir sonraki ID betik özelliğinde tutulur
+var NEXT_ID_KEY = "NEXT_ID";
+// Arşiv: eski yılların sayfaları ayrı bir tabloya taşınır (archivePartitionsBefore)
+var ARCHIVE_ID_KEY = "ARCHIVE_SPREADSHEET_ID";
+var ARCHIVED_KEY = "ARCHIVED_PARTITIONS";
+
+// Kayıt isteği 10 sn içinde betik kilidini alamazsa dönen hata
+var LOCK_BUSY_ERROR = "Sunucu meşgul, kayıt yapılmadı. Lütfen tekrar deneyin.";
+
+// Sayfa adında kullanılamayan karakterler
+function sheetSafe_(text) {
+    return String(text).replace(/[\[\]*?\/\\:']/g, "-").slice(0, 60);
+}
+
+function partitionName_(date, department) {
+    var name = PARTITION_PREFIX + (/^\d{4}/.test(date) ? date.slice(0, 4) : UNDATED_PARTITION);
+    if (PARTITION_BY_DEPARTMENT && department) {
+        name += "_" + sheetSafe_(department);
+    }
+    return name;
+}
+
+// Sayfa adı -> {all: true} (eski tek sayfa) veya {year: 2024 | null (tarihsiz), department};
+// yayın sayfası değilse null
+function parsePartition_(name) {
+    if (name === LEGACY_SHEET) {
+        return { all: true };
+    }
+    var match = /^Yayinlar_(\d{4}|tarihsiz)(?:_(.+))?$/.exec(name);
+    if (!match) {
+        return null;
+    }
+    return {
+        all: false,
+        year: match[1] === UNDATED_PARTITION ? null : Number(match[1]),
+        department: match[2] || null
+    };
+}
+
+// Bölüm, istekteki filtrelerle (start/end, department) kesişiyor mu?
+function overlaps_(info, params) {
+    if (info.all) {
+        return true;
+    }
+    if (params.start && params.end) {
+        // Tarihsiz kayıtlar hiçbir tarih aralığına girmez
+        if (info.year === null || info.year < Number(params.start.slice(0, 4)) ||
+            info.year > Number(params.end.slice(0, 4))) {
+            return false;
+        }
+    }
+    if (params.department && info.department && info.department !== sheetSafe_(params.department)) {
+        return false;
+    }
+    return true;
+}
+
+function archivedPartitions_() {
+    return JSON.parse(PropertiesService.getScriptProperties().getProperty(ARCHIVED_KEY) || "[]");
+}
+
+function archiveSpreadsheet_(create) {
+    var props = PropertiesService.getScriptProperties();
+    var id = props.getProperty(ARCHIVE_ID_KEY);
+    if (id) {
+        return SpreadsheetApp.openById(id);
+    }
+    if (!create) {
+        return null;
+    }
+    var archive = SpreadsheetApp.create("Yayınlar Arşivi");
+    props.setProperty(ARCHIVE_ID_KEY, archive.getId());
+    return archive;
+}
+
+// Filtrelerle kesişen yayın sayfaları: önce etkin tablodakiler, sonra arşivdekiler.
+// Arşiv tablosu yalnızca gerekiyorsa açılır.
+function partitionSheets_(doc, params) {
+    var sheets = doc.getSheets().filter(function (sheet) {
+        var info = parsePartition_(sheet.getName());
+        return info && overlaps_(info, params);
+    });
+    var wanted = archivedPartitions_().filter(function (name) {
+        return overlaps_(parsePartition_(name), params);
+    });
+    if (wanted.length) {
+        var archive = archiveSpreadsheet_(false);
+        wanted.forEach(function (name) {
+            var sheet = archive && archive.getSheetByName(name);
+            if (sheet) {
+                sheets.push(sheet);
+            }
+        });
+    }
+    return sheets;
+}
+
+// Yazılacak bölüm sayfası; yoksa başlıklarıyla oluşturulur
+function partitionSheet_(doc, name) {
+    var sheet = doc.getSheetByName(name);
+    if (!sheet) {
+        sheet = doc.insertSheet(name);
+        sheet.appendRow(HEADERS);
+    }
+    return sheet;
+}
+
+// İlk kullanımda sayaç, mevcut sayfalardaki en büyük ID'den devam eder
+function initNextId_(doc) {
+    var props = PropertiesService.getScriptProperties();
+    if (props.getProperty(NEXT_ID_KEY)) {
+        return;
+    }
+    var next = 1;
+    partitionSheets_(doc, {}).forEach(function (sheet) {
+        var lastRow = sheet.getLastRow();
+        if (lastRow < 2) {
+            return;
+        }
+        var headers = sheet.getRange(1, 1, 1, sheet.getLastColumn()).getValues()[0];
+        sheet.getRange(2, headers.indexOf("id") + 1, lastRow - 1, 1).getValues().forEach(function (row) {
+            var id = Number(row[0]);
+            if (!isNaN(id) && id >= next) {
+                next = id + 1;
+            }
+        });
+    });
+    props.setProperty(NEXT_ID_KEY, String(next));
+}
+
+function nextId_(doc) {
+    initNextId_(doc);
+    var props = PropertiesService.getScriptProperties();
+    var id = Number(props.getProperty(NEXT_ID_KEY));
+    props.setProperty(NEXT_ID_KEY, String(id + 1));
+    return id;
+}
+
+// Satırları (sourceHeaders sırasında) hedef sayfanın sonuna tek setValues ile ekler
+function appendRows_(target, sourceHeaders, rows) {
+    if (!rows.length) {
+        return;
+    }
+    var headers = ensureColumns_(target, sourceHeaders);
+    var positions = headers.map(function (header) { return sourceHeaders.indexOf(header); });
+    var values = rows.map(function (row) {
+        return positions.map(function (j) { return j === -1 || row[j] === undefined ? "" : row[j]; });
+    });
+    target.getRange(target.getLastRow() + 1, 1, values.length, headers.length).setValues(values);
+}
+
+// Eski tek sayfalı düzenden geçiş. Apps Script düzenleyicisinden bir kez çalıştırılır:
+// Yayinlar sayfasındaki satırlar yıl (ve bölüm) sayfalarına kopyalanır, eski sayfa
+// Yayinlar_eski adıyla yedek olarak kalır. Taşınan satır sayısını döndürür.
+function partitionLegacySheet() {
+    var lock = LockService.getScriptLock();
+    lock.waitLock(30000);
+    try {
+        var doc = SpreadsheetApp.getActiveSpreadsheet();
+        var legacy = doc.getSheetByName(LEGACY_SHEET);
+        if (!legacy) {
+            return 0;
+        }
+        initNextId_(doc);
+        var values = legacy.getDataRange().getValues();
+        var headers = values[0];
+        var dateColumn = headers.indexOf("publication_date");
+        var departmentColumn = headers.indexOf("department");
+
+        var groups = {};
+        for (var i = 1; i < values.length; i++) {
+            var name = partitionName_(dateString_(values[i][dateColumn]), values[i][departmentColumn]);
+            (groups[name] = groups[name] || []).push(values[i]);
+        }
+        Object.keys(groups).sort().forEach(function (name) {
+            appendRows_(partitionSheet_(doc, name), headers, groups[name]);
+        });
+        legacy.setName(LEGACY_SHEET + "_eski");
+        bumpDataVersion_();
+        return values.length - 1;
+    } finally {
+        lock.releaseLock();
+    }
+}
+
+// Verilen yıldan önceki bölümleri arşiv tablosuna taşır; düzenleyiciden çalıştırılır,
+// ör. archivePartitionsBefore(2015). Etkin tablo küçülür, arşivdeki yıllar okunmaya
+// devam eder ama yalnızca istek o yılları kapsadığında açılır. Taşınan sayfaların
+// adlarını döndürür.
+function archivePartitionsBefore(year) {
+    var lock = LockService.getScriptLock();
+    lock.waitLock(30000);
+    try {
+        var doc = SpreadsheetApp.getActiveSpreadsheet();
+        // Arşive giden ID'ler yeniden verilmesin
+        initNextId_(doc);
+        var archived = archivedPartitions_();
+        var archive = null;
+        var moved = [];
+        doc.getSheets().forEach(function (sheet) {
+            var name = sheet.getName();
+            var info = parsePartition_(name);
+            if (!info || info.all || info.year === null || info.year >= year) {
+                return;
+            }
+            archive = archive || archiveSpreadsheet_(true);
+            var target = archive.getSheetByName(name);
+            if (target) {
+                // Bu yıl daha önce arşivlenmiş; sonradan eklenen satırlar arkasına yazılır
+                var values = sheet.getDataRange().getValues();
+                appendRows_(target, values[0], values.slice(1));
+            } else {
+                sheet.copyTo(archive).setName(name);
+            }
+            doc.deleteSheet(sheet);
+            if (archived.indexOf(name) === -1) {
+                archived.push(name);
+            }
+            moved.push(name);
+        });
+        PropertiesService.getScriptProperties().setProperty(ARCHIVED_KEY, JSON.stringify(archived));
+        return moved;
+    } finally {
+        lock.releaseLock();
+    }
+}
+
+// Eksik başlıkları sona ekler, güncel başlık satırını döndürür
+function ensureColumns_(sheet, names) {
+    var lastColumn = sheet.getLastColumn();
+    var headers = sheet.getRange(1, 1, 1, lastColumn).getValues()[0];
+    var missing = names.filter(function (name) { return headers.indexOf(name) === -1; });
+    if (missing.length) {
+        sheet.getRange(1, lastColumn + 1, 1, missing.length).setValues([missing]);
+        headers = headers.concat(missing);
+    }
+    return headers;
+}
+
+// {"action": "update_citations", "citations": [{id, citation, citation_version}, ...]}
+// Eski sürümle biçimlendirilmiş atıfları toplu olarak yeniden yazar. Atıf sütunları
+// bir kez okunup bir kez yazılır; satır satır setValue çağrılmaz. Her bölüm sayfası
+// için ayrı çağrılır, sayfada olmayan ID'ler atlanır.
+function updateCitations_(sheet, headers, citations) {
+    var lastRow = sheet.getLastRow();
+    if (lastRow < 2 || !citations.length) {
+        return 0;
+    }
+    var numRows = lastRow - 1;
+    var ids = sheet.getRange(2, headers.indexOf("id") + 1, numRows, 1).getValues();
+    var rowById = {};
+    for (var r = 0; r < numRows; r++) {
+        rowById[String(ids[r][0])] = r;
+    }
+
+    var citationRange = sheet.getRange(2, headers.indexOf("citation") + 1, numRows, 1);
+    var versionRange = sheet.getRange(2, headers.indexOf("citation_version") + 1, numRows, 1);
+    var citationValues = citationRange.getValues();
+    var versionValues = versionRange.getValues();
+
+    var updated = 0;
+    for (var i = 0; i < citations.length; i++) {
+        var r = rowById[String(citations[i].id)];
+        if (r === undefined) {
+            continue;
+        }
+        citationValues[r][0] = citations[i].citation || "";
+        versionValues[r][0] = citations[i].citation_version || "";
+        updated++;
+    }
+    citationRange.setValues(citationValues);
+    versionRange.setValues(versionValues);
+    return updated;
+}
+
+function doPost(e) {
+    var lock = LockService.getScriptLock();
+    // Kilitsiz yazma aynı NEXT_ID'yi iki kayda verebilir: kilit alınamazsa kayıt yapılmaz
+    if (!lock.tryLock(10000)) {
+        return ContentService
+            .createTextOutput(JSON.stringify({ "result": "error", "error": LOCK_BUSY_ERROR }))
+            .setMimeType(ContentService.MimeType.JSON);
+    }
+
+    try {
+        var doc = SpreadsheetApp.getActiveSpreadsheet();
+        var data = JSON.parse(e.postData.contents);
+
+        if (data.action === "update_citations") {
+            var updated = 0;
+            partitionSheets_(doc, {}).forEach(function (sheet) {
+                updated += updateCitations_(sheet, ensureColumns_(sheet, CITATION_COLUMNS), data.citations || []);
+            });
+            var newVersion = bumpDataVersion_();
+            return ContentService
+                .createTextOutput(JSON.stringify({ "result": "success", "updated": updated, "version": newVersion }))
+                .setMimeType(ContentService.MimeType.JSON);
+        }
+
+        // Kayıt, yayın yılının (ve bölümünün) sayfasına yazılır; yoksa oluşturulur
+        var sheet = partitionSheet_(doc, partitionName_(String(data.publication_date || ""), data.department));
+        var headers = ensureColumns_(sheet, CITATION_COLUMNS);
+        var newId = nextId_(doc);
+
+        var values = {
+            "id": newId,
+            "department": data.department || "",
+            "publication_type": data.publication_type || "",
+            "authors_json": JSON.stringify(data.authors) || "[]", // Yazarları JSON string olarak sakla
+            "publication_date": data.publication_date || "",
+            "title": data.title || "",
+            "journal_name": data.journal_name || "",
+            "volume": data.volume || "",
+            "issue": data.issue || "",
+            "pages": data.pages || "",
+            "publisher": data.publisher || "",
+            "location": data.location || "",
+            "editors": data.editors || "",
+            "book_title": data.book_title || "",
+            "project_status": data.project_status || "",
+            "funding_agency": data.funding_agency || "",
+            "created_at": new Date().toISOString().slice(0, 10), // YYYY-MM-DD
+            "citation": data.citation || "",
+            "citation_version": data.citation_version || ""
+        };
+        // Değerler başlık sırasına göre yerleştirilir
+        var row = headers.map(function (header) { return header in values ? values[header] : ""; });
+
+        sheet.appendRow(row);
+        // Kilit hâlâ bizde: sürüm artışı kayıtla birlikte sıralanır
+        var version = bumpDataVersion_();
+
+        return ContentService
+            .createTextOutput(JSON.stringify({ "result": "success", "id": newId, "version": version }))
+            .setMimeType(ContentService.MimeType.JSON);
+
+    } catch (e) {
+        return ContentService
+            .createTextOutput(JSON.stringify({ "result": "error", "error": e }))
+            .setMimeType(ContentService.MimeType.JSON);
+    } finally {
+        lock.releaseLock();
+    }
+}
+
+// mode=summary ile dönen alanlar (sayım ve gruplama için yeterli)
+var SUMMARY_FIELDS = ["id", "department", "publication_type", "publication_date"];
+
+// İstenen alanlar: ?fields=id,authors,publication_type veya ?mode=summary.
+// null = tüm sütunlar.
+function requestedFields_(e) {
+    var params = (e && e.parameter) || {};
+    if (params.mode === "summary") {
+        return SUMMARY_FIELDS;
+    }
+    if (params.fields) {
+        return params.fields.split(",").map(function (f) { return f.trim(); }).filter(String);
+    }
+    return null;
+}
+
+// Sayfadaki sütun adı -> kayıttaki alan adı (authors_json, 'authors' olarak döner)
+function fieldName_(header) {
+    return header === "authors_json" ? "authors" : header;
+}
+
+// Yalnızca verilen sütunları okur. Yan yana duran sütunlar tek getRange ile okunur.
+// Dönen satırlar, columnIndexes sırasındaki değerleri içerir.
+function readColumns_(sheet, columnIndexes, numRows) {
+    var rows = [];
+    for (var r = 0; r < numRows; r++) {
+        rows.push([]);
+    }
+    var i = 0;
+    while (i < columnIndexes.length) {
+        var start = columnIndexes[i];
+        var width = 1;
+        while (i + width < columnIndexes.length && columnIndexes[i + width] === start + width) {
+            width++;
+        }
+        var values = sheet.getRange(2, start + 1, numRows, width).getValues();
+        for (var r = 0; r < numRows; r++) {
+            for (var c = 0; c < width; c++) {
+                rows[r].push(values[r][c]);
+            }
+        }
+        i += width;
+    }
+    return rows;
+}
+
+function rowToRecord_(headers, row) {
+    var record = {};
+    for (var j = 0; j < headers.length; j++) {
+        var header = headers[j];
+        var value = row[j];
+
+        // authors_json alanını tekrar nesneye çevir
+        if (header === "authors_json") {
+            try {
+                record['authors'] = value ? JSON.parse(value) : [];
+            } catch (err) {
+                record['authors'] = [];
+            }
+        } else {
+            record[header] = value;
+        }
+    }
+    // Python tarafı 'authors' bekliyor, 'authors_json' key'i dönmüyor.
+    return record;
+}
+
+// Tarih hücresi -> 'YYYY-MM-DD'. Sheets tarih gibi görünen metni Date nesnesine çevirir.
+function dateString_(value) {
+    if (value instanceof Date) {
+        return Utilities.formatDate(value, Session.getScriptTimeZone(), "yyyy-MM-dd");
+    }
+    return String(value || "").slice(0, 10);
+}
+
+// ?mode=counts[&start=YYYY-MM-DD&end=YYYY-MM-DD]
+// Bölüm x tür x yıl bazında sayılar; her sayfadan yalnızca üç sütun okunur.
+function publicationCounts_(sheets, params) {
+    var start = params.start, end = params.end;
+    var counts = {};
+    sheets.forEach(function (sheet) {
+        var lastRow = sheet.getLastRow();
+        if (lastRow < 2) {
+            return;
+        }
+        var headers = sheet.getRange(1, 1, 1, sheet.getLastColumn()).getValues()[0];
+        var columnIndexes = ["department", "publication_type", "publication_date"].map(function (h) {
+            return headers.indexOf(h);
+        });
+        var sorted = columnIndexes.slice().sort(function (a, b) { return a - b; });
+        var rows = readColumns_(sheet, sorted, lastRow - 1);
+        var pos = columnIndexes.map(function (j) { return sorted.indexOf(j); });
+
+        for (var i = 0; i < rows.length; i++) {
+            var date = dateString_(rows[i][pos[2]]);
+            if (start && end && (date < start || date > end)) {
+                continue;
+            }
+            if (params.department && String(rows[i][pos[0]] || "") !== params.department) {
+                continue;
+            }
+            var year = /^\d{4}/.test(date) ? Number(date.slice(0, 4)) : null;
+            var key = JSON.stringify([String(rows[i][pos[0]] || ""), String(rows[i][pos[1]] || ""), year]);
+            counts[key] = (counts[key] || 0) + 1;
+        }
+    });
+
+    var result = Object.keys(counts).map(function (key) {
+        var parts = JSON.parse(key);
+        return { "department": parts[0], "publication_type": parts[1], "year": parts[2], "count": counts[key] };
+    });
+    // Bölüm, tür, yıl sırasında (yılı olmayanlar sonda)
+    result.sort(function (a, b) {
+        if (a.department !== b.department) return a.department < b.department ? -1 : 1;
+        if (a.publication_type !== b.publication_type) return a.publication_type < b.publication_type ? -1 : 1;
+        return (a.year === null ? Infinity : a.year) - (b.year === null ? Infinity : b.year);
+    });
+    return result;
+}
+
+// Bir bölüm sayfasındaki kayıtlar; fields verilirse yalnızca o sütunlar okunur.
+// Bölüm sınırındaki yıllar için tarih ve bölüm filtresi satır bazında da uygulanır.
+function readRecords_(sheet, fields, params) {
+    var lastRow = sheet.getLastRow();
+    var headers = sheet.getRange(1, 1, 1, sheet.getLastColumn()).getValues()[0];
+    var rows = [];
+
+    if (fields) {
+        // Sadece istenen sütunlar okunur: uzun başlıklar ve JSON alanları hiç yüklenmez
+        var columnIndexes = [];
+        for (var j = 0; j < headers.length; j++) {
+            if (fields.indexOf(fieldName_(headers[j])) !== -1) {
+                columnIndexes.push(j);
+            }
+        }
+        headers = columnIndexes.map(function (j) { return headers[j]; });
+        if (lastRow > 1 && columnIndexes.length) {
+            rows = readColumns_(sheet, columnIndexes, lastRow - 1);
+        }
+    } else if (lastRow > 1) {
+        // 1. satır başlıklar, 2. satırdan itibaren veriler
+        rows = sheet.getDataRange().getValues().slice(1);
+    }
+
+    var dateColumn = params.start && params.end ? headers.indexOf("publication_date") : -1;
+    var departmentColumn = params.department ? headers.indexOf("department") : -1;
+    var records = [];
+    for (var i = 0; i < rows.length; i++) {
+        if (dateColumn !== -1) {
+            var date = dateString_(rows[i][dateColumn]);
+            if (date < params.start || date > params.end) {
+                continue;
+            }
+        }
+        if (departmentColumn !== -1 && String(rows[i][departmentColumn] || "") !== params.department) {
+            continue;
+        }
+        records.push(rowToRecord_(headers, rows[i]));
+    }
+    return records;
+}
+
+function doGet(e) {
+    // Sürüm sorgusu tabloya dokunmaz ve kilit beklemez
+    if (e && e.parameter && e.parameter.mode === "version") {
+        return ContentService
+            .createTextOutput(JSON.stringify({ "version": getDataVersion_(), "citations": true }))
+            .setMimeType(ContentService.MimeType.JSON);
+    }
+
+    var lock = LockService.getScriptLock();
+    // Okumalar kilit alınamasa da (10 sn sonra) kilitsiz devam eder
+    lock.tryLock(10000);
+
+    try {
+        // ?start=YYYY-MM-DD&end=YYYY-MM-DD ve ?department=... yalnızca kesişen bölümleri okutur;
+        // yıllık bir rapor tek sayfaya dokunur
+        var params = (e && e.parameter) || {};
+        var sheets = partitionSheets_(SpreadsheetApp.getActiveSpreadsheet(), params);
+
+        if (params.mode === "counts") {
+            return ContentService
+                .createTextOutput(JSON.stringify(publicationCounts_(sheets, params)))
+                .setMimeType(ContentService.MimeType.JSON);
+        }
+
+        var fields = requestedFields_(e);
+        var jsonData = [];
+        sheets.forEach(function (sheet) {
+            jsonData = jsonData.concat(readRecords_(sheet, fields, params));
+        });
+        if (sheets.length > 1 && jsonData.length && "id" in jsonData[0]) {
+            // Bölümler birleşince de kayıt sırası korunur
+            jsonData.sort(function (a, b) { return Number(a.id) - Number(b.id); });
+        }
+
+        return ContentService
+            .createTextOutput(JSON.stringify(jsonData))
+            .setMimeType(ContentService.MimeType.JSON);
+
+    } catch (e) {
+        return ContentService
+            .createTextOutput(JSON.stringify({ "result": "error", "error": e }))
+            .setMimeType(ContentService.MimeType.JSON);
+    } finally {
+        lock.releaseLock();
+    }
+}
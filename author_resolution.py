@@ -0,0 +1,157 @@
+import re
+from bisect import bisect_left, insort
+
+from turkish_text import search_key
+
+_NON_LETTER_RE = re.compile(r'[^a-z0-9]+')
+
+
+def surname_key(surname):
+    """ASCII-folded, lowercase surname with punctuation and spaces removed."""
+    return _NON_LETTER_RE.sub('', search_key(surname))
+
+
+def given_tokens(name):
+    """'Ahmet Can' -> ['ahmet', 'can'], 'A. C.' -> ['a', 'c']"""
+    return [t for t in _NON_LETTER_RE.split(search_key(name)) if t]
+
+
+def blocking_key(surname, name):
+    """
+    Blocking key: folded surname + first initial.
+    "Yılmaz, Ahmet", "Yilmaz, A." and "YILMAZ, Ahmet" all map to 'yilmaz|a',
+    so only authors inside one block are ever compared with each other.
+    """
+    tokens = given_tokens(name)
+    initial = tokens[0][0] if tokens else ''
+    return f"{surname_key(surname)}|{initial}"
+
+
+def _tokens_compatible(a, b):
+    """Two given-name token lists refer to the same person if every aligned
+    pair is equal or one side is an initial of the other."""
+    for x, y in zip(a, b):
+        if x == y:
+            continue
+        if (len(x) == 1 or len(y) == 1) and x[0] == y[0]:
+            continue
+        return False
+    return True
+
+
+def _more_informative(a, b):
+    """Picks the given-name tokens that carry more information (full names over initials)."""
+    return a if (sum(len(t) for t in a), len(a)) >= (sum(len(t) for t in b), len(b)) else b
+
+
+class AuthorResolver:
+    """
+    Incremental author identity resolution.
+
+    Each author occurrence is reduced to a blocking key; candidates are only
+    compared within their block, so the cost per author is independent of
+    the total number of authors. Canonical ids have the form 'yilmaz-a-1'
+    and do not change for the life of the resolver.
+
+    Ids are only valid within one resolver (one process): they number the
+    authors of a block in the order they are first seen, and which cluster
+    an occurrence joins can depend on that order too. After a reload or in
+    another process the same author may get a different id, so ids must not
+    be stored or linked to; use display_name() for anything shown or saved.
+    """
+
+    def __init__(self):
+        self.blocks = {}               # block key -> [author_id, ...]
+        self.authors = {}              # author_id -> author entry (see _new_author)
+        self.publication_authors = {}  # publication id -> [author_id, ...]
+        self._surname_keys = []        # sorted distinct surname keys, for prefix lookups
+        self._surname_blocks = {}      # surname key -> [block key, ...]
+
+    def _new_author(self, block, s_key, tokens):
+        author_id = f"{block.replace('|', '-').rstrip('-')}-{len(self.blocks.get(block, [])) + 1}"
+        self.authors[author_id] = {
+            'surname_key': s_key,
+            'given': tokens,
+            'variants': {},
+            'publications': set(),
+        }
+        if block not in self.blocks:
+            self.blocks[block] = []
+            if s_key not in self._surname_blocks:
+                insort(self._surname_keys, s_key)
+            self._surname_blocks.setdefault(s_key, []).append(block)
+        self.blocks[block].append(author_id)
+        return author_id
+
+    def resolve(self, surname, name):
+        """Returns the canonical id for one author occurrence, creating it if new."""
+        s_key = surname_key(surname)
+        tokens = given_tokens(name)
+        block = blocking_key(surname, name)
+
+        # Among compatible candidates prefer the one seen most often
+        best = None
+        for author_id in self.blocks.get(block, []):
+            entry = self.authors[author_id]
+            if _tokens_compatible(entry['given'], tokens):
+                if best is None or len(entry['publications']) > len(self.authors[best]['publications']):
+                    best = author_id
+
+        if best is None:
+            best = self._new_author(block, s_key, tokens)
+
+        entry = self.authors[best]
+        entry['given'] = _more_informative(entry['given'], tokens)
+        variant = f"{str(surname).strip()}, {str(name).strip()}".strip(', ')
+        entry['variants'][variant] = entry['variants'].get(variant, 0) + 1
+        return best
+
+    def add_publication(self, pub):
+        """Resolves the authors of one publication. Already seen publications are skipped."""
+        pub_id = pub.get('id')
+        if pub_id is not None and pub_id in self.publication_authors:
+            return self.publication_authors[pub_id]
+
+        ids = []
+        authors = pub.get('authors', [])
+        if isinstance(authors, list):
+            for auth in authors:
+                if isinstance(auth, dict) and str(auth.get('surname', '')).strip():
+                    author_id = self.resolve(auth.get('surname', ''), auth.get('name', ''))
+                    if author_id not in ids:
+                        ids.append(author_id)
+                    if pub_id is not None:
+                        self.authors[author_id]['publications'].add(pub_id)
+
+        if pub_id is not None:
+            self.publication_authors[pub_id] = ids
+        return ids
+
+    def add_publications(self, pubs):
+        # Oldest first, so the same records resolve to the same ids on every run
+        # (records added later can still shift them; ids are process-local)
+        for pub in sorted(pubs, key=lambda p: (p.get('id') is None, p.get('id') or 0)):
+            self.add_publication(pub)
+
+    def find(self, surname_query):
+        """Author ids whose folded surname starts with the folded query."""
+        prefix = surname_key(surname_query)
+        if not prefix:
+            return []
+        result = []
+        i = bisect_left(self._surname_keys, prefix)
+        while i < len(self._surname_keys) and self._surname_keys[i].startswith(prefix):
+            for block in self._surname_blocks[self._surname_keys[i]]:
+                result.extend(self.blocks[block])
+            i += 1
+        return result
+
+    def display_name(self, author_id):
+        """Most frequent spelling; ties go to the longer (more complete) form."""
+        variants = self.authors[author_id]['variants']
+        if not variants:
+            return author_id
+        return max(variants.items(), key=lambda item: (item[1], len(item[0])))[0]
+
+    def publications_of(self, author_id):
+        return self.authors[author_id]['publications']
@@ -0,0 +1,157 @@
+"""
+Autocomplete for the entry form: prefix tries over the author names,
+journals, publishers, book titles and places already stored, so the same
+spelling is offered again instead of a new variant being typed.
+
+Keys are Turkish/ASCII folded (search_key), so "amme", "AMME" and "Âmme"
+find the same entries; each entry is shown in its most frequent stored
+spelling. Every word start of an entry is indexed as well, so "idare"
+finds "Amme İdaresi Dergisi".
+
+Each trie node keeps its TOP_K most frequent entries, so a lookup only
+walks the typed prefix and does not depend on how many entries exist.
+Counts only grow (records are added, never removed), which keeps the
+per-node lists exact while they are updated incrementally. Paths stop at
+MAX_DEPTH characters; the few prefixes typed beyond that are answered from
+a bucket of the longer entries sharing the first MAX_DEPTH characters.
+"""
+import re
+
+from turkish_text import search_key
+
+AUTOCOMPLETE_FIELDS = ['surname', 'name', 'journal_name', 'publisher', 'book_title', 'location']
+TOP_K = 8   # entries kept per trie node; more than any suggestion list shows
+MAX_DEPTH = 16   # trie depth; long titles would otherwise cost a node per character
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_WORD_START_RE = re.compile(r'(?<=[\s\-/(])\S')
+
+
+class PrefixTrie:
+    """Frequency-ranked completions of one field."""
+
+    def __init__(self, top_k=TOP_K):
+        self.top_k = top_k
+        self._root = ({}, [])     # node = (children: char -> node, top entry keys)
+        self._counts = {}         # key -> number of records
+        self._spellings = {}      # key -> {spelling: count}
+        self._display = {}        # key -> most frequent spelling
+        self._deep = {}           # first MAX_DEPTH characters -> longer keys
+
+    def __len__(self):
+        return len(self._counts)
+
+    def count(self, text):
+        return self._counts.get(search_key(_clean(text)), 0)
+
+    def add(self, text, count=1):
+        spelling = _clean(text)
+        key = search_key(spelling)
+        if not key:
+            return
+        new_count = self._counts.get(key, 0) + count
+        self._counts[key] = new_count
+        spellings = self._spellings.setdefault(key, {})
+        spellings[spelling] = spellings.get(spelling, 0) + count
+        shown = self._display.get(key)
+        if shown is None or spellings[spelling] > spellings[shown]:
+            self._display[key] = spelling
+
+        self._promote(self._root[1], key, new_count)
+        for start in _word_starts(key):
+            node = self._root
+            for char in key[start:start + MAX_DEPTH]:
+                child = node[0].get(char)
+                if child is None:
+                    child = node[0][char] = ({}, [])
+                node = child
+                self._promote(node[1], key, new_count)
+            if len(key) - start > MAX_DEPTH:
+                self._deep.setdefault(key[start:start + MAX_DEPTH], set()).add(key)
+
+    def _promote(self, top, key, count):
+        """Puts `key` (whose count just grew to `count`) in its place in a node's top list."""
+        counts = self._counts
+        if key in top:
+            i = top.index(key)
+        elif len(top) < self.top_k:
+            top.append(key)
+            i = len(top) - 1
+        else:
+            last = top[-1]
+            if count < counts[last] or (count == counts[last] and key > last):
+                return
+            top[-1] = key
+            i = len(top) - 1
+        # Counts only grow, so the key can only move up
+        while i > 0:
+            other = top[i - 1]
+            if counts[other] > count or (counts[other] == count and other < key):
+                break
+            top[i] = other
+            i -= 1
+        top[i] = key
+
+    def complete(self, prefix, limit=5):
+        """Up to `limit` stored spellings for `prefix`, most frequent first."""
+        prefix = search_key(_clean(prefix))
+        if len(prefix) > MAX_DEPTH:
+            matches = [key for key in self._deep.get(prefix[:MAX_DEPTH], ())
+                       if any(key.startswith(prefix, start) for start in _word_starts(key))]
+            matches.sort(key=lambda key: (-self._counts[key], key))
+            return [self._display[key] for key in matches[:limit]]
+        node = self._root
+        for char in prefix:
+            node = node[0].get(char)
+            if node is None:
+                return []
+        return [self._display[key] for key in node[1][:limit]]
+
+
+def _word_starts(key):
+    """The whole entry, then each later word of it."""
+    return [0] + [m.start() for m in _WORD_START_RE.finditer(key)]
+
+
+def _clean(text):
+    return _WHITESPACE_RE.sub(' ', str(text or '')).strip()
+
+
+class AutocompleteIndex:
+    """
+    One PrefixTrie per field in AUTOCOMPLETE_FIELDS, fed with publication
+    records. Author and editor names both go to 'surname' and 'name'.
+    """
+
+    def __init__(self):
+        self.tries = {field: PrefixTrie() for field in AUTOCOMPLETE_FIELDS}
+        self._seen = set()
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __contains__(self, key):
+        return key in self._seen
+
+    def add(self, pub, key=None):
+        key = pub.get('id') if key is None else key
+        if key is None:
+            key = f"_local{len(self._seen)}"
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        for person in _people(pub.get('authors')) + _people(pub.get('editors')):
+            self.tries['surname'].add(person.get('surname'))
+            self.tries['name'].add(person.get('name'))
+        for field in ('journal_name', 'publisher', 'book_title', 'location'):
+            self.tries[field].add(pub.get(field))
+
+    def suggest(self, field, prefix, limit=5):
+        return self.tries[field].complete(prefix, limit)
+
+
+def _people(value):
+    # Editors may still be a JSON string on records that skipped post-processing
+    if not isinstance(value, list):
+        return []
+    return [person for person in value if isinstance(person, dict)]
@@ -0,0 +1,145 @@
+"""
+BibTeX export of stored publications: the reverse of the bibtex_helper
+field mapping. Entries are produced one at a time, so a whole corpus can
+be written to a file (or a download) without building the document in memory.
+"""
+import re
+
+from turkish_text import LOWERCASE_WORDS, search_key
+
+# Application type -> BibTeX entry type (bibtex_helper maps these back)
+ENTRY_TYPES = {
+    'Makale': 'article',
+    'Kitap': 'book',
+    'Kitap Bölümü': 'incollection',
+    'Bildiri': 'inproceedings',
+    'Proje': 'misc',
+}
+
+# Application field -> BibTeX field, in output order; author/editor/title/year are written first
+FIELD_MAP = [
+    ('journal_name', 'journal'),
+    ('book_title', 'booktitle'),
+    ('volume', 'volume'),
+    ('issue', 'number'),
+    ('pages', 'pages'),
+    ('publisher', 'publisher'),
+    ('location', 'address'),
+]
+
+# Title words skipped when picking the keyword of a citation key
+_KEY_STOPWORDS = LOWERCASE_WORDS | {'a', 'an', 'the', 'of', 'on', 'in', 'and', 'for', 'to'}
+
+_NON_KEY_RE = re.compile(r'[^a-z0-9]+')
+
+
+def _clean(value):
+    """Field value safe inside {...}: braces dropped (keeps the entry balanced), whitespace collapsed."""
+    return " ".join(str(value).replace('{', '').replace('}', '').split())
+
+
+def _people(people):
+    """[{'surname', 'name'}] -> 'Surname, Name and Surname, Name'. Free-text values are kept as they are."""
+    if isinstance(people, str):
+        return _clean(people)
+    if not isinstance(people, list):
+        return ""
+    names = []
+    for person in people:
+        if not isinstance(person, dict):
+            continue
+        surname = _clean(person.get('surname', '') or '')
+        name = _clean(person.get('name', '') or '')
+        if surname and name:
+            names.append(f"{surname}, {name}")
+        elif surname or name:
+            names.append(surname or name)
+    return " and ".join(names)
+
+
+def _year(pub):
+    date = str(pub.get('publication_date', '') or '')
+    return date[:4] if date[:4].isdigit() else ""
+
+
+def citation_key(pub):
+    """
+    Readable key built only from the record itself, so it does not change
+    between exports: first author's surname + year + first significant
+    title word, ASCII-folded. 'Yılmaz, 2024, "Kamu Politikası"' -> 'yilmaz2024kamu'.
+    """
+    surname = ""
+    authors = pub.get('authors', [])
+    if isinstance(authors, list) and authors and isinstance(authors[0], dict):
+        surname = _NON_KEY_RE.sub('', search_key(authors[0].get('surname', '') or ''))
+
+    word = ""
+    for token in _NON_KEY_RE.split(search_key(pub.get('title', '') or '')):
+        if token and token not in _KEY_STOPWORDS:
+            word = token
+            break
+
+    return f"{surname or 'anonim'}{_year(pub)}{word}"
+
+
+def format_entry(pub, key=None):
+    """One publication as a BibTeX entry (string ending in a blank line)."""
+    entry_type = ENTRY_TYPES.get(pub.get('publication_type'), 'misc')
+    fields = []
+
+    authors = _people(pub.get('authors', []))
+    if authors:
+        fields.append(('author', authors))
+    editors = _people(pub.get('editors', []))
+    if editors:
+        fields.append(('editor', editors))
+    if pub.get('title'):
+        fields.append(('title', _clean(pub['title'])))
+    if _year(pub):
+        fields.append(('year', _year(pub)))
+    for source, target in FIELD_MAP:
+        value = pub.get(source)
+        if value not in (None, ''):
+            fields.append((target, _clean(value)))
+
+    # Project records have no BibTeX counterpart; keep their details in a note
+    note = ", ".join(_clean(pub[k]) for k in ('funding_agency', 'project_status') if pub.get(k))
+    if note:
+        fields.append(('note', note))
+
+    body = ",\n".join(f"  {name} = {{{value}}}" for name, value in fields)
+    return f"@{entry_type}{{{key or citation_key(pub)},\n{body}\n}}\n\n"
+
+
+def iter_bibtex(publications):
+    """
+    Yields one BibTeX entry per publication. Keys that collide within one
+    export get a, b, c, ... suffixes in the order the records arrive
+    (the first one keeps the plain key).
+    """
+    seen = {}
+    for pub in publications:
+        key = citation_key(pub)
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        if count:
+            key = f"{key}{_suffix(count)}"
+        yield format_entry(pub, key)
+
+
+def _suffix(n):
+    """1 -> 'a', 26 -> 'z', 27 -> 'aa'"""
+    letters = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(ord('a') + rem) + letters
+    return letters
+
+
+def write_bibtex(publications, out):
+    """Writes the entries to a text file object as they are produced. Returns the number written."""
+    count = 0
+    for entry in iter_bibtex(publications):
+        out.write(entry)
+        count += 1
+    return count
@@ -1,122 +1,259 @@
-import bibtexparser
-from bibtexparser.bparser import BibTexParser
-import streamlit as st
-
-def parse_bibtex(file_content):
-    """
-    Parses a BibTeX string and returns a dictionary of mapped fields 
-    compatible with the application schema.
-    Returns the first entry found in the file.
-    """
-    try:
-        parser = BibTexParser()
-        parser.ignore_nonstandard_types = False
-        
-        # Parse the string
-        bib_database = bibtexparser.loads(file_content, parser=parser)
-        
-        if not bib_database.entries:
-            return None
-            
-        # Take the first entry
-        entry = bib_database.entries[0]
-        
-        # Mapping Result
-        mapped = {}
-        
-        # --- Type Mapping ---
-        bib_type = entry.get('ENTRYTYPE', '').lower()
-        if bib_type == 'article':
-            mapped['publication_type'] = 'Makale'
-        elif bib_type == 'book':
-            mapped['publication_type'] = 'Kitap'
-        elif bib_type == 'inbook' or bib_type == 'incollection':
-            mapped['publication_type'] = 'Kitap Bölümü'
-        elif bib_type == 'inproceedings' or bib_type == 'conference':
-            mapped['publication_type'] = 'Bildiri'
-        # Default or others? Let user manually select if unknown, 
-        # but we can try to guess or leave it to UI default.
-        
-        # --- Common Fields ---
-        mapped['title'] = entry.get('title', '').replace('{', '').replace('}', '')
-        
-        # Date/Year
-        # Bibtex usually has 'year'.
-        year = entry.get('year', '')
-        if year:
-            # We need full date for the picker. Default to Jan 1 of that year.
-            from datetime import date
-            try:
-                mapped['publication_date'] = date(int(year), 1, 1)
-            except:
-                pass
-        
-        # --- Author Parsing ---
-        # Format: "Smith, John and Doe, Jane"
-        if 'author' in entry:
-            authors_list = []
-            raw_authors = entry['author'].split(' and ')
-            for raw in raw_authors:
-                # Simple parsing: Split by comma if exists "Surname, Name"
-                # Else "Name Surname" logic is harder, assume BibTeX standard "Surname, Name"
-                parts = raw.split(',')
-                if len(parts) >= 2:
-                    surname = parts[0].strip()
-                    name = parts[1].strip()
-                else:
-                    # Fallback "Name Surname" -> Last token is surname
-                    tokens = raw.strip().split()
-                    if len(tokens) > 1:
-                        surname = tokens[-1]
-                        name = " ".join(tokens[:-1])
-                    else:
-                        surname = raw.strip()
-                        name = ""
-                        
-                authors_list.append({'surname': surname, 'name': name})
-            
-            mapped['authors'] = authors_list
-            
-        # --- Editors Parsing ---
-        if 'editor' in entry:
-            editors_list = []
-            raw_editors = entry['editor'].split(' and ')
-            for raw in raw_editors:
-                parts = raw.split(',')
-                if len(parts) >= 2:
-                    surname = parts[0].strip()
-                    name = parts[1].strip()
-                else:
-                    tokens = raw.strip().split()
-                    if len(tokens) > 1:
-                        surname = tokens[-1]
-                        name = " ".join(tokens[:-1])
-                    else:
-                        surname = raw.strip()
-                        name = ""
-                editors_list.append({'surname': surname, 'name': name})
-            
-            mapped['editors'] = editors_list
-
-        # --- Specific Fields ---
-        # Makale
-        mapped['journal_name'] = entry.get('journal', '')
-        mapped['volume'] = entry.get('volume', '')
-        mapped['issue'] = entry.get('number', '')
-        mapped['pages'] = entry.get('pages', '')
-        
-        # Kitap / Kitap Bölümü
-        mapped['publisher'] = entry.get('publisher', '')
-        mapped['location'] = entry.get('address', '') # BibTeX uses 'address' for location
-        mapped['book_title'] = entry.get('booktitle', '')
-        
-        # Bildiri
-        # booktitle usually used for conference name
-        if not mapped['book_title']:
-            mapped['book_title'] = entry.get('series', '') # Fallback
-
-        return mapped
-        
-    except Exception as e:
-        print(f"BibTeX Error: {e}")
-        return None
+import os
+import re
+from collections import deque
+from datetime import date
+from functools import partial
+
+import bibtexparser
+from bibtexparser.bparser import BibTexParser
+
+# Files at least this large are parsed in worker processes
+PARALLEL_MIN_SIZE = 1_000_000
+
+# Smallest piece of a file handed to one worker (characters)
+MIN_CHUNK_SIZE = 64_000
+
+# Start of an entry: '@type{' or '@type(' at the beginning of a line
+_ENTRY_START_RE = re.compile(r'^[ \t]*@[ \t]*([A-Za-z]+)[ \t]*[{(][ \t]*([^,\s]*)', re.MULTILINE)
+
+# Blocks that are not publications
+_NON_ENTRY_TYPES = {'string', 'comment', 'preamble'}
+
+
+def parse_bibtex(file_content):
+    """
+    Parses a BibTeX string and returns a dictionary of mapped fields 
+    compatible with the application schema.
+    Returns the first entry found in the file.
+    """
+    entries = parse_bibtex_entries(file_content)
+    if not entries:
+        return None
+    return entries[0]
+
+def parse_bibtex_entries(file_content):
+    """
+    Parses a BibTeX string and returns the mapped fields of every entry,
+    in file order. Returns an empty list if the file cannot be parsed.
+    """
+    try:
+        entries, _ = parse_bibtex_file(file_content)
+        return entries
+    except Exception as e:
+        print(f"BibTeX Error: {e}")
+        return []
+
+def parse_bibtex_file(file_content, executor=None):
+    """
+    Parses a whole .bib file. Returns (entries, errors):
+        entries: mapped fields of every readable entry, in file order
+        errors:  [(entry number, citation key, message)] for entries that
+                 could not be read (entry numbers count from 1, in file order)
+
+    The file is cut at entry boundaries into chunks that are parsed
+    independently; @string macros are passed to every chunk. Large files
+    are parsed in a process pool (see report_builder.get_process_pool)
+    unless an executor is given.
+    """
+    blocks, macros = split_entries(file_content)
+    if not blocks:
+        return [], []
+
+    if executor is None and len(file_content) >= PARALLEL_MIN_SIZE and (os.cpu_count() or 1) > 1:
+        import report_builder
+        executor = report_builder.get_process_pool()
+
+    if executor is None:
+        results = _parse_chunk(macros, blocks)
+    else:
+        # A few chunks per core keeps the workers busy until the end
+        chunk_size = max(MIN_CHUNK_SIZE, len(file_content) // ((os.cpu_count() or 1) * 4))
+        chunks = _group_blocks(blocks, chunk_size)
+        import report_builder
+        results = []
+        # Falls back to parsing here if a worker dies
+        for part in report_builder.run_chunks(partial(_parse_chunk, macros), chunks, executor):
+            results.extend(part)
+
+    entries = []
+    errors = []
+    for number, key, record, error in results:
+        if error is None:
+            entries.append(record)
+        else:
+            errors.append((number, key, error))
+    return entries, errors
+
+def split_entries(file_content):
+    """
+    Cuts a .bib file at entry boundaries. Returns ([(entry number, key, text)], macros)
+    where macros is the text of all @string definitions. @comment and
+    @preamble blocks and text outside entries are dropped.
+    """
+    starts = list(_ENTRY_START_RE.finditer(file_content))
+    blocks = []
+    macros = []
+    number = 0
+    for i, match in enumerate(starts):
+        end = starts[i + 1].start() if i + 1 < len(starts) else len(file_content)
+        text = file_content[match.start():end]
+        entry_type = match.group(1).lower()
+        if entry_type == 'string':
+            macros.append(text)
+        elif entry_type not in _NON_ENTRY_TYPES:
+            number += 1
+            blocks.append((number, match.group(2), text))
+    return blocks, "".join(macros)
+
+def _group_blocks(blocks, chunk_size):
+    chunks = []
+    current = []
+    size = 0
+    for block in blocks:
+        current.append(block)
+        size += len(block[2])
+        if size >= chunk_size:
+            chunks.append(current)
+            current = []
+            size = 0
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _parse_chunk(macros, blocks):
+    """
+    Parses consecutive entry blocks with one parser. Runs in a worker process
+    for large files. Returns [(entry number, key, record or None, error or None)];
+    an entry found inside another block carries that block's number.
+    """
+    results = {}
+    # An entry with unbalanced braces would swallow its neighbours; keep it out
+    readable = []
+    for number, key, text in blocks:
+        if text.count('{') != text.count('}'):
+            results[number] = (number, key, None, "Süslü parantezler dengesiz")
+        else:
+            readable.append((number, key, text))
+
+    parser = BibTexParser()
+    parser.ignore_nonstandard_types = False
+    parsed = bibtexparser.loads(macros + "".join(text for _, _, text in readable), parser=parser).entries
+
+    # The parser skips entries it cannot read: match the rest back to their blocks by key
+    queues = {}
+    for index, entry in enumerate(parsed):
+        queues.setdefault(entry.get('ID'), deque()).append(index)
+    claimed = {}   # parsed index -> entry number of its block
+    for number, key, _ in readable:
+        queue = queues.get(key)
+        if queue:
+            claimed[queue.popleft()] = number
+        else:
+            results[number] = (number, key, None, "Kayıt ayrıştırılamadı")
+
+    # Entries no block claimed (e.g. a second entry on the same line) are
+    # kept and listed after the block they were found in
+    extras = {}
+    host = blocks[0][0]
+    for index, entry in enumerate(parsed):
+        if index in claimed:
+            host = claimed[index]
+            results[host] = _map_parsed(host, entry)
+        else:
+            extras.setdefault(host, []).append(_map_parsed(host, entry))
+
+    ordered = []
+    for number, _, _ in blocks:
+        ordered.append(results[number])
+        ordered.extend(extras.get(number, []))
+    return ordered
+
+def _map_parsed(number, entry):
+    key = entry.get('ID')
+    try:
+        return (number, key, map_entry(entry), None)
+    except Exception as e:
+        return (number, key, None, f"Alanlar okunamadı: {e}")
+
+def _parse_people(raw_people):
+    """'Smith, John and Doe, Jane' -> [{'surname': 'Smith', 'name': 'John'}, ...]"""
+    people = []
+    for raw in raw_people.split(' and '):
+        # Simple parsing: Split by comma if exists "Surname, Name"
+        # Else "Name Surname" logic is harder, assume BibTeX standard "Surname, Name"
+        parts = raw.split(',')
+        if len(parts) >= 2:
+            surname = parts[0].strip()
+            name = parts[1].strip()
+        else:
+            # Fallback "Name Surname" -> Last token is surname
+            tokens = raw.strip().split()
+            if len(tokens) > 1:
+                surname = tokens[-1]
+                name = " ".join(tokens[:-1])
+            else:
+                surname = raw.strip()
+                name = ""
+        people.append({'surname': surname, 'name': name})
+    return people
+
+def map_entry(entry):
+    """
+    Maps one bibtexparser entry dict to the application schema.
+    """
+    # Mapping Result
+    mapped = {}
+    
+    # --- Type Mapping ---
+    bib_type = entry.get('ENTRYTYPE', '').lower()
+    if bib_type == 'article':
+        mapped['publication_type'] = 'Makale'
+    elif bib_type == 'book':
+        mapped['publication_type'] = 'Kitap'
+    elif bib_type == 'inbook' or bib_type == 'incollection':
+        mapped['publication_type'] = 'Kitap Bölümü'
+    elif bib_type == 'inproceedings' or bib_type == 'conference':
+        mapped['publication_type'] = 'Bildiri'
+    # Default or others? Let user manually select if unknown, 
+    # but we can try to guess or leave it to UI default.
+    
+    # --- Common Fields ---
+    mapped['title'] = entry.get('title', '').replace('{', '').replace('}', '')
+    
+    # Date/Year
+    # Bibtex usually has 'year'.
+    year = entry.get('year', '')
+    if year:
+        # We need full date for the picker. Default to Jan 1 of that year.
+        try:
+            mapped['publication_date'] = date(int(year), 1, 1)
+        except:
+            pass
+    
+    # --- Author Parsing ---
+    # Format: "Smith, John and Doe, Jane"
+    if 'author' in entry:
+        mapped['authors'] = _parse_people(entry['author'])
+
+    # --- Editors Parsing ---
+    if 'editor' in entry:
+        mapped['editors'] = _parse_people(entry['editor'])
+
+    # --- Specific Fields ---
+    # Makale
+    mapped['journal_name'] = entry.get('journal', '')
+    mapped['volume'] = entry.get('volume', '')
+    mapped['issue'] = entry.get('number', '')
+    mapped['pages'] = entry.get('pages', '')
+    
+    # Kitap / Kitap Bölümü
+    mapped['publisher'] = entry.get('publisher', '')
+    mapped['location'] = entry.get('address', '') # BibTeX uses 'address' for location
+    mapped['book_title'] = entry.get('booktitle', '')
+    
+    # Bildiri
+    # booktitle usually used for conference name
+    if not mapped['book_title']:
+        mapped['book_title'] = entry.get('series', '') # Fallback
+
+    return mapped
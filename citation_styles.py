@@ -0,0 +1,371 @@
+"""
+Citation styles: APA 6, APA 7, Chicago (author-date) and MLA 9.
+
+A style is declarative: how author and editor lists are written, plus one
+template per publication type. A template is a list of parts joined with
+spaces. Inside a part
+    {field}      the field value ({field|dot}: closed with a period)
+    <...>        optional: left out unless every field directly inside has a value
+    {.}          (at the end) close the part with a period unless it already
+                 ends in . ? or !
+A separator (', ', ': ', '; ') that ends up at the start of a part because
+the value before it is missing is trimmed, and empty parts are skipped.
+
+Templates are compiled once into a renderer per (style, publication type):
+a generated Python function that only prepares the fields its template uses.
+"""
+import re
+from functools import lru_cache
+
+DEFAULT_STYLE = 'apa6'
+
+# Returned for publication types a style has no template for
+UNKNOWN_FORMAT = "Unknown Format"
+
+
+def _text(value):
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def ensure_dot(text):
+    if text and not text.endswith(('.', '?', '!')):
+        return text + "."
+    return text
+
+
+def _close(text):
+    """Author lists end with a period (an initial already provides one)."""
+    if text and not text.endswith('.'):
+        return text + "."
+    return text
+
+
+# --- Names ---
+
+def _persons(value, allow_text=False):
+    """
+    [{'surname', 'name'}] -> [(surname, name)], people without a surname skipped.
+    allow_text: a free-text value (old editor entries) is kept as one raw name.
+    """
+    if isinstance(value, str):
+        return [value] if allow_text and value else []
+    if not isinstance(value, list):
+        return []
+    persons = []
+    for person in value:
+        if isinstance(person, dict):
+            surname = _text(person.get('surname', ''))
+            if surname:
+                persons.append((surname, _text(person.get('name', ''))))
+    return persons
+
+
+def _initials(name):
+    """'Ali Veli' -> 'A. V.'"""
+    return " ".join(part[0] + "." for part in name.split())
+
+
+def _inverted_initials(person):
+    if isinstance(person, str):
+        return person
+    surname, name = person
+    return f"{surname}, {_initials(name)}" if name else surname
+
+
+def _initials_first(person):
+    if isinstance(person, str):
+        return person
+    surname, name = person
+    return f"{_initials(name)} {surname}" if name else surname
+
+
+def _inverted_full(person):
+    if isinstance(person, str):
+        return person
+    surname, name = person
+    return f"{surname}, {name}" if name else surname
+
+
+def _full(person):
+    if isinstance(person, str):
+        return person
+    surname, name = person
+    return f"{name} {surname}" if name else surname
+
+
+def _serial(names, conjunction):
+    """['A', 'B', 'C'] -> 'A, B, and C'; two names get no comma: 'A and B'."""
+    if len(names) <= 1:
+        return "".join(names)
+    if len(names) == 2:
+        return f"{names[0]} {conjunction} {names[1]}"
+    return f"{', '.join(names[:-1])}, {conjunction} {names[-1]}"
+
+
+def _editor_suffix(text, count):
+    if not text:
+        return ""
+    return f"{text} (Ed.)" if count == 1 else f"{text} (Eds.)"
+
+
+# APA 6 (the format the application has always used): all authors separated
+# by commas, no '&'
+def _apa6_authors(value):
+    return _close(", ".join(_inverted_initials(p) for p in _persons(value)))
+
+
+def _apa6_editors(value):
+    names = [_initials_first(p) for p in _persons(value, allow_text=True)]
+    return _editor_suffix(", ".join(names), len(names))
+
+
+# APA 7: '&' before the last author; up to 20 authors, then the first 19, '. . .' and the last
+def _apa7_authors(value):
+    names = [_inverted_initials(p) for p in _persons(value)]
+    if len(names) > 20:
+        return _close(f"{', '.join(names[:19])}, . . . {names[-1]}")
+    if len(names) > 1:
+        return _close(f"{', '.join(names[:-1])}, & {names[-1]}")
+    return _close("".join(names))
+
+
+def _apa7_editors(value):
+    names = [_initials_first(p) for p in _persons(value, allow_text=True)]
+    return _editor_suffix(_serial(names, "&"), len(names))
+
+
+# Chicago: first author inverted, the others 'Name Surname'; more than ten: first seven, et al.
+def _chicago_authors(value):
+    persons = _persons(value)
+    names = [_inverted_full(p) if i == 0 else _full(p) for i, p in enumerate(persons)]
+    if len(names) > 10:
+        return _close(f"{', '.join(names[:7])}, et al.")
+    if len(names) == 2:
+        return _close(f"{names[0]}, and {names[1]}")
+    return _close(_serial(names, "and"))
+
+
+def _chicago_editors(value):
+    return _serial([_full(p) for p in _persons(value, allow_text=True)], "and")
+
+
+# MLA 9: one or two authors written out, three or more: first author, et al.
+def _mla_authors(value):
+    persons = _persons(value)
+    if len(persons) > 2:
+        return _close(f"{_inverted_full(persons[0])}, et al.")
+    if len(persons) == 2:
+        return _close(f"{_inverted_full(persons[0])}, and {_full(persons[1])}")
+    return _close("".join(_inverted_full(p) for p in persons))
+
+
+def _mla_editors(value):
+    names = [_full(p) for p in _persons(value, allow_text=True)]
+    if len(names) > 2:
+        return f"{names[0]} et al."
+    return _serial(names, "and")
+
+
+# --- Styles ---
+
+STYLES = {
+    'apa6': {
+        'label': "APA 6",
+        'authors': _apa6_authors,
+        'editors': _apa6_editors,
+        'types': {
+            'Makale': ["{authors}", "<({year}).>", "{title}{.}",
+                       "<*{journal_name}*><, *{volume}*><({issue})><: {pages}.>{.}"],
+            'Kitap': ["{authors}", "<({year}).>", "<*{title}*>{.}", "<{location}><: {publisher}>{.}"],
+            'Kitap Bölümü': ["{authors}", "<({year}).>", "{title}{.}",
+                             "In <{editors}, ><*{book_title}*>< (pp. {pages})>{.}",
+                             "<{location}><: {publisher}>{.}"],
+            'Bildiri': ["{authors}", "<({year}).>", "{title}{.}", "<In *{book_title}*.>",
+                        "<{location}><: {publisher}>{.}"],
+            'Proje': ["{authors}", "<({year}).>", "<*{title}*>{.}", "<{funding_agency}><, {project_status}>{.}"],
+        },
+    },
+    'apa7': {
+        'label': "APA 7",
+        'authors': _apa7_authors,
+        'editors': _apa7_editors,
+        'types': {
+            'Makale': ["{authors}", "<({year}).>", "{title}{.}",
+                       "<*{journal_name}*><, *{volume}*><({issue})><, {pages}>{.}"],
+            'Kitap': ["{authors}", "<({year}).>", "<*{title}*>{.}", "{publisher}{.}"],
+            'Kitap Bölümü': ["{authors}", "<({year}).>", "{title}{.}",
+                             "In <{editors}, ><*{book_title}*>< (pp. {pages})>{.}", "{publisher}{.}"],
+            'Bildiri': ["{authors}", "<({year}).>", "{title}{.}", "<In *{book_title}*>< (pp. {pages})>{.}",
+                        "{publisher}{.}"],
+            'Proje': ["{authors}", "<({year}).>", "<*{title}*>{.}", "<{funding_agency}><, {project_status}>{.}"],
+        },
+    },
+    'chicago': {
+        'label': "Chicago (yazar-tarih)",
+        'authors': _chicago_authors,
+        'editors': _chicago_editors,
+        'types': {
+            'Makale': ["{authors}", "<{year}.>", '<"{title|dot}">',
+                       "<*{journal_name}*>< {volume}>< ({issue})><: {pages}>{.}"],
+            'Kitap': ["{authors}", "<{year}.>", "<*{title}*>{.}", "<{location}><: {publisher}>{.}"],
+            'Kitap Bölümü': ["{authors}", "<{year}.>", '<"{title|dot}">',
+                             "<In *{book_title}*><, edited by {editors}><, {pages}>{.}",
+                             "<{location}><: {publisher}>{.}"],
+            'Bildiri': ["{authors}", "<{year}.>", '<"{title|dot}">',
+                        "<Paper presented at {book_title}><, {location}>{.}"],
+            'Proje': ["{authors}", "<{year}.>", "<*{title}*>{.}", "<{funding_agency}><, {project_status}>{.}"],
+        },
+    },
+    'mla': {
+        'label': "MLA 9",
+        'authors': _mla_authors,
+        'editors': _mla_editors,
+        'types': {
+            'Makale': ["{authors}", '<"{title|dot}">',
+                       "<*{journal_name}*><, vol. {volume}><, no. {issue}><, {year}><, pp. {pages}>{.}"],
+            'Kitap': ["{authors}", "<*{title}*>{.}", "<{publisher}><, {year}>{.}"],
+            'Kitap Bölümü': ["{authors}", '<"{title|dot}">',
+                             "<*{book_title}*><, edited by {editors}><, {publisher}><, {year}><, pp. {pages}>{.}"],
+            'Bildiri': ["{authors}", '<"{title|dot}">', "<*{book_title}*><, {publisher}><, {year}><, {location}>{.}"],
+            'Proje': ["{authors}", "<*{title}*>{.}", "<{funding_agency}><, {year}><, {project_status}>{.}"],
+        },
+    },
+}
+
+# Style key -> name shown in the interface
+STYLE_LABELS = {key: spec['label'] for key, spec in STYLES.items()}
+
+
+def _year(data):
+    date = _text(data.get('publication_date', ''))
+    return date[:4] if len(date) >= 4 else ""
+
+
+def _pages(data):
+    # Normalize double hyphens to single hyphen
+    return _text(data.get('pages', '')).replace('--', '-')
+
+
+def _field_getter(style, name):
+    if name in ('authors', 'editors'):
+        formatter = STYLES[style][name]
+        return lambda data: formatter(data.get(name, []))
+    if name == 'year':
+        return _year
+    if name == 'pages':
+        return _pages
+    return lambda data: _text(data.get(name, ''))
+
+
+# --- Template compiler ---
+
+_TOKEN_RE = re.compile(r"\{\.\}|\{(\w+)(?:\|(\w+))?\}|<|>|[^{}<>]+")
+_LEADING_SEPARATOR_RE = re.compile(r"^[,:;]\s*")
+
+_FILTERS = {'dot': ensure_dot}
+
+
+def _parse(template):
+    """
+    Template part -> (nodes, fields, closing dot). Nodes are
+    ('text', str), ('field', name, filter name or None) and ('group', nodes, direct fields).
+    """
+    stack = [[]]
+    direct = [[]]
+    fields = set()
+    dot = False
+    for match in _TOKEN_RE.finditer(template):
+        token = match.group(0)
+        if dot:
+            raise ValueError(f"'{{.}}' must end the template: {template!r}")
+        if token == '{.}':
+            dot = True
+        elif token == '<':
+            stack.append([])
+            direct.append([])
+        elif token == '>':
+            if len(stack) == 1:
+                raise ValueError(f"Unbalanced '>' in template: {template!r}")
+            nodes, names = stack.pop(), direct.pop()
+            stack[-1].append(('group', nodes, tuple(names)))
+        elif match.group(1):
+            name, filter_name = match.group(1), match.group(2)
+            if filter_name and filter_name not in _FILTERS:
+                raise ValueError(f"Unknown filter '{filter_name}' in template: {template!r}")
+            stack[-1].append(('field', name, filter_name))
+            direct[-1].append(name)
+            fields.add(name)
+        else:
+            stack[-1].append(('text', token))
+    if len(stack) != 1:
+        raise ValueError(f"Unbalanced '<' in template: {template!r}")
+    return stack[0], fields, dot
+
+
+def _emit(nodes, lines, indent):
+    """Python statements that append the pieces of `nodes` to the list `b`."""
+    pad = "    " * indent
+    for node in nodes:
+        kind = node[0]
+        if kind == 'text':
+            text = node[1]
+            stripped = _LEADING_SEPARATOR_RE.sub("", text)
+            if stripped != text:
+                # A separator is dropped when nothing precedes it in the part
+                lines.append(f"{pad}b.append({text!r} if b else {stripped!r})")
+            else:
+                lines.append(f"{pad}b.append({text!r})")
+        elif kind == 'field':
+            value = f"_f_{node[1]}"
+            if node[2]:
+                value = f"_filter_{node[2]}({value})"
+            lines.append(f"{pad}if _f_{node[1]}: b.append({value})")
+        else:
+            condition = " and ".join(f"_f_{name}" for name in node[2]) or "True"
+            lines.append(f"{pad}if {condition}:")
+            _emit(node[1], lines, indent + 1)
+
+
+def _unknown(data):
+    return UNKNOWN_FORMAT
+
+
+@lru_cache(maxsize=None)
+def renderer(style, publication_type):
+    """
+    Compiled citation renderer for one style and publication type: render(data) -> str.
+    The templates are turned into the source of one plain Python function
+    (field lookups, then a few ifs and appends per part), compiled once and cached.
+    """
+    if style not in STYLES:
+        raise ValueError(f"Bilinmeyen atıf stili: {style}")
+    templates = STYLES[style]['types'].get(publication_type)
+    if templates is None:
+        return _unknown
+
+    parts = [_parse(template) for template in templates]
+    fields = sorted(set().union(*(f for _, f, _ in parts)))
+    namespace = {f"_get_{name}": _field_getter(style, name) for name in fields}
+    namespace.update({f"_filter_{name}": func for name, func in _FILTERS.items()}, ensure_dot=ensure_dot)
+
+    lines = ["def render(data):"]
+    lines += [f"    _f_{name} = _get_{name}(data)" for name in fields]
+    lines.append("    out = []")
+    for nodes, _, dot in parts:
+        lines.append("    b = []")
+        _emit(nodes, lines, 1)
+        lines.append("    t = ''.join(b)")
+        if dot:
+            lines.append("    t = ensure_dot(t)")
+        lines.append("    if t: out.append(t)")
+    lines.append("    return ' '.join(out)")
+
+    exec(compile("\n".join(lines), f"<citation {style}/{publication_type}>", "exec"), namespace)
+    return namespace['render']
+
+
+def format_citation(data, style=DEFAULT_STYLE):
+    """Formats one publication in the given style (a key of STYLES)."""
+    return renderer(style, data.get('publication_type', 'Makale'))(data)
@@ -1,135 +1,608 @@
-import requests
-import json
-from datetime import datetime
-import os
-import streamlit as st
-
-# API URL Management
-def get_api_url():
-    # 1. Secrets (Cloud)
-    try:
-        if "api_url" in st.secrets:
-            return st.secrets["api_url"]
-    except Exception:
-        pass
-    
-    # 2. Local File
-    if os.path.exists("api_url.txt"):
-        with open("api_url.txt", "r") as f:
-            return f.read().strip()
-            
-    return None
-
-def init_db():
-    pass
-
-def add_publication(data):
-    """
-    Sends publication data to Google Sheet via Web API.
-    """
-    url = get_api_url()
-    if not url:
-        st.error("API Bağlantı hatası: 'api_url.txt' dosyası bulunamadı.")
-        return False
-        
-    try:
-        # Prepare data for API
-        # DB expects 'authors_json' logic implicitly handled by Python dict -> JSON
-        # But 'editors' is now a LIST of dicts, similar to authors.
-        # Apps Script expects 'editors' column.
-        # Ideally, we should serialize it to string if Apps Script expects string,
-        # OR send it as object and let Apps Script stringify it?
-        # Apps Script code: `JSON.stringify(data.authors) || "[]"`
-        # Apps Script code for editors: `data.editors || ""` -> Just takes it.
-        # If we send a List, it might show [object Object].
-        # Let's manual serialize editors to be safe, like authors_json logic in DBManager history.
-        # Actually, Apps Script doesn't auto-stringify 'editors'.
-        # So we should stringify IT here if we want clean string in Sheet.
-        
-        # Clone data to avoid mutating original for display
-        payload = data.copy()
-        
-        # Serialize editors if present and is list
-        if 'editors' in payload and isinstance(payload['editors'], list):
-            payload['editors'] = json.dumps(payload['editors'])
-            
-        # Serialize authors? Apps Script does: `JSON.stringify(data.authors)`
-        # So we can send raw list for authors.
-        
-        response = requests.post(url, json=payload)
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("result") == "success":
-                return True
-            else:
-                st.error(f"Kayıt Hatası: {result.get('error')}")
-                return False
-        else:
-            st.error(f"Sunucu Hatası: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        st.error(f"Bağlantı Hatası: {str(e)}")
-        return False
-
-def get_publications(start_date=None, end_date=None):
-    """
-    Fetches all publications from Web API.
-    """
-    url = get_api_url()
-    if not url:
-        return []
-        
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            all_data = response.json()
-            
-            if isinstance(all_data, dict) and all_data.get("result") == "error":
-                st.error(f"Veri Okuma Hatası: {all_data.get('error')}")
-                return []
-                
-            if not isinstance(all_data, list):
-                return []
-            
-            # Post-Process Data
-            processed_data = []
-            for item in all_data:
-                # 'authors' is already parsed by Apps Script `doGet` into object/list
-                
-                # Parse 'editors' if it is a JSON string
-                if 'editors' in item and isinstance(item['editors'], str):
-                    if item['editors'].startswith('[') or item['editors'].startswith('{'):
-                         try:
-                             item['editors'] = json.loads(item['editors'])
-                         except:
-                             pass
-                
-                processed_data.append(item)
-                
-            # Filter by Date
-            if start_date and end_date:
-                filtered = []
-                for item in processed_data:
-                    p_date = item.get('publication_date', '')
-                    if p_date >= start_date and p_date <= end_date:
-                        filtered.append(item)
-                return filtered
-            
-            return processed_data
-            
-        else:
-            st.error(f"Sunucu Hatası: {response.status_code}")
-            return []
-            
-    except Exception as e:
-        st.error(f"Bağlantı Hatası: {str(e)}")
-        return []
-
-def get_all_publications():
-    """
-    Alias for get_publications() - fetches all publications without date filtering.
-    """
-    return get_publications()
-
+import json
+import os
+import queue
+import threading
+import time
+import streamlit as st
+import apa_formatter
+from author_resolution import AuthorResolver
+from autocomplete import AutocompleteIndex
+from duplicate_detector import DuplicateIndex
+from publication_query import PublicationQuery, QueryIndexes
+from storage_backends import (BACKENDS, SUMMARY_FIELDS, AppsScriptBackend, SQLiteBackend, StorageError,
+                              count_publications, filter_by_date, project)
+
+# API URL Management
+def get_api_url():
+    # 1. Secrets (Cloud)
+    try:
+        if "api_url" in st.secrets:
+            return st.secrets["api_url"]
+    except Exception:
+        pass
+    
+    # 2. Local File
+    if os.path.exists("api_url.txt"):
+        with open("api_url.txt", "r") as f:
+            return f.read().strip()
+            
+    return None
+
+# Storage Backend Selection
+def get_backend_name():
+    """
+    Returns the configured storage backend: 'apps_script' (default) or 'sqlite'.
+    """
+    # 1. Secrets (Cloud)
+    try:
+        if "storage_backend" in st.secrets:
+            return st.secrets["storage_backend"]
+    except Exception:
+        pass
+
+    # 2. Local File
+    if os.path.exists("storage_backend.txt"):
+        with open("storage_backend.txt", "r") as f:
+            name = f.read().strip()
+            if name:
+                return name
+
+    return AppsScriptBackend.name
+
+def get_sqlite_path():
+    try:
+        if "sqlite_path" in st.secrets:
+            return st.secrets["sqlite_path"]
+    except Exception:
+        pass
+    return "publications.db"
+
+_backends = {}
+
+def get_backend():
+    """
+    Returns the backend instance for the current configuration.
+    Instances are shared across reruns and sessions (SQLite keeps
+    per-thread connections inside the instance).
+    """
+    name = get_backend_name()
+    if name == SQLiteBackend.name:
+        key = (name, os.path.abspath(get_sqlite_path()))
+    elif name == AppsScriptBackend.name:
+        key = (name, get_api_url())
+    else:
+        raise StorageError(f"Bilinmeyen depolama türü: {name}")
+
+    if key not in _backends:
+        _backends[key] = BACKENDS[name](key[1])
+    return _backends[key]
+
+def is_configured():
+    """
+    True when the selected backend has everything it needs to run.
+    Only the Apps Script backend needs setup (the Web App URL).
+    """
+    if get_backend_name() == SQLiteBackend.name:
+        return True
+    return bool(get_api_url())
+
+def init_db():
+    try:
+        get_backend().init()
+    except Exception as e:
+        st.error(f"Veritabanı Hatası: {str(e)}")
+
+def add_publication(data):
+    """
+    Stores publication data in the configured backend.
+    """
+    if get_backend_name() == AppsScriptBackend.name and not get_api_url():
+        st.error("API Bağlantı hatası: 'api_url.txt' dosyası bulunamadı.")
+        return False
+
+    try:
+        # The citation is stored with the record so readers do not format it again
+        data = apa_formatter.with_citation(data)
+        backend = get_backend()
+        new_id = backend.add_publication(data)
+        _invalidate_publications(backend)
+        with _duplicate_index_lock:
+            _duplicate_index.add({**data, 'id': new_id}, key=new_id)
+        with _autocomplete_lock:
+            _autocomplete_index.add({**data, 'id': new_id}, key=new_id)
+        return True
+    except StorageError as e:
+        st.error(str(e))
+        return False
+    except Exception as e:
+        st.error(f"Bağlantı Hatası: {str(e)}")
+        return False
+
+# Request Coalescing
+class _SingleFlight:
+    """
+    Concurrent calls with the same key share one execution: the first caller
+    runs the function, callers arriving while it runs wait for it and get
+    the same result (or the same exception). Nothing is kept afterwards;
+    the next call runs the function again.
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}   # key -> _Call in flight
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+# Sessions that open the app at the same moment share one backend request
+# (and the script lock on the Apps Script side) instead of queueing identical ones
+_single_flight = _SingleFlight()
+
+# Conditional Refresh (stale-while-revalidate)
+PUBLICATIONS_FRESH_FOR = 30       # seconds a snapshot is served without asking the backend
+PUBLICATIONS_MAX_STALE = 3600     # older snapshots are revalidated before they are served
+PUBLICATIONS_CACHE_MAX_AGE = 600  # seconds; edits made directly in the sheet do not bump the version
+
+class _Snapshot:
+    """All publications as of one data version, with their query indexes."""
+
+    def __init__(self, version, records):
+        self.version = version
+        self.records = records
+        self.indexes = QueryIndexes(records)
+        self.fetched_at = self.checked_at = time.time()
+        self.error = None   # message of the last failed revalidation, if any
+
+_publications_cache = {}       # backend -> _Snapshot
+_publications_generation = {}  # backend -> number of invalidations (saves made through this process)
+_publications_cache_lock = threading.Lock()
+
+def _invalidate_publications(backend):
+    """Drops the snapshot after a write, so the next read waits for fresh data."""
+    with _publications_cache_lock:
+        _publications_cache.pop(backend, None)
+        _publications_generation[backend] = _publications_generation.get(backend, 0) + 1
+
+def _revalidate(backend):
+    """
+    Brings the snapshot of `backend` up to date and returns it (None when
+    the backend has no version probe, so nothing can be cached). A failed
+    check keeps serving the last good snapshot; StorageError is raised only
+    when there is none.
+    """
+    with _publications_cache_lock:
+        generation = _publications_generation.get(backend, 0)
+    # One check at a time per backend; keyed by generation so a read after a
+    # save never joins a check that started before it
+    return _single_flight.do((backend, 'revalidate', generation), lambda: _check_snapshot(backend, generation))
+
+def _check_snapshot(backend, generation):
+    with _publications_cache_lock:
+        snapshot = _publications_cache.get(backend)
+    try:
+        version = backend.get_data_version()
+        if version is None:
+            return None
+        if (snapshot is not None and snapshot.version == version
+                and time.time() - snapshot.fetched_at < PUBLICATIONS_CACHE_MAX_AGE):
+            snapshot.checked_at = time.time()
+            snapshot.error = None
+            return snapshot
+        # The version is read before the download, so a save racing with
+        # it at worst causes one extra refetch
+        fresh = _Snapshot(version, _post_process(backend.get_publications()))
+    except Exception as e:
+        if snapshot is None:
+            if isinstance(e, StorageError):
+                raise
+            raise StorageError(f"Bağlantı Hatası: {str(e)}") from e
+        # Backend slow or down: keep the last good data, try again after PUBLICATIONS_FRESH_FOR
+        snapshot.checked_at = time.time()
+        snapshot.error = str(e)
+        return snapshot
+
+    with _publications_cache_lock:
+        if _publications_generation.get(backend, 0) == generation:
+            _publications_cache[backend] = fresh
+    return fresh
+
+class _Refresher:
+    """
+    Background thread that revalidates snapshots, so readers get the cached
+    data immediately instead of waiting for the backend. Started on first use.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def request(self, backend):
+        with self._lock:
+            if backend in self._pending:
+                return
+            self._pending.add(backend)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="publications-refresher", daemon=True)
+                self._thread.start()
+        self._queue.put(backend)
+
+    def _run(self):
+        while True:
+            backend = self._queue.get()
+            try:
+                _revalidate(backend)
+            except Exception:
+                # No snapshot to fall back on; the next reader retries in the foreground
+                pass
+            finally:
+                with self._lock:
+                    self._pending.discard(backend)
+
+_refresher = _Refresher()
+
+def warm_up():
+    """
+    Starts loading publications in the background unless a fresh snapshot
+    is already there. Called when a page that will need them is opened, so
+    the data is usually in memory by the time a button is pressed.
+    """
+    if not is_configured():
+        return
+    try:
+        backend = get_backend()
+    except StorageError:
+        return
+    with _publications_cache_lock:
+        snapshot = _publications_cache.get(backend)
+    if snapshot is None or time.time() - snapshot.checked_at > PUBLICATIONS_FRESH_FOR:
+        _refresher.request(backend)
+
+def load_query(start_date=None, end_date=None, fields=None):
+    """
+    Publications as a PublicationQuery limited to the date range; further
+    conditions (department, type, ...) are added by the caller and all of
+    them are evaluated in one pass. Raises StorageError on failure.
+
+    The full list is kept in memory (stale-while-revalidate): a snapshot
+    checked within PUBLICATIONS_FRESH_FOR is served as is, an older one is
+    served at once while the background refresher asks the backend for its
+    data version and downloads again only if it moved. Only a missing or
+    very old (PUBLICATIONS_MAX_STALE) snapshot is waited for, and if the
+    backend fails then, the last good snapshot is served anyway.
+
+    Cached publications come with indexes, so a department or type condition
+    only visits the matching records. Backends without a data version probe
+    are asked directly on every call, as is a field projection when nothing
+    is cached yet.
+    """
+    if not is_configured():
+        raise StorageError("API Bağlantı hatası: 'api_url.txt' dosyası bulunamadı.")
+
+    try:
+        backend = get_backend()
+        with _publications_cache_lock:
+            snapshot = _publications_cache.get(backend)
+
+        if snapshot is None and fields is not None:
+            # A narrow query is cheaper than a full download
+            key = (backend, 'publications', start_date, end_date, tuple(fields))
+            records = _single_flight.do(
+                key, lambda: _post_process(backend.get_publications(start_date, end_date, fields))
+            )
+            return PublicationQuery(records)
+
+        age = time.time() - snapshot.checked_at if snapshot is not None else None
+        if snapshot is None or age > PUBLICATIONS_MAX_STALE:
+            snapshot = _revalidate(backend)
+        elif age > PUBLICATIONS_FRESH_FOR:
+            _refresher.request(backend)
+
+        if snapshot is None:
+            # No version probe: nothing is cached
+            key = (backend, 'publications', start_date, end_date, None)
+            records = _single_flight.do(
+                key, lambda: _post_process(backend.get_publications(start_date, end_date))
+            )
+            return PublicationQuery(records)
+    except StorageError:
+        raise
+    except Exception as e:
+        raise StorageError(f"Bağlantı Hatası: {str(e)}") from e
+
+    return PublicationQuery(snapshot.records, snapshot.indexes).between(start_date, end_date)
+
+def _cached_snapshot():
+    """Snapshot of the configured backend, or None."""
+    try:
+        backend = get_backend()
+    except StorageError:
+        return None
+    with _publications_cache_lock:
+        return _publications_cache.get(backend)
+
+def _warn_if_stale():
+    """Tells the user when the backend is failing and cached data is shown."""
+    snapshot = _cached_snapshot()
+    if snapshot is not None and snapshot.error:
+        minutes = int((time.time() - snapshot.fetched_at) // 60)
+        st.warning(f"Sunucuya ulaşılamıyor; {minutes} dakika önceki veriler gösteriliyor. ({snapshot.error})")
+
+def load_publications(start_date=None, end_date=None, fields=None, summary=False):
+    """
+    Fetches publications from the configured backend without touching the UI.
+    Raises StorageError on failure (used by the command-line report tool).
+
+    When the backend has a data version probe, the full list is kept in
+    memory and revalidated in the background (see load_query); date
+    filters and field projections are then applied locally. The returned
+    records are shared with the cache and must not be modified.
+    """
+    if summary:
+        fields = SUMMARY_FIELDS
+    return list(project(load_query(start_date, end_date, fields), fields))
+
+def get_publications(start_date=None, end_date=None, fields=None, summary=False):
+    """
+    Fetches publications from the configured backend.
+    fields: only these record keys are fetched, e.g. ['id', 'authors', 'title'].
+    summary=True: only id, department, publication_type and publication_date
+    (enough for counts and grouping).
+    """
+    if not is_configured():
+        return []
+
+    try:
+        publications = load_publications(start_date, end_date, fields, summary)
+    except StorageError as e:
+        st.error(str(e))
+        return []
+    _warn_if_stale()
+    return publications
+
+def query_publications(start_date=None, end_date=None):
+    """
+    Like get_publications(), but returns a PublicationQuery to be narrowed
+    further before the records are read (an empty one on failure).
+    """
+    if not is_configured():
+        return PublicationQuery([])
+
+    try:
+        query = load_query(start_date, end_date)
+    except StorageError as e:
+        st.error(str(e))
+        return PublicationQuery([])
+    _warn_if_stale()
+    return query
+
+# Stored Citations
+CITATION_BATCH_SIZE = 500  # citations written per backend request
+
+def regenerate_citations(on_progress=None):
+    """
+    Rewrites stored citations that are missing (records saved before the
+    column existed) or were made by an older apa_formatter.FORMATTER_VERSION.
+    on_progress(done, total) is called after each batch. Returns the number
+    of citations rewritten; raises StorageError on failure.
+    """
+    # Work on current data, not on a snapshot that may be a few seconds old
+    backend = get_backend()
+    _invalidate_publications(backend)
+    stale = [
+        pub for pub in load_publications()
+        if pub.get('id') not in (None, '') and not apa_formatter.has_current_citation(pub)
+    ]
+    if not stale:
+        return 0
+
+    try:
+        for start in range(0, len(stale), CITATION_BATCH_SIZE):
+            batch = stale[start:start + CITATION_BATCH_SIZE]
+            backend.update_citations([
+                (pub['id'], apa_formatter.format_apa_6(pub), apa_formatter.FORMATTER_VERSION)
+                for pub in batch
+            ])
+            if on_progress:
+                on_progress(start + len(batch), len(stale))
+    except StorageError:
+        raise
+    except Exception as e:
+        raise StorageError(f"Bağlantı Hatası: {str(e)}") from e
+    finally:
+        _invalidate_publications(backend)
+    return len(stale)
+
+def get_publication_counts(start_date=None, end_date=None):
+    """
+    Publication counts by department, type and year, aggregated by the
+    backend: [{'department', 'publication_type', 'year', 'count'}].
+    """
+    if not is_configured():
+        return []
+
+    try:
+        backend = get_backend()
+        return _single_flight.do((backend, 'counts', start_date, end_date),
+                                 lambda: backend.get_publication_counts(start_date, end_date))
+    except Exception as e:
+        message = str(e) if isinstance(e, StorageError) else f"Bağlantı Hatası: {str(e)}"
+        snapshot = _cached_snapshot()
+        if snapshot is None:
+            st.error(message)
+            return []
+        # Backend unhealthy: count the publications already in memory
+        st.warning(f"Sunucuya ulaşılamıyor; sayılar önbellekteki verilerden hesaplandı. ({message})")
+        return count_publications(filter_by_date(snapshot.records, start_date, end_date))
+
+def search_publications(query, limit=50):
+    """
+    Full-text search over title, journal, book title, publisher and authors.
+    Returns publications ranked best match first.
+    """
+    if not is_configured() or not query or not query.strip():
+        return []
+
+    try:
+        backend = get_backend()
+        results = _single_flight.do((backend, 'search', query, limit), lambda: backend.search(query, limit))
+    except StorageError as e:
+        st.error(str(e))
+        return []
+    except Exception as e:
+        st.error(f"Bağlantı Hatası: {str(e)}")
+        return []
+
+    return _post_process(results)
+
+# Author Identity Resolution
+_author_resolver = AuthorResolver()
+_author_resolver_lock = threading.Lock()
+
+def resolve_authors(publications):
+    """
+    Feeds publications into the shared AuthorResolver and returns it.
+    Already resolved publications are skipped, so repeated reports only pay
+    for new records; canonical author ids stay stable for the process lifetime.
+    """
+    with _author_resolver_lock:
+        _author_resolver.add_publications(publications)
+    return _author_resolver
+
+# Near-Duplicate Detection
+_duplicate_index = DuplicateIndex()
+_duplicate_index_lock = threading.Lock()
+_duplicate_index_synced_at = 0
+DUPLICATE_INDEX_TTL = 300  # seconds before records added elsewhere are pulled in
+
+def _sync_duplicate_index():
+    """
+    Loads records the duplicate index has not seen yet. Runs at most once per
+    DUPLICATE_INDEX_TTL; in between, saves made through this process are
+    added to the index directly by add_publication().
+    """
+    global _duplicate_index_synced_at
+    if time.time() - _duplicate_index_synced_at < DUPLICATE_INDEX_TTL:
+        return
+    publications = get_all_publications()
+    with _duplicate_index_lock:
+        for pub in publications:
+            if pub.get('id') not in _duplicate_index:
+                _duplicate_index.add(pub)
+        _duplicate_index_synced_at = time.time()
+
+def find_duplicates(data):
+    """
+    Returns [(publication, similarity)] for stored publications that look
+    like `data` (similar title, close year, shared author).
+    """
+    _sync_duplicate_index()
+    with _duplicate_index_lock:
+        return _duplicate_index.find_duplicates(data)
+
+def import_publications(records):
+    """
+    Bulk import (e.g. from a BibTeX file). Records that are near-duplicates
+    of stored publications, or of earlier records in the same batch, are
+    skipped. Returns (added_count, [(record, duplicates), ...], failed_count).
+    """
+    added = 0
+    failed = 0
+    skipped = []
+    for record in records:
+        duplicates = find_duplicates(record)
+        if duplicates:
+            skipped.append((record, duplicates))
+        elif add_publication(record):
+            added += 1
+        else:
+            failed += 1
+    return added, skipped, failed
+
+# Autocomplete
+_autocomplete_index = AutocompleteIndex()
+_autocomplete_lock = threading.Lock()
+_autocomplete_synced_snapshot = None
+AUTOCOMPLETE_MIN_PREFIX = 2  # characters typed before anything is suggested
+
+def _sync_autocomplete_index():
+    """
+    Feeds records of the publications snapshot the index has not seen yet.
+    Never waits for the backend: without a snapshot a background load is
+    started and suggestions come from saves made through this process.
+    """
+    global _autocomplete_synced_snapshot
+    snapshot = _cached_snapshot()
+    if snapshot is None:
+        warm_up()
+        return
+    if snapshot is _autocomplete_synced_snapshot:
+        return
+    with _autocomplete_lock:
+        for pub in snapshot.records:
+            if pub.get('id') not in _autocomplete_index:
+                _autocomplete_index.add(pub)
+        _autocomplete_synced_snapshot = snapshot
+
+def suggest(field, prefix, limit=5):
+    """
+    Stored spellings of `field` ('surname', 'name', 'journal_name',
+    'publisher', 'book_title' or 'location') starting with `prefix`, most
+    frequently used first. Matching ignores case and Turkish characters.
+    """
+    if not is_configured() or len((prefix or "").strip()) < AUTOCOMPLETE_MIN_PREFIX:
+        return []
+    _sync_autocomplete_index()
+    with _autocomplete_lock:
+        return _autocomplete_index.suggest(field, prefix, limit)
+
+def _post_process(records):
+    processed_data = []
+    for item in records:
+        # 'authors' is already parsed by the backend into a list
+
+        # Parse 'editors' if it is a JSON string
+        if 'editors' in item and isinstance(item['editors'], str):
+            if item['editors'].startswith('[') or item['editors'].startswith('{'):
+                 try:
+                     item['editors'] = json.loads(item['editors'])
+                 except:
+                     pass
+
+        processed_data.append(item)
+
+    return processed_data
+
+def get_all_publications():
+    """
+    Alias for get_publications() - fetches all publications without date filtering.
+    """
+    return get_publications()
@@ -0,0 +1,122 @@
+import random
+import zlib
+
+from author_resolution import surname_key
+from search_index import tokenize
+
+# MinHash / LSH parameters: 16 bands x 4 rows puts the LSH threshold near
+# 0.5 Jaccard, well below SIMILARITY_THRESHOLD, so true near-duplicates are
+# almost always among the candidates.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+# A candidate is a duplicate only if all of these hold
+SIMILARITY_THRESHOLD = 0.8   # title shingle Jaccard
+MAX_YEAR_GAP = 1             # years apart (when both dates are known)
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240101)  # fixed seed: signatures must match across processes
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def title_shingles(title):
+    """Character 3-grams of the normalized title (Turkish/ASCII folded, punctuation dropped)."""
+    text = " ".join(tokenize(title))
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingles):
+    # zlib.crc32 instead of hash(): str hashes are randomized per process
+    hashed = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+    return [min((a * h + b) % _PRIME for h in hashed) for a, b in _PERMUTATIONS]
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _year(pub):
+    date = str(pub.get('publication_date', '') or '')
+    return int(date[:4]) if date[:4].isdigit() else None
+
+
+def _surnames(pub):
+    authors = pub.get('authors', [])
+    if not isinstance(authors, list):
+        return set()
+    return {surname_key(a.get('surname', '')) for a in authors if isinstance(a, dict)} - {''}
+
+
+class DuplicateIndex:
+    """
+    MinHash LSH index over publication titles.
+    find_duplicates() only verifies the records that share an LSH band with
+    the query, so a check costs the same no matter how many records exist.
+    """
+
+    def __init__(self):
+        self.buckets = {}   # (band no, band hash) -> [doc key, ...]
+        self.docs = {}      # doc key -> (record, shingles)
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, key):
+        return key in self.docs
+
+    def _bands(self, signature):
+        for band in range(BANDS):
+            yield (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+
+    def add(self, pub, key=None):
+        key = pub.get('id') if key is None else key
+        if key is None:
+            key = f"_local{len(self.docs)}"
+        if key in self.docs:
+            return
+        shingles = title_shingles(pub.get('title', ''))
+        self.docs[key] = (pub, shingles)
+        if not shingles:
+            return
+        for band in self._bands(minhash(shingles)):
+            self.buckets.setdefault(band, []).append(key)
+
+    def find_duplicates(self, pub):
+        """
+        Returns [(record, similarity)] for stored records that look like the
+        same publication: similar title, publication years at most
+        MAX_YEAR_GAP apart and at least one shared author surname.
+        Missing years or authors on either side do not rule a match out.
+        """
+        shingles = title_shingles(pub.get('title', ''))
+        if not shingles:
+            return []
+
+        candidates = set()
+        for band in self._bands(minhash(shingles)):
+            candidates.update(self.buckets.get(band, ()))
+
+        year = _year(pub)
+        surnames = _surnames(pub)
+        matches = []
+        for key in candidates:
+            other, other_shingles = self.docs[key]
+            similarity = jaccard(shingles, other_shingles)
+            if similarity < SIMILARITY_THRESHOLD:
+                continue
+            other_year = _year(other)
+            if year is not None and other_year is not None and abs(year - other_year) > MAX_YEAR_GAP:
+                continue
+            other_surnames = _surnames(other)
+            if surnames and other_surnames and not (surnames & other_surnames):
+                continue
+            matches.append((other, similarity))
+
+        matches.sort(key=lambda item: -item[1])
+        return matches
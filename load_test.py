@@ -0,0 +1,410 @@
+"""
+Load test for the data-entry and report flows: N simulated faculty members
+submit publications and pull reports at the same time against the Apps
+Script Web App (or any endpoint with the same contract), and throughput,
+p50/p95/p99 latency and error rates are reported per operation.
+
+--local starts an in-process stand-in for the Apps Script Web App that
+serialises requests on one lock, like LockService in apps_script_kodu.js,
+with configurable service times and lock timeout. As in the script, a save
+that cannot get the lock in time fails, while a read carries on without it;
+those unlocked reads are counted. It is meant for trying
+out the tool and for what-if runs (e.g. "what if a save takes 2 s?").
+
+Examples:
+    python load_test.py --local --users 20 --duration 30
+    python load_test.py --local --users 50 --mix submit=1,report=4 --server-write-ms 1500
+    python load_test.py --url "$(cat api_url.txt)" --users 10 --duration 60 --mix report=3,counts=1
+    python load_test.py --local --users 30 --json > sonuc.json
+
+Requests are sent as they are, without the retries, hedging and circuit
+breaker of AppsScriptBackend, so the numbers show what the endpoint itself
+does. 'submit' adds real rows; they are titled "[YÜK TESTİ] ..." under the
+department "Yük Testi" and have to be removed from the sheet afterwards.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from resilience import LatencyTracker
+from storage_backends import count_publications, filter_by_date
+
+OPERATIONS = ['submit', 'report', 'counts']
+DEFAULT_MIX = {'submit': 1, 'report': 3, 'counts': 1}
+PERCENTILES = [50, 95, 99]
+
+TEST_DEPARTMENT = "Yük Testi"
+# doPost's answer when it cannot get the script lock (LOCK_BUSY_ERROR in apps_script_kodu.js)
+LOCK_BUSY_ERROR = "Sunucu meşgul, kayıt yapılmadı. Lütfen tekrar deneyin."
+
+
+# Simulated users
+
+def synthetic_publication(rng, user, number):
+    year = rng.randint(2015, 2025)
+    return {
+        'department': TEST_DEPARTMENT,
+        'publication_type': 'Makale',
+        'authors': [{'surname': f"Kullanıcı{user}", 'name': 'Yük'}],
+        'publication_date': f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        'title': f"[YÜK TESTİ] Kullanıcı {user} yayın {number}",
+        'journal_name': 'Test Dergisi', 'volume': '1', 'issue': '1', 'pages': '1-10',
+    }
+
+
+def _check(response):
+    """Raises for everything the app would show as an error."""
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}")
+    data = response.json()
+    if isinstance(data, dict) and data.get("result") == "error":
+        raise RuntimeError(str(data.get("error")))
+    return data
+
+
+def _submit(session, url, rng, user, number, timeout):
+    _check(session.post(url, json=synthetic_publication(rng, user, number), timeout=timeout))
+
+
+def _report(session, url, rng, user, number, timeout):
+    # A yearly report, as the admin page asks for it
+    year = rng.randint(2015, 2025)
+    _check(session.get(url, params={'start': f"{year}-01-01", 'end': f"{year}-12-31"}, timeout=timeout))
+
+
+def _counts(session, url, rng, user, number, timeout):
+    _check(session.get(url, params={'mode': 'counts'}, timeout=timeout))
+
+
+_RUNNERS = {'submit': _submit, 'report': _report, 'counts': _counts}
+
+
+class LoadResult:
+    """
+    Latencies and errors per operation, collected from all users. Latency
+    percentiles are over successful requests; failed ones count in the
+    error rate.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {op: LatencyTracker(window=None) for op in OPERATIONS}
+        self.errors = {op: {} for op in OPERATIONS}   # op -> {message: count}
+        self.started = self.finished = None
+
+    def record(self, op, seconds, error=None):
+        if error is None:
+            self.latency[op].record(seconds)
+            return
+        with self._lock:
+            self.errors[op][error] = self.errors[op].get(error, 0) + 1
+
+    def summary(self):
+        elapsed = max(1e-9, self.finished - self.started)
+        operations = {}
+        total = total_errors = 0
+        for op in OPERATIONS:
+            ok = len(self.latency[op])
+            errors = sum(self.errors[op].values())
+            if not ok and not errors:
+                continue
+            total += ok + errors
+            total_errors += errors
+            operations[op] = {
+                'requests': ok + errors,
+                'errors': errors,
+                'error_rate': errors / (ok + errors),
+                'throughput': (ok + errors) / elapsed,
+                'latency_ms': {
+                    f"p{p}": round(self.latency[op].percentile(p) * 1000, 1) if ok else None
+                    for p in PERCENTILES + [100]
+                },
+                'error_messages': dict(sorted(self.errors[op].items(), key=lambda item: -item[1])),
+            }
+        return {
+            'duration_s': round(elapsed, 2),
+            'requests': total,
+            'throughput': total / elapsed,
+            'error_rate': total_errors / total if total else 0.0,
+            'operations': operations,
+        }
+
+
+def run_load(url, users=10, duration=30.0, mix=None, think_time=1.0, ramp_up=0.0,
+             timeout=30.0, seed=None, on_progress=None):
+    """
+    Runs `users` simulated users against `url` for `duration` seconds and
+    returns the LoadResult. Each user picks an operation by the weights in
+    `mix`, waits for the answer, then thinks for a random 0..2*think_time
+    seconds. Users start evenly spread over `ramp_up` seconds.
+    on_progress(done_requests) is called about once a second.
+    """
+    mix = {op: w for op, w in (mix or DEFAULT_MIX).items() if w > 0}
+    ops, weights = list(mix), list(mix.values())
+    result = LoadResult()
+    done = [0]
+    done_lock = threading.Lock()
+    stop_at = time.monotonic() + ramp_up + duration
+
+    def user_loop(user):
+        rng = random.Random(None if seed is None else seed + user)
+        if users > 1:
+            time.sleep(ramp_up * user / users)
+        with requests.Session() as session:
+            number = 0
+            while time.monotonic() < stop_at:
+                number += 1
+                op = rng.choices(ops, weights)[0]
+                started = time.perf_counter()
+                error = None
+                try:
+                    _RUNNERS[op](session, url, rng, user, number, timeout)
+                except requests.Timeout:
+                    error = "zaman aşımı"
+                except requests.RequestException as e:
+                    error = f"bağlantı hatası: {type(e).__name__}"
+                except (RuntimeError, ValueError) as e:
+                    error = str(e) or type(e).__name__
+                result.record(op, time.perf_counter() - started, error)
+                with done_lock:
+                    done[0] += 1
+                if think_time > 0:
+                    time.sleep(min(rng.uniform(0, 2 * think_time), max(0.0, stop_at - time.monotonic())))
+
+    threads = [threading.Thread(target=user_loop, args=(user,), name=f"load-user-{user}", daemon=True)
+               for user in range(users)]
+    result.started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(timeout=1.0)
+            if on_progress:
+                on_progress(done[0])
+    result.finished = time.monotonic()
+    return result
+
+
+def format_summary(summary, users):
+    lines = [
+        f"{users} kullanıcı, {summary['duration_s']} sn, {summary['requests']} istek: "
+        f"{summary['throughput']:.2f} istek/sn, hata oranı %{summary['error_rate'] * 100:.1f}",
+        "",
+        f"{'İşlem':<8}{'İstek':>7}{'Hata':>7}{'Hata %':>8}{'İstek/sn':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'En çok':>10}",
+    ]
+
+    def ms(value):
+        return "-" if value is None else f"{value:.0f}"
+
+    for op, stats in summary['operations'].items():
+        latency = stats['latency_ms']
+        lines.append(
+            f"{op:<8}{stats['requests']:>7}{stats['errors']:>7}{stats['error_rate'] * 100:>8.1f}"
+            f"{stats['throughput']:>10.2f}{ms(latency['p50']):>10}{ms(latency['p95']):>10}"
+            f"{ms(latency['p99']):>10}{ms(latency['p100']):>10}"
+        )
+    for op, stats in summary['operations'].items():
+        for message, count in stats['error_messages'].items():
+            lines.append(f"  {op}: {count} x {message}")
+    if summary.get('unlocked_reads'):
+        lines.append(f"Kilitsiz okuma (kilit beklemesi aşıldı): {summary['unlocked_reads']}")
+    return "\n".join(lines)
+
+
+# Local stand-in for the Apps Script Web App
+
+class LocalServer:
+    """
+    Minimal HTTP server with the contract of apps_script_kodu.js (POST a
+    publication, GET ?start=&end=, ?mode=counts, ?mode=version). Every
+    request except the version probe holds one global lock for its service
+    time. After `lock_timeout` seconds of waiting a save fails with the
+    script's LOCK_BUSY_ERROR, and a read goes ahead without the lock
+    (counted in unlocked_reads), as doPost and doGet do.
+
+        with LocalServer(write_ms=800) as server:
+            run_load(server.url, users=20)
+    """
+
+    def __init__(self, write_ms=800, read_ms=300, lock_timeout=10.0, port=0):
+        self.write_s = write_ms / 1000
+        self.read_s = read_ms / 1000
+        self.lock_timeout = lock_timeout
+        self.records = []
+        self.version = 0
+        self.unlocked_reads = 0
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/exec"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="load-test-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _locked(self, service_time, work, write):
+        locked = self._lock.acquire(timeout=self.lock_timeout)
+        if not locked:
+            if write:
+                return {"result": "error", "error": LOCK_BUSY_ERROR}
+            with self._stats_lock:
+                self.unlocked_reads += 1
+        try:
+            time.sleep(service_time)
+            return work()
+        finally:
+            if locked:
+                self._lock.release()
+
+    def _add(self, data):
+        self.version += 1
+        record = {**data, 'id': len(self.records) + 1}
+        self.records.append(record)
+        return {"result": "success", "id": record['id'], "version": self.version}
+
+    def _get(self, params):
+        if params.get('mode') == 'version':
+            return {"version": self.version, "citations": True}
+        records = filter_by_date(self.records, params.get('start'), params.get('end'))
+        if params.get('mode') == 'counts':
+            return count_publications(records)
+        return list(records)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                if params.get('mode') == 'version':
+                    # Like the script: the version probe does not wait for the lock
+                    self._send(server._get(params))
+                else:
+                    self._send(server._locked(server.read_s, lambda: server._get(params), write=False))
+
+            def do_POST(self):
+                data = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                self._send(server._locked(server.write_s, lambda: server._add(data), write=True))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# Command line
+
+def _mix_arg(value):
+    mix = {}
+    for part in value.split(","):
+        op, _, weight = part.partition("=")
+        op = op.strip()
+        if op not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"bilinmeyen işlem: {op} (seçenekler: {', '.join(OPERATIONS)})")
+        try:
+            mix[op] = float(weight) if weight else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"geçersiz ağırlık: {part}")
+    if not any(w > 0 for w in mix.values()):
+        raise argparse.ArgumentTypeError("en az bir işlemin ağırlığı sıfırdan büyük olmalı")
+    return mix
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Eşzamanlı kullanıcılarla yayın kaydı ve rapor isteklerinin yük testi."
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="test edilecek Web App adresi (gerçek kayıtlar eklenir!)")
+    target.add_argument("--local", action="store_true", help="yerel Apps Script benzeri sunucuya karşı çalıştır")
+    parser.add_argument("--users", type=int, default=10, help="eşzamanlı kullanıcı sayısı (varsayılan: 10)")
+    parser.add_argument("--duration", type=float, default=30, help="test süresi, sn (varsayılan: 30)")
+    parser.add_argument("--ramp-up", type=float, default=0, help="kullanıcıların yayılarak başlayacağı süre, sn")
+    parser.add_argument("--mix", type=_mix_arg, default=DEFAULT_MIX,
+                        help="işlem ağırlıkları, ör. submit=1,report=3,counts=1 (varsayılan)")
+    parser.add_argument("--think-time", type=float, default=1.0,
+                        help="kullanıcının istekler arası ortalama bekleme süresi, sn (varsayılan: 1)")
+    parser.add_argument("--timeout", type=float, default=30, help="istek zaman aşımı, sn (varsayılan: 30)")
+    parser.add_argument("--seed", type=int, help="tekrarlanabilir çalıştırma için rastgele tohum")
+    parser.add_argument("--server-write-ms", type=float, default=800,
+                        help="--local: bir kaydın kilit altında süresi, ms (varsayılan: 800)")
+    parser.add_argument("--server-read-ms", type=float, default=300,
+                        help="--local: bir okumanın kilit altında süresi, ms (varsayılan: 300)")
+    parser.add_argument("--server-lock-timeout", type=float, default=10,
+                        help="--local: kilit için en uzun bekleme, sn (varsayılan: 10)")
+    parser.add_argument("--json", action="store_true", help="sonucu JSON olarak yaz")
+    parser.add_argument("-q", "--quiet", action="store_true", help="ilerleme bilgisini gösterme")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.users < 1:
+        parser.error("--users en az 1 olmalı")
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    server = None
+    url = args.url
+    if args.local:
+        server = LocalServer(args.server_write_ms, args.server_read_ms, args.server_lock_timeout).start()
+        url = server.url
+    elif args.mix.get('submit'):
+        log(f"Uyarı: 'submit' işlemi {url} adresine gerçek kayıtlar ekler (bölüm: {TEST_DEPARTMENT}).")
+
+    log(f"{args.users} kullanıcı, {args.duration:g} sn: {url}")
+    try:
+        result = run_load(url, args.users, args.duration, args.mix, args.think_time, args.ramp_up,
+                          args.timeout, args.seed, on_progress=lambda done: log(f"{done} istek tamamlandı"))
+    finally:
+        if server is not None:
+            server.stop()
+
+    summary = result.summary()
+    if server is not None:
+        summary['unlocked_reads'] = server.unlocked_reads
+    if args.json:
+        print(json.dumps({'users': args.users, **summary}, ensure_ascii=False, indent=2))
+    else:
+        print(format_summary(summary, args.users))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
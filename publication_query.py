@@ -0,0 +1,193 @@
+"""
+Composable queries over publication records.
+
+A PublicationQuery collects conditions (date range, field equality, set
+membership, arbitrary predicates) without touching the data. Iterating it
+evaluates every condition in a single pass, and group_by() groups in that
+same pass. When the records come with QueryIndexes, the pass starts from
+the smallest matching index bucket instead of scanning every record.
+
+    query = PublicationQuery(records, indexes).between('2025-01-01', '2025-12-31')
+    query = query.where(department='İktisat')
+    groups = query.group_by('publication_type')
+"""
+from bisect import bisect_left, bisect_right
+
+# Fields with equality indexes (built lazily, on first use)
+INDEXED_FIELDS = ('id', 'department', 'publication_type')
+
+
+class QueryIndexes:
+    """
+    Lookup structures over one fixed list of records. Positions refer to
+    that list, so it must not be modified while the indexes are in use
+    (db_manager builds one per cached snapshot).
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self._equality = {}   # field -> {value: [position, ...]}
+        self._dates = None    # sorted [(publication_date, position)]
+
+    def positions(self, field, value):
+        """Positions of records with record[field] == value (ascending), None if the field is not indexed."""
+        if field not in INDEXED_FIELDS:
+            return None
+        index = self._equality.get(field)
+        if index is None:
+            index = {}
+            for position, record in enumerate(self.records):
+                index.setdefault(record.get(field), []).append(position)
+            self._equality[field] = index
+        return index.get(value, [])
+
+    def date_positions(self, start_date, end_date):
+        """Positions of records dated within [start_date, end_date] (ascending)."""
+        if self._dates is None:
+            self._dates = sorted(
+                (str(record.get('publication_date', '') or ''), position)
+                for position, record in enumerate(self.records)
+            )
+        dates = self._dates
+        lo = bisect_left(dates, (start_date, -1))
+        hi = bisect_right(dates, (end_date, len(self.records)))
+        return sorted(position for _, position in dates[lo:hi])
+
+
+class PublicationQuery:
+    """Immutable query: every method returns a new query with one more condition."""
+
+    def __init__(self, records, indexes=None):
+        self._records = records
+        self._indexes = indexes if indexes is not None and indexes.records is records else None
+        self._date_range = None
+        self._equals = {}
+        self._members = {}
+        self._predicates = []
+
+    def _with(self):
+        query = PublicationQuery.__new__(PublicationQuery)
+        query._records = self._records
+        query._indexes = self._indexes
+        query._date_range = self._date_range
+        query._equals = dict(self._equals)
+        query._members = dict(self._members)
+        query._predicates = list(self._predicates)
+        return query
+
+    # --- Conditions ---
+
+    def between(self, start_date, end_date):
+        """publication_date within [start_date, end_date] ('YYYY-MM-DD'); ignored unless both are given."""
+        if not (start_date and end_date):
+            return self
+        query = self._with()
+        if query._date_range:
+            start_date = max(start_date, query._date_range[0])
+            end_date = min(end_date, query._date_range[1])
+        query._date_range = (start_date, end_date)
+        return query
+
+    def where(self, **conditions):
+        """Field equality, e.g. where(department='Maliye'). None / '' values are ignored."""
+        query = self._with()
+        for field, value in conditions.items():
+            if value is None or value == '':
+                continue
+            if field in query._equals and query._equals[field] != value:
+                # Contradicting conditions: nothing can match
+                query._predicates.append(lambda record: False)
+            query._equals[field] = value
+        return query
+
+    def where_in(self, field, values):
+        """record[field] is one of values."""
+        query = self._with()
+        values = set(values)
+        query._members[field] = query._members[field] & values if field in query._members else values
+        return query
+
+    def filter(self, predicate):
+        """Arbitrary condition: predicate(record) -> bool."""
+        query = self._with()
+        query._predicates.append(predicate)
+        return query
+
+    # --- Evaluation ---
+
+    def _candidates(self):
+        """Records that may match: the smallest index bucket, or every record."""
+        indexes = self._indexes
+        if indexes is None:
+            return self._records
+
+        best = None
+        for field, value in self._equals.items():
+            positions = indexes.positions(field, value)
+            if positions is not None and (best is None or len(positions) < len(best)):
+                best = positions
+        for field, values in self._members.items():
+            if field in INDEXED_FIELDS:
+                positions = sorted(p for value in values for p in indexes.positions(field, value))
+                if best is None or len(positions) < len(best):
+                    best = positions
+        if self._date_range and (best is None or len(best) > len(self._records) // 4):
+            positions = indexes.date_positions(*self._date_range)
+            if best is None or len(positions) < len(best):
+                best = positions
+
+        if best is None:
+            return self._records
+        records = self._records
+        return (records[position] for position in best)
+
+    def _matches(self, record):
+        if self._date_range:
+            date = str(record.get('publication_date', '') or '')
+            if not (self._date_range[0] <= date <= self._date_range[1]):
+                return False
+        for field, value in self._equals.items():
+            if record.get(field) != value:
+                return False
+        for field, values in self._members.items():
+            if record.get(field) not in values:
+                return False
+        for predicate in self._predicates:
+            if not predicate(record):
+                return False
+        return True
+
+    def __iter__(self):
+        matches = self._matches
+        for record in self._candidates():
+            if matches(record):
+                yield record
+
+    def to_list(self):
+        return list(self)
+
+    def count(self):
+        return sum(1 for _ in self)
+
+    def exists(self):
+        """True if at least one record matches (stops at the first one)."""
+        return next(iter(self), None) is not None
+
+    def group_by(self, *fields, defaults=None):
+        """
+        Groups the matching records in one pass. With one field returns
+        {value: [records]}, with two {value1: {value2: [records]}}, and so on.
+        Groups appear in first-seen order; defaults maps a field to the key
+        used when the record has no (or an empty) value.
+        """
+        defaults = defaults or {}
+        groups = {}
+        for record in self:
+            level = groups
+            for depth, field in enumerate(fields):
+                key = record.get(field) or defaults.get(field)
+                if depth == len(fields) - 1:
+                    level.setdefault(key, []).append(record)
+                else:
+                    level = level.setdefault(key, {})
+        return groups
@@ -0,0 +1,284 @@
+"""
+Read-only JSON query service for other university systems (department web
+pages, accreditation office). Serves filtered publication and citation
+listings from an in-memory snapshot instead of hitting the storage backend
+(Google Sheets) on every request.
+
+Endpoints (GET only):
+    /publications   publication records
+    /citations      {'id', 'department', 'publication_type', 'publication_date', 'citation'}
+    /health         snapshot status
+Query parameters: start, end (YYYY-MM-DD), department, type, person
+(author surname, spelling variants merged), limit, offset.
+
+Responses carry ETag / Last-Modified and honour If-None-Match /
+If-Modified-Since, so well-behaved clients mostly get 304 Not Modified.
+
+Usage:
+    python query_api.py --port 8502 --ttl 300
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import apa_formatter
+import report_builder
+from author_resolution import AuthorResolver
+from publication_query import PublicationQuery, QueryIndexes
+from storage_backends import StorageError
+
+# Seconds a snapshot of the publications is served before it is reloaded
+DEFAULT_TTL = 300
+
+# Rendered responses kept per snapshot (least recently used are dropped)
+RESPONSE_CACHE_SIZE = 256
+
+FILTER_PARAMS = ('start', 'end', 'department', 'type', 'person', 'limit', 'offset')
+
+
+class QueryError(Exception):
+    """Invalid request; the message is returned to the client with status 400."""
+
+
+class Snapshot:
+    """One loaded copy of the publications, identified by a content hash."""
+
+    def __init__(self, records, loaded_at):
+        self.records = records
+        self.indexes = QueryIndexes(records)
+        self.loaded_at = loaded_at
+        self.version = hashlib.sha1(
+            json.dumps(records, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+        ).hexdigest()
+        # Last-Modified; kept across reloads that return the same content
+        self.modified_at = loaded_at
+        self.responses = OrderedDict()   # cache key -> (etag, body)
+        self.citations = {}              # publication id -> citation
+        self.lock = threading.Lock()     # guards responses and the lazy resolver
+        self._resolver = None
+
+    @property
+    def resolver(self):
+        with self.lock:
+            if self._resolver is None:
+                self._resolver = AuthorResolver()
+                self._resolver.add_publications(self.records)
+            return self._resolver
+
+    def citation(self, pub):
+        key = pub.get('id')
+        if key is None:
+            return apa_formatter.get_citation(pub)
+        if key not in self.citations:
+            self.citations[key] = apa_formatter.get_citation(pub)
+        return self.citations[key]
+
+
+class QueryService:
+    """
+    Request handling without any HTTP plumbing (see make_handler()).
+    loader() returns all publications and raises StorageError on failure;
+    it defaults to db_manager.load_publications.
+    """
+
+    def __init__(self, loader=None, ttl=DEFAULT_TTL, clock=time.time):
+        if loader is None:
+            import db_manager
+            loader = db_manager.load_publications
+        self.loader = loader
+        self.ttl = ttl
+        self.clock = clock
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """
+        Current snapshot, reloaded when older than ttl. One thread reloads
+        while the others wait; if the reload fails the previous snapshot is
+        kept, so a backend outage does not take the API down.
+        """
+        with self._lock:
+            now = self.clock()
+            current = self._snapshot
+            if current is not None and now - current.loaded_at < self.ttl:
+                return current
+            try:
+                records = self.loader()
+            except StorageError:
+                if current is None:
+                    raise
+                current.loaded_at = now
+                return current
+            fresh = Snapshot(records, now)
+            if current is not None and current.version == fresh.version:
+                # Unchanged data keeps its validators and rendered responses
+                current.loaded_at = now
+                return current
+            self._snapshot = fresh
+            return fresh
+
+    def handle(self, path, query, headers=None):
+        """
+        Returns (status, headers dict, body bytes) for a GET request.
+        query: the raw query string; headers: request headers (anything with .get()).
+        """
+        headers = headers or {}
+        route = path.rstrip('/') or '/'
+        if route not in ('/publications', '/citations', '/health'):
+            return self._json(404, {'error': f"Bilinmeyen adres: {path}"})
+
+        try:
+            snapshot = self.snapshot()
+        except StorageError as e:
+            return self._json(503, {'error': str(e)})
+
+        if route == '/health':
+            return self._json(200, {
+                'publications': len(snapshot.records),
+                'version': snapshot.version,
+                'loaded_at': formatdate(snapshot.loaded_at, usegmt=True),
+            })
+
+        params = dict(parse_qsl(query, keep_blank_values=False))
+        unknown = set(params) - set(FILTER_PARAMS)
+        if unknown:
+            return self._json(400, {'error': f"Bilinmeyen parametre: {', '.join(sorted(unknown))}"})
+
+        cache_key = (route, tuple(sorted(params.items())))
+        with snapshot.lock:
+            cached = snapshot.responses.get(cache_key)
+            if cached is not None:
+                snapshot.responses.move_to_end(cache_key)
+        if cached is None:
+            try:
+                payload = self._listing(route, params, snapshot)
+            except QueryError as e:
+                return self._json(400, {'error': str(e)})
+            body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+            cached = (f'"{hashlib.sha1(body).hexdigest()}"', body)
+            with snapshot.lock:
+                snapshot.responses[cache_key] = cached
+                if len(snapshot.responses) > RESPONSE_CACHE_SIZE:
+                    snapshot.responses.popitem(last=False)
+
+        etag, body = cached
+        response_headers = {
+            'ETag': etag,
+            'Last-Modified': formatdate(snapshot.modified_at, usegmt=True),
+            'Cache-Control': f"public, max-age={int(self.ttl)}",
+        }
+        if self._not_modified(headers, etag, snapshot.modified_at):
+            return 304, response_headers, b''
+        response_headers['Content-Type'] = 'application/json; charset=utf-8'
+        return 200, response_headers, body
+
+    def _listing(self, route, params, snapshot):
+        query = PublicationQuery(snapshot.records, snapshot.indexes)
+        start, end = params.get('start'), params.get('end')
+        if start or end:
+            query = query.between(start or "0000-01-01", end or "9999-12-31")
+        query = query.where(department=params.get('department'), publication_type=params.get('type'))
+        if params.get('person'):
+            records, _ = report_builder.group_by_person(snapshot.resolver, query, params['person'])
+        else:
+            records = query.to_list()
+
+        total = len(records)
+        offset = self._int_param(params, 'offset', 0)
+        limit = self._int_param(params, 'limit', None)
+        records = records[offset:offset + limit if limit is not None else None]
+
+        if route == '/citations':
+            items = [
+                {
+                    'id': pub.get('id'),
+                    'department': pub.get('department'),
+                    'publication_type': pub.get('publication_type'),
+                    'publication_date': pub.get('publication_date'),
+                    'citation': snapshot.citation(pub),
+                }
+                for pub in records
+            ]
+        else:
+            items = records
+        return {'total': total, 'offset': offset, 'items': items}
+
+    @staticmethod
+    def _int_param(params, name, default):
+        if name not in params:
+            return default
+        try:
+            value = int(params[name])
+        except ValueError:
+            raise QueryError(f"'{name}' bir tam sayı olmalı")
+        if value < 0:
+            raise QueryError(f"'{name}' negatif olamaz")
+        return value
+
+    @staticmethod
+    def _not_modified(headers, etag, modified_at):
+        if_none_match = headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        if_modified_since = headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return int(modified_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    @staticmethod
+    def _json(status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        return status, {'Content-Type': 'application/json; charset=utf-8', 'Cache-Control': 'no-store'}, body
+
+
+def make_handler(service):
+    class QueryHandler(BaseHTTPRequestHandler):
+        def _respond(self, send_body):
+            url = urlsplit(self.path)
+            status, headers, body = service.handle(url.path, url.query, self.headers)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            self._respond(send_body=True)
+
+        def do_HEAD(self):
+            self._respond(send_body=False)
+
+    return QueryHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Yayın listeleri için salt okunur JSON sorgu servisi.")
+    parser.add_argument("--host", default="127.0.0.1", help="dinlenecek adres (varsayılan: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8502, help="port (varsayılan: 8502)")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL,
+                        help=f"verinin yeniden yüklenme aralığı, saniye (varsayılan: {DEFAULT_TTL})")
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(QueryService(ttl=args.ttl)))
+    print(f"Sorgu servisi çalışıyor: http://{args.host}:{args.port}/publications")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Report building (grouping, citation formatting, document rendering) kept
+free of Streamlit so it can run in worker processes.
+
+A report is split into independent chunks (one per department, type or
+person, or fixed-size slices of a flat list). Each chunk renders to a list
+of blocks:
+    ('h1', text)                       department heading
+    ('h2', text)                       type / person heading
+    ('item', number, ptype, citation)  one citation; ptype is None when not shown
+Chunks can be rendered in a ProcessPoolExecutor and are merged in order.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import apa_formatter
+from citation_styles import DEFAULT_STYLE
+from publication_query import PublicationQuery
+
+REPORT_DETAILED = "Bölüm ve Tür Bazında Detaylı Rapor"
+REPORT_ALL = "Tüm Yayınlar"
+REPORT_BY_TYPE = "Yayın Türü Bazında"
+REPORT_BY_PERSON = "Kişi Bazında"
+
+DEPARTMENT_ORDER = [
+    "Siyaset Bilimi ve Kamu Yönetimi",
+    "İktisat",
+    "İşletme",
+    "Maliye",
+    "Ekonometri",
+    "Uluslararası İlişkiler",
+    "Belirtilmemiş"
+]
+
+TYPE_ORDER = ["Makale", "Kitap", "Kitap Bölümü", "Bildiri", "Proje", "Diğer"]
+
+# Flat lists are cut into slices of this size so they can be spread over workers
+FLAT_CHUNK_SIZE = 500
+
+# Below this many publications a process pool costs more than it saves
+PARALLEL_THRESHOLD = 2000
+
+
+def _ordered(groups, order):
+    """Keys of `groups` in the given order, unknown keys last (in first-seen order)."""
+    return [k for k in order if k in groups] + [k for k in groups if k not in order]
+
+
+# Group keys for records without a department / type
+GROUP_DEFAULTS = {'department': 'Belirtilmemiş', 'publication_type': 'Diğer'}
+
+
+def filter_publications(publications, department=None, publication_type=None):
+    """
+    Keeps the publications of one department and/or one publication type (None = all).
+    Accepts a list or a PublicationQuery; both conditions are checked in one pass.
+    """
+    if not isinstance(publications, PublicationQuery):
+        publications = PublicationQuery(publications)
+    return publications.where(department=department, publication_type=publication_type).to_list()
+
+
+def group_by_person(resolver, publications, surname_query):
+    """
+    Publications of the authors whose surname matches `surname_query`, with
+    spelling variants merged by the AuthorResolver (see db_manager.resolve_authors).
+    Returns (matching publications, [(display name, pubs)] most publications first).
+    """
+    person_ids = set(resolver.find(surname_query))
+    person_groups = {}
+    person_pubs = []
+    for p in publications:
+        matched = [aid for aid in resolver.publication_authors.get(p.get('id'), []) if aid in person_ids]
+        if matched:
+            person_pubs.append(p)
+        for aid in matched:
+            person_groups.setdefault(aid, []).append(p)
+    sections = [
+        (resolver.display_name(aid), pubs)
+        for aid, pubs in sorted(person_groups.items(), key=lambda item: -len(item[1]))
+    ]
+    return person_pubs, sections
+
+
+def split_report(publications, report_type, person_groups=None, style=DEFAULT_STYLE):
+    """
+    Splits a report into chunks, in output order. A chunk is
+        {'heading': str or None, 'groups': [(subheading or None, pubs, first_number, show_type)],
+         'style': citation style}
+    person_groups: [(display name, pubs)] for the person report.
+    style: a key of citation_styles.STYLES.
+    """
+    chunks = []
+
+    if report_type == REPORT_DETAILED:
+        dept_groups = PublicationQuery(publications).group_by('department', 'publication_type',
+                                                              defaults=GROUP_DEFAULTS)
+        for dept in _ordered(dept_groups, DEPARTMENT_ORDER):
+            type_groups = dept_groups[dept]
+            chunks.append({
+                'heading': f"{dept} ({sum(len(pubs) for pubs in type_groups.values())} yayın)",
+                'groups': [
+                    (f"{ptype} ({len(type_groups[ptype])})", type_groups[ptype], 1, False)
+                    for ptype in _ordered(type_groups, TYPE_ORDER)
+                ]
+            })
+
+    elif report_type == REPORT_ALL:
+        type_groups = PublicationQuery(publications).group_by('publication_type', defaults=GROUP_DEFAULTS)
+        for ptype in _ordered(type_groups, TYPE_ORDER):
+            chunks.append({
+                'heading': None,
+                'groups': [(f"{ptype} ({len(type_groups[ptype])})", type_groups[ptype], 1, False)]
+            })
+
+    elif report_type == REPORT_BY_PERSON and person_groups:
+        for name, pubs in person_groups:
+            chunks.append({
+                'heading': None,
+                'groups': [(f"{name} ({len(pubs)} yayın)", pubs, 1, True)]
+            })
+
+    else:
+        # Simple numbered list, cut into slices that keep the running numbers
+        for start in range(0, len(publications), FLAT_CHUNK_SIZE):
+            chunks.append({
+                'heading': None,
+                'groups': [(None, publications[start:start + FLAT_CHUNK_SIZE], start + 1, True)]
+            })
+
+    for chunk in chunks:
+        chunk['style'] = style
+    return chunks
+
+
+def render_chunk(chunk):
+    """Formats the citations of one chunk. Runs in a worker process for big reports."""
+    blocks = []
+    style = chunk.get('style', DEFAULT_STYLE)
+    if chunk['heading']:
+        blocks.append(('h1', chunk['heading']))
+    for subheading, pubs, first_number, show_type in chunk['groups']:
+        if subheading:
+            blocks.append(('h2', subheading))
+        for idx, pub in enumerate(pubs, first_number):
+            ptype = pub.get('publication_type', 'Makale') if show_type else None
+            blocks.append(('item', idx, ptype, apa_formatter.get_citation(pub, style)))
+    return blocks
+
+
+def blocks_to_markdown(blocks):
+    """Export text: '## ' / '### ' headings, '*...*' italics (see report_export)."""
+    text = ""
+    for block in blocks:
+        if block[0] == 'h1':
+            text += f"\n## {block[1]}\n\n"
+        elif block[0] == 'h2':
+            text += f"\n### {block[1]}\n\n"
+        else:
+            _, idx, ptype, citation = block
+            # Keep italics for export
+            if ptype:
+                text += f"{idx}. [{ptype}] {citation}\n\n"
+            else:
+                text += f"{idx}. {citation}\n\n"
+    return text
+
+
+def render_docx_part(text):
+    """Renders the export text of one chunk to a partial .docx (bytes). Runs in a worker process."""
+    import report_export
+    return report_export.build_docx(text, title=None).getvalue()
+
+
+def build_report(publications, report_type, person_groups=None, executor=None, on_progress=None,
+                 style=DEFAULT_STYLE):
+    """Splits and renders a report. Returns the blocks of each chunk, in order."""
+    chunks = split_report(publications, report_type, person_groups, style)
+    return run_chunks(render_chunk, chunks, executor, on_progress)
+
+
+def iter_report(publications, report_type, person_groups=None, executor=None, style=DEFAULT_STYLE):
+    """
+    Like build_report(), but yields the blocks of each chunk as soon as it
+    (and every chunk before it) is ready, so output can be streamed.
+    """
+    chunks = split_report(publications, report_type, person_groups, style)
+    if executor is None:
+        return map(render_chunk, chunks)
+    return iter_chunks(render_chunk, chunks, executor)
+
+
+def build_docx(chunk_blocks, executor=None, on_progress=None):
+    """
+    Word export of a rendered report. With an executor, every chunk becomes a
+    partial document in a worker process and the parts are merged at the end.
+    """
+    import report_export
+    texts = [blocks_to_markdown(blocks) for blocks in chunk_blocks]
+    if executor is None or len(texts) < 2:
+        return report_export.build_docx("".join(texts))
+    parts = run_chunks(render_docx_part, texts, executor, on_progress)
+    return report_export.merge_docx(parts)
+
+
+def should_parallelize(publications):
+    return len(publications) >= PARALLEL_THRESHOLD
+
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool():
+    """
+    Shared worker pool (report building, BibTeX parsing), created on first use. Workers are
+    spawned rather than forked: forking the multi-threaded Streamlit server
+    is not safe.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def discard_process_pool(executor):
+    """
+    Drops a pool that broke (a worker died, e.g. killed for memory): the
+    shared pool is replaced on the next get_process_pool() call instead of
+    failing every later report and import.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is executor:
+            _process_pool = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_chunks(func, chunks, executor=None, on_progress=None):
+    """
+    Applies `func` to every chunk, in a process pool when `executor` is given.
+    Results come back in chunk order. on_progress(done, total) is called from
+    the calling thread after each finished chunk.
+    """
+    total = len(chunks)
+    results = [None] * total
+    pending = set(range(total))
+
+    def finished(i, result):
+        results[i] = result
+        pending.discard(i)
+        if on_progress:
+            on_progress(total - len(pending), total)
+
+    if executor is not None:
+        try:
+            futures = {executor.submit(func, chunk): i for i, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                finished(futures[future], future.result())
+        except BrokenProcessPool:
+            # The pool cannot be used any more; the unfinished chunks run here
+            discard_process_pool(executor)
+    for i in sorted(pending):
+        finished(i, func(chunks[i]))
+    return results
+
+
+def iter_chunks(func, chunks, executor):
+    """
+    Like executor.map(func, chunks), but if the pool breaks the remaining
+    chunks run in the calling process.
+    """
+    try:
+        futures = [executor.submit(func, chunk) for chunk in chunks]
+    except BrokenProcessPool:
+        discard_process_pool(executor)
+        futures = None
+    for i, chunk in enumerate(chunks):
+        if futures is not None:
+            try:
+                yield futures[i].result()
+                continue
+            except BrokenProcessPool:
+                discard_process_pool(executor)
+                futures = None
+        yield func(chunk)
@@ -0,0 +1,227 @@
+"""
+Command-line report tool: produces the reports of the "Raporlama (Admin)"
+page without a browser, e.g. for scheduled end-of-term reports.
+
+Uses the same storage configuration as the app (api_url.txt,
+storage_backend.txt or .streamlit/secrets.toml in the working directory).
+
+Examples:
+    python report_cli.py --start 2025-01-01 --end 2025-12-31 -o rapor.docx
+    python report_cli.py --report type --type Makale --format csv > makaleler.csv
+    python report_cli.py --report person --person Yılmaz --department İktisat -o yilmaz.md
+    python report_cli.py --department Maliye -o maliye.bib
+    python report_cli.py --style apa7 -o rapor_apa7.docx
+
+Markdown and CSV are written chunk by chunk while the report is formatted,
+BibTeX entry by entry; DOCX and PDF are written once the document is complete.
+CSV lists the report's citations; xlsx is a table with one row per publication
+(all fields, authors and editors flattened; see tabular_export).
+"""
+import argparse
+import csv
+import io
+import os
+import re
+import sys
+from datetime import date
+
+import citation_styles
+import report_builder
+
+REPORT_TYPES = {
+    'detailed': report_builder.REPORT_DETAILED,
+    'all': report_builder.REPORT_ALL,
+    'type': report_builder.REPORT_BY_TYPE,
+    'person': report_builder.REPORT_BY_PERSON,
+}
+
+FORMATS = ['docx', 'pdf', 'md', 'csv', 'xlsx', 'bib']
+
+CSV_HEADER = ["Bölüm", "Grup", "Sıra", "Tür", "Atıf"]
+
+_ITALIC_RE = re.compile(r'\*([^*]+)\*')
+
+
+def _date_arg(value):
+    try:
+        return date.fromisoformat(value).strftime("%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"geçersiz tarih (YYYY-AA-GG bekleniyor): {value}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Akademik yayın raporlarını arayüz olmadan üretir (DOCX, PDF, Markdown, CSV, Excel, BibTeX)."
+    )
+    parser.add_argument("--report", choices=REPORT_TYPES, default="detailed",
+                        help="rapor türü: detailed (bölüm ve tür bazında), all, type, person (varsayılan: detailed)")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="çıktı biçimi (varsayılan: çıktı dosyasının uzantısı, yoksa md)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="çıktı dosyası; '-' standart çıktı (varsayılan)")
+    parser.add_argument("--start", type=_date_arg, help="başlangıç tarihi (YYYY-AA-GG)")
+    parser.add_argument("--end", type=_date_arg, help="bitiş tarihi (YYYY-AA-GG)")
+    parser.add_argument("--department", help="yalnızca bu bölümün yayınları")
+    parser.add_argument("--type", dest="publication_type",
+                        help="yalnızca bu türdeki yayınlar (--report type için zorunlu)")
+    parser.add_argument("--person", help="yazar soyadı (--report person için zorunlu)")
+    parser.add_argument("--style", choices=list(citation_styles.STYLES), default=citation_styles.DEFAULT_STYLE,
+                        help=f"atıf stili (varsayılan: {citation_styles.DEFAULT_STYLE})")
+    parser.add_argument("--workers", type=int,
+                        help="işçi süreç sayısı; 0 = tek süreç (varsayılan: büyük raporlarda tüm çekirdekler)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="ilerleme bilgisini gösterme")
+    return parser
+
+
+def resolve_format(args):
+    if args.format:
+        return args.format
+    ext = os.path.splitext(args.output)[1].lstrip('.').lower()
+    return ext if ext in FORMATS else 'md'
+
+
+def select_publications(args, publications):
+    """
+    Applies the filters of the admin page. Returns (publications, person sections or None).
+    """
+    publications = report_builder.filter_publications(publications, args.department, args.publication_type)
+    if args.report == 'person':
+        import db_manager
+        resolver = db_manager.resolve_authors(publications)
+        return report_builder.group_by_person(resolver, publications, args.person)
+    return publications, None
+
+
+def write_markdown(out, chunk_iter, title):
+    out.write(f"# {title}\n")
+    for blocks in chunk_iter:
+        out.write(report_builder.blocks_to_markdown(blocks))
+        out.flush()
+
+
+def write_csv(out, chunk_iter):
+    writer = csv.writer(out)
+    writer.writerow(CSV_HEADER)
+    heading = subheading = ""
+    for blocks in chunk_iter:
+        for block in blocks:
+            if block[0] == 'h1':
+                heading, subheading = block[1], ""
+            elif block[0] == 'h2':
+                subheading = block[1]
+            else:
+                _, idx, ptype, citation = block
+                writer.writerow([heading, subheading, idx, ptype or "", _ITALIC_RE.sub(r'\1', citation)])
+        out.flush()
+
+
+def open_output(path, binary):
+    if path == '-':
+        if binary:
+            return sys.stdout.buffer
+        sys.stdout.reconfigure(encoding='utf-8', newline='')
+        return sys.stdout
+    if binary:
+        return open(path, 'wb')
+    # utf-8-sig so that Excel shows Turkish characters in CSV files correctly
+    return open(path, 'w', encoding='utf-8-sig' if path.lower().endswith('.csv') else 'utf-8', newline='')
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.report == 'type' and not args.publication_type:
+        parser.error("--report type için --type gerekli")
+    if args.report == 'person' and not args.person:
+        parser.error("--report person için --person gerekli")
+    fmt = resolve_format(args)
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    import db_manager
+    from storage_backends import StorageError
+
+    # Backends only filter on a complete range; an open end means "no limit"
+    start, end = args.start, args.end
+    if start or end:
+        start, end = start or "0000-01-01", end or "9999-12-31"
+
+    try:
+        publications = db_manager.load_publications(start, end)
+    except StorageError as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+
+    publications, person_sections = select_publications(args, publications)
+    if not publications:
+        print("Seçilen kriterlere uygun yayın bulunamadı.", file=sys.stderr)
+        return 1
+    log(f"{len(publications)} yayın bulundu.")
+
+    report_type = REPORT_TYPES[args.report]
+    if args.workers is None:
+        executor = report_builder.get_process_pool() if report_builder.should_parallelize(publications) else None
+    elif args.workers > 0:
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+        executor = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = None
+
+    def on_progress(label):
+        return lambda done, total: log(f"{label} ({done}/{total})")
+
+    out = None
+    try:
+        out = open_output(args.output, binary=fmt in ('docx', 'pdf', 'xlsx'))
+        if fmt == 'md':
+            write_markdown(out, report_builder.iter_report(publications, report_type, person_sections, executor,
+                                                                args.style),
+                           title="Akademik Yayın Raporu")
+        elif fmt == 'csv':
+            write_csv(out, report_builder.iter_report(publications, report_type, person_sections, executor,
+                                                      args.style))
+        elif fmt == 'xlsx':
+            import tabular_export
+            if args.output == '-':
+                # The zip container needs a seekable file; stdout is not
+                buffer = io.BytesIO()
+                tabular_export.write_xlsx(publications, buffer, style=args.style)
+                out.write(buffer.getvalue())
+            else:
+                tabular_export.write_xlsx(publications, out, style=args.style)
+        elif fmt == 'bib':
+            import bibtex_export
+            bibtex_export.write_bibtex(publications, out)
+        else:
+            chunk_blocks = report_builder.build_report(publications, report_type, person_sections,
+                                                       executor=executor,
+                                                       on_progress=on_progress("Atıflar biçimlendiriliyor"),
+                                                       style=args.style)
+            if fmt == 'docx':
+                buffer = report_builder.build_docx(chunk_blocks, executor=executor,
+                                                   on_progress=on_progress("Word belgesi oluşturuluyor"))
+            else:
+                # Page layout is sequential, so the PDF is always built in this process
+                import report_export
+                report_text = "".join(report_builder.blocks_to_markdown(blocks) for blocks in chunk_blocks)
+                buffer = report_export.build_pdf(report_text)
+            out.write(buffer.getvalue())
+    except BrokenPipeError:
+        # Reader went away (e.g. `| head`); keep the interpreter from failing on the final flush
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if out is not None and args.output != '-':
+            out.close()
+        if executor is not None:
+            executor.shutdown()
+
+    if args.output != '-':
+        log(f"Rapor yazıldı: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import io
+import os
+import re
+from copy import deepcopy
+
+# python-docx and reportlab are imported inside the builders so that pages
+# which never export do not pay their import cost on every rerun.
+
+
+def build_docx(report_text, title='Akademik Yayın Raporu'):
+    """
+    Builds a Word document from the report text.
+    Lines starting with '##' / '###' become headings, *text* becomes italic.
+    Pass title=None for a partial document that will be merged later.
+    Returns a BytesIO positioned at the start.
+    """
+    # Create Word document
+    doc = new_docx(title)
+    append = paragraph_appender(doc)
+
+    # Add report content
+    for line in report_text.split('\n'):
+        if line.strip():
+            if line.startswith('##'):
+                append(line.replace('##', '').strip(), style='Heading 1')
+            elif line.startswith('###'):
+                append(line.replace('###', '').strip(), style='Heading 2')
+            else:
+                add_formatted_paragraph(append(style='Normal'), line.strip())
+
+    # Save to bytes
+    docx_buffer = io.BytesIO()
+    doc.save(docx_buffer)
+    docx_buffer.seek(0)
+    return docx_buffer
+
+
+def new_docx(title='Akademik Yayın Raporu'):
+    from docx import Document
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+    doc = Document()
+
+    # Add title
+    if title:
+        title_para = doc.add_heading(title, 0)
+        title_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    return doc
+
+
+def merge_docx(parts, title='Akademik Yayın Raporu'):
+    """
+    Concatenates partial documents (bytes from build_docx(..., title=None),
+    e.g. rendered in worker processes) into one document.
+    All parts use the default template, so their styles match the target's.
+    Returns a BytesIO positioned at the start.
+    """
+    from docx import Document
+
+    doc = new_docx(title)
+    body = doc.element.body
+    # Body content has to stay in front of the final section properties
+    sect_pr = body[-1] if body[-1].tag.endswith('}sectPr') else None
+
+    for part in parts:
+        part_body = Document(io.BytesIO(part)).element.body
+        for element in part_body:
+            if element.tag.endswith('}sectPr'):
+                continue
+            if sect_pr is not None:
+                sect_pr.addprevious(deepcopy(element))
+            else:
+                body.append(deepcopy(element))
+
+    docx_buffer = io.BytesIO()
+    doc.save(docx_buffer)
+    docx_buffer.seek(0)
+    return docx_buffer
+
+
+def paragraph_appender(doc):
+    """
+    Returns append(text='', style=None) -> Paragraph, which adds a paragraph
+    at the end of the document body.
+    doc.add_paragraph(style=...) scans the body for the section properties
+    and the style table for the style on every call, which dominates the
+    cost of long reports. Both are looked up once here instead.
+    """
+    from docx.oxml import OxmlElement
+    from docx.text.paragraph import Paragraph
+
+    body = doc.element.body
+    sect_pr = body[-1] if len(body) and body[-1].tag.endswith('}sectPr') else None
+    style_ids = {}
+
+    def append(text='', style=None):
+        p = OxmlElement('w:p')
+        if sect_pr is not None:
+            sect_pr.addprevious(p)
+        else:
+            body.append(p)
+        para = Paragraph(p, doc._body)
+        if style:
+            if style not in style_ids:
+                style_ids[style] = doc.styles[style].style_id
+            p.style = style_ids[style]
+        if text:
+            para.add_run(text)
+        return para
+
+    return append
+
+
+def add_formatted_paragraph(para, text):
+    """Fill paragraph with markdown italics converted to actual italics"""
+    # Split by italic markers
+    parts = re.split(r'(\*[^*]+\*)', text)
+
+    for part in parts:
+        if part.startswith('*') and part.endswith('*'):
+            # This is italic text
+            run = para.add_run(part[1:-1])
+            run.italic = True
+        elif part:
+            # Normal text
+            para.add_run(part)
+
+    return para
+
+
+def markdown_to_html(text):
+    """Convert markdown italics to HTML italics and escape XML chars"""
+    # Escape XML special characters
+    text = text.replace('&', '&amp;')
+    text = text.replace('<', '&lt;')
+    text = text.replace('>', '&gt;')
+    # Replace *text* with <i>text</i>
+    text = re.sub(r'\*([^*]+)\*', r'<i>\1</i>', text)
+    return text
+
+
+def register_turkish_font():
+    """
+    Tries to register a Turkish-compatible font and returns its name.
+    Falls back to Helvetica.
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    # Try Windows fonts
+    windows_fonts = [
+        ('Arial', 'arial.ttf'),
+        ('Times', 'times.ttf'),
+        ('Calibri', 'calibri.ttf')
+    ]
+
+    for fname, ffile in windows_fonts:
+        try:
+            font_path = os.path.join('C:\\Windows\\Fonts', ffile)
+            if os.path.exists(font_path):
+                pdfmetrics.registerFont(TTFont(fname, font_path))
+                return fname
+        except Exception:
+            continue
+
+    return 'Helvetica'
+
+
+def build_pdf(report_text):
+    """
+    Builds a PDF document from the report text with Turkish font support.
+    Returns a BytesIO positioned at the start.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.enums import TA_CENTER
+
+    font_name = register_turkish_font()
+
+    # Create PDF
+    pdf_buffer = io.BytesIO()
+    doc_pdf = SimpleDocTemplate(pdf_buffer, pagesize=A4,
+                                leftMargin=2*cm, rightMargin=2*cm,
+                                topMargin=2*cm, bottomMargin=2*cm)
+    story = []
+    styles = getSampleStyleSheet()
+
+    # Custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        fontName=font_name,
+        textColor='#1f77b4',
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+
+    heading1_style = ParagraphStyle(
+        'CustomH1',
+        parent=styles['Heading1'],
+        fontSize=14,
+        fontName=font_name,
+        spaceAfter=12
+    )
+
+    heading2_style = ParagraphStyle(
+        'CustomH2',
+        parent=styles['Heading2'],
+        fontSize=12,
+        fontName=font_name,
+        spaceAfter=10
+    )
+
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        fontName=font_name,
+        spaceAfter=6,
+        leading=14
+    )
+
+    # Add title
+    story.append(Paragraph("Akademik Yayın Raporu", title_style))
+    story.append(Spacer(1, 0.5*cm))
+
+    # Add content
+    for line in report_text.split('\n'):
+        if line.strip():
+            try:
+                if line.startswith('##'):
+                    clean_line = line.replace('##', '').strip()
+                    story.append(Paragraph(clean_line, heading1_style))
+                elif line.startswith('###'):
+                    clean_line = line.replace('###', '').strip()
+                    story.append(Paragraph(clean_line, heading2_style))
+                else:
+                    # Convert markdown italics to HTML
+                    formatted_line = markdown_to_html(line.strip())
+                    story.append(Paragraph(formatted_line, normal_style))
+                story.append(Spacer(1, 0.2*cm))
+            except Exception:
+                # Skip problematic lines
+                pass
+
+    doc_pdf.build(story)
+    pdf_buffer.seek(0)
+    return pdf_buffer
@@ -0,0 +1,209 @@
+"""
+Opt-in profiling of Streamlit reruns. Every widget interaction reruns
+app.py; with profiling switched on (by an admin, on the report page) the
+named sections of each rerun are timed, optionally together with a full
+cProfile of the rerun, and the result is shown in the sidebar and offered
+as a download.
+
+    with rerun_profiler.section("Rapor gruplama"):
+        chunk_blocks = report_builder.build_report(...)
+
+section() costs next to nothing while profiling is off, so the calls stay
+in the code. Only the session that switched profiling on is profiled.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+ENABLED_KEY = "_profiling_enabled"     # session_state flags, set by configure()
+CPROFILE_KEY = "_profiling_cprofile"
+HISTORY_KEY = "_profiling_history"
+HISTORY_SIZE = 20                      # reruns kept for the sidebar and the download
+CPROFILE_TOP = 40                      # functions listed in the text report
+
+# One cProfile at a time: from Python 3.12 the profiler hook is process-wide,
+# and two sessions profiled together would mix their calls
+_cprofile_lock = threading.Lock()
+# The script thread's current profile, read by section()
+_active = threading.local()
+
+
+class RerunProfile:
+    """Section timings (and optionally cProfile stats) of one rerun."""
+
+    def __init__(self, label, use_cprofile=False):
+        self.label = label
+        self.started_at = datetime.now()
+        self.total = 0.0
+        self.sections = {}        # name -> [depth, seconds, calls], in first-seen order
+        self.note = None
+        self._depth = 0
+        self._started = time.perf_counter()
+        self._profiler = None
+        self.stats = None         # pstats data once the rerun is finished
+        if use_cprofile:
+            if _cprofile_lock.acquire(blocking=False):
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+            else:
+                self.note = "cProfile başka bir oturumda çalıştığı için atlandı."
+
+    def entry(self, name, depth):
+        # Created when the section starts, so nested sections are listed after their parent
+        return self.sections.setdefault(name, [depth, 0.0, 0])
+
+    def stop(self):
+        self.total = time.perf_counter() - self._started
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.create_stats()
+            self.stats = self._profiler.stats
+            self._profiler = None
+            _cprofile_lock.release()
+
+    def rows(self):
+        """[(name, depth, seconds, calls)], with the time outside any section last."""
+        rows = [(name, depth, seconds, calls) for name, (depth, seconds, calls) in self.sections.items()]
+        covered = sum(seconds for _, depth, seconds, _ in rows if depth == 0)
+        rows.append(("(bölüm dışı)", 0, max(0.0, self.total - covered), 1))
+        return rows
+
+    def summary(self):
+        """Plain data kept in the session history."""
+        return {
+            'label': self.label, 'started_at': self.started_at, 'total': self.total,
+            'sections': {name: seconds for name, depth, seconds, _ in self.rows() if depth == 0},
+        }
+
+    def stats_bytes(self):
+        """cProfile stats in the .prof format (pstats, snakeviz), or None."""
+        return marshal.dumps(self.stats) if self.stats is not None else None
+
+    def to_text(self, history=()):
+        lines = [f"Profil: {self.label} - {self.started_at:%Y-%m-%d %H:%M:%S}",
+                 f"Toplam: {self.total * 1000:.1f} ms", ""]
+        lines.append(f"{'Bölüm':<44}{'ms':>10}{'%':>7}{'çağrı':>7}")
+        for name, depth, seconds, calls in self.rows():
+            share = seconds / self.total * 100 if self.total else 0.0
+            lines.append(f"{'  ' * depth + name:<44}{seconds * 1000:>10.1f}{share:>7.1f}{calls:>7}")
+        if self.note:
+            lines += ["", self.note]
+        if history:
+            lines += ["", "Önceki çalıştırmalar:"]
+            for item in history:
+                lines.append(f"  {item['started_at']:%H:%M:%S}  {item['total'] * 1000:>9.1f} ms  {item['label']}")
+        if self.stats is not None:
+            out = io.StringIO()
+            stats = pstats.Stats(_StatsSource(self.stats), stream=out)
+            stats.sort_stats("cumulative").print_stats(CPROFILE_TOP)
+            lines += ["", "cProfile (kümülatif süreye göre):", out.getvalue()]
+        return "\n".join(lines)
+
+
+class _StatsSource:
+    """pstats.Stats reads any object with create_stats() and .stats."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+@contextmanager
+def section(name):
+    """Times the block as a named section of the current rerun, if it is profiled."""
+    profile = getattr(_active, "profile", None)
+    if profile is None:
+        yield
+        return
+    depth = profile._depth
+    entry = profile.entry(name, depth)
+    profile._depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile._depth = depth
+        entry[1] += time.perf_counter() - started
+        entry[2] += 1
+
+
+def configure(state, enabled, use_cprofile=False):
+    """Switches profiling of this session's reruns on or off (from the admin page)."""
+    state[ENABLED_KEY] = bool(enabled)
+    state[CPROFILE_KEY] = bool(enabled and use_cprofile)
+    if not enabled:
+        state.pop(HISTORY_KEY, None)
+
+
+def is_enabled(state):
+    # Admin only: logging out stops profiling
+    return bool(state.get("admin_unlocked") and state.get(ENABLED_KEY))
+
+
+def begin(state, label):
+    """Starts profiling this rerun if enabled for the session; returns the profile or None."""
+    _active.profile = None
+    if not is_enabled(state):
+        return None
+    profile = RerunProfile(label, use_cprofile=state.get(CPROFILE_KEY, False))
+    _active.profile = profile
+    return profile
+
+
+def finish(state, profile):
+    """Stops the profile and adds it to the session history. Safe to call with None."""
+    _active.profile = None
+    if profile is None:
+        return
+    profile.stop()
+    history = state.get(HISTORY_KEY, [])
+    state[HISTORY_KEY] = (history + [profile.summary()])[-HISTORY_SIZE:]
+
+
+def render_sidebar(state, profile):
+    """Section timings of this rerun, earlier reruns and the downloads, in the sidebar."""
+    if profile is None:
+        return
+    import streamlit as st
+
+    history = state.get(HISTORY_KEY, [])[:-1]
+    with st.sidebar.expander(f"⏱️ Profil: {profile.total * 1000:.0f} ms", expanded=True):
+        st.caption(f"{profile.label} - {profile.started_at:%H:%M:%S}")
+        st.dataframe(
+            [
+                {"Bölüm": "  " * depth + name, "ms": round(seconds * 1000, 1),
+                 "%": round(seconds / profile.total * 100, 1) if profile.total else 0.0, "Çağrı": calls}
+                for name, depth, seconds, calls in profile.rows()
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+        if profile.note:
+            st.caption(profile.note)
+        if history:
+            st.caption("Önceki çalıştırmalar (ms): " +
+                       ", ".join(f"{item['total'] * 1000:.0f}" for item in reversed(history[-10:])))
+
+        stamp = profile.started_at.strftime("%Y%m%d_%H%M%S")
+        st.download_button(
+            label="📄 Profili İndir (.txt)",
+            data=profile.to_text(history),
+            file_name=f"profil_{stamp}.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+        if profile.stats is not None:
+            st.download_button(
+                label="🧪 cProfile İndir (.prof)",
+                data=profile.stats_bytes(),
+                file_name=f"profil_{stamp}.prof",
+                mime="application/octet-stream",
+                use_container_width=True
+            )
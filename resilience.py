@@ -0,0 +1,185 @@
+"""
+Building blocks for calling a slow or flaky remote backend (the Apps Script
+Web App): latency tracking, hedged calls, jittered retry delays and a
+circuit breaker. Nothing here knows about HTTP; storage_backends decides
+which errors are worth retrying.
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class LatencyTracker:
+    """Rolling window of recent call durations (seconds)."""
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, p):
+        """p-th percentile (0-100) of the window, None while it is empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(p / 100 * len(samples))) - 1))
+        return samples[rank]
+
+
+def backoff_delays(attempts, base=0.5, cap=4.0, rng=random.random):
+    """
+    Waits before each retry of a call made `attempts` times in total:
+    exponential growth with full jitter, so clients that failed together do
+    not retry together.
+    """
+    return [rng() * min(cap, base * 2 ** n) for n in range(attempts - 1)]
+
+
+class HedgePool:
+    """
+    Thread pool for hedged calls that never queues: try_submit() returns
+    None instead of waiting when every worker is busy (e.g. with abandoned
+    slow requests, which cannot be cancelled).
+    """
+
+    def __init__(self, max_workers=8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedged-call")
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def try_submit(self, func):
+        if not self._slots.acquire(blocking=False):
+            return None
+        future = self._executor.submit(func)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+
+def hedged_call(func, hedge_after, pool):
+    """
+    Runs func() and, if it has not finished after `hedge_after` seconds,
+    runs it once more in parallel; the first successful result wins. Only
+    for idempotent calls. When both fail, the error of the first one is
+    raised.
+
+    hedge_after=None disables the second call and func() simply runs in the
+    calling thread, as it also does when the pool has no free worker; a
+    busy pool never delays a call.
+    """
+    if hedge_after is None:
+        return func()
+    first = pool.try_submit(func)
+    if first is None:
+        return func()
+
+    done, _ = wait([first], timeout=hedge_after)
+    if done:
+        return first.result()
+
+    # The slower request cannot be cancelled; it finishes in the background
+    second = pool.try_submit(func)
+    if second is None:
+        return first.result()
+    pending = {first, second}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+    return first.result()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend that keeps failing."""
+
+    def __init__(self, retry_in):
+        super().__init__(f"circuit open, retry in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Stops calling a backend after `failure_threshold` consecutive failures.
+    While open every call fails at once; after `reset_timeout` seconds one
+    trial call is let through (half-open) and its outcome closes the circuit
+    or opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self):
+        """Raises CircuitOpenError unless a call may be made now."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            retry_in = max(0.0, self._opened_at + self.reset_timeout - self._clock())
+        raise CircuitOpenError(retry_in)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+    def call(self, func):
+        """func() guarded by the breaker; any exception counts as a failure."""
+        self.before_call()
+        try:
+            result = func()
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+_hedge_pool = None
+_hedge_pool_lock = threading.Lock()
+
+def get_hedge_pool():
+    """Shared HedgePool for hedged calls, created on first use."""
+    global _hedge_pool
+    with _hedge_pool_lock:
+        if _hedge_pool is None:
+            _hedge_pool = HedgePool(max_workers=8)
+        return _hedge_pool
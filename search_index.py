@@ -0,0 +1,138 @@
+import math
+import re
+from bisect import bisect_left
+
+from turkish_text import search_key
+
+# Fields covered by full-text search, with their BM25 weights
+SEARCH_FIELDS = {
+    'title': 3.0,
+    'authors': 2.0,
+    'journal_name': 1.0,
+    'book_title': 1.0,
+    'publisher': 1.0,
+}
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Tokens of turkish_text.search_key(text), so "politikasi" finds "politikası"."""
+    return _TOKEN_RE.findall(search_key(text))
+
+
+def authors_text(authors):
+    """Flattens the authors list into 'Surname Name Surname Name ...'."""
+    if not isinstance(authors, list):
+        return ""
+    parts = []
+    for auth in authors:
+        if isinstance(auth, dict):
+            parts.append(f"{auth.get('surname', '')} {auth.get('name', '')}")
+    return " ".join(parts)
+
+
+def document_fields(pub):
+    """Returns {field: normalized text} for the searchable fields of a publication."""
+    fields = {}
+    for field in SEARCH_FIELDS:
+        if field == 'authors':
+            value = authors_text(pub.get('authors', []))
+        else:
+            value = pub.get(field, '')
+        fields[field] = search_key(value)
+    return fields
+
+
+def parse_query(query):
+    """
+    Splits a query into normalized terms. Every term is matched as a prefix,
+    since Turkish suffixes ("politika" -> "politikası", "politikaları")
+    would otherwise make exact-token matches miss most hits.
+    """
+    return tokenize(query)
+
+
+class InvertedIndex:
+    """
+    In-process inverted index with BM25 ranking.
+    Used when SQLite FTS5 is not available (e.g. the Apps Script backend).
+    All query terms must match (AND); each term may match in any field
+    and is matched as a prefix (see parse_query).
+    """
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        # term -> {doc_id: {field: term frequency}}
+        self.postings = {}
+        self.doc_lengths = {}   # doc_id -> {field: token count}
+        self.docs = {}          # doc_id -> original record
+        self.field_totals = dict.fromkeys(SEARCH_FIELDS, 0)
+        self._vocabulary = None
+
+    @classmethod
+    def from_records(cls, records):
+        index = cls()
+        for pub in records:
+            index.add(pub.get('id'), pub)
+        return index
+
+    def add(self, doc_id, pub):
+        self.docs[doc_id] = pub
+        lengths = {}
+        for field, text in document_fields(pub).items():
+            tokens = _TOKEN_RE.findall(text)
+            lengths[field] = len(tokens)
+            self.field_totals[field] += len(tokens)
+            for token in tokens:
+                per_doc = self.postings.setdefault(token, {})
+                per_field = per_doc.setdefault(doc_id, {})
+                per_field[field] = per_field.get(field, 0) + 1
+        self.doc_lengths[doc_id] = lengths
+        self._vocabulary = None
+
+    def _expand(self, term):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocab = self._vocabulary
+        matches = []
+        i = bisect_left(vocab, term)
+        while i < len(vocab) and vocab[i].startswith(term):
+            matches.append(vocab[i])
+            i += 1
+        return matches
+
+    def search(self, query, limit=50):
+        """Returns matching records, best first."""
+        terms = parse_query(query)
+        if not terms or not self.docs:
+            return []
+
+        n_docs = len(self.docs)
+        avg_len = {field: (total / n_docs) or 1.0 for field, total in self.field_totals.items()}
+
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for token in self._expand(term):
+                per_doc = self.postings[token]
+                idf = math.log(1 + (n_docs - len(per_doc) + 0.5) / (len(per_doc) + 0.5))
+                for doc_id, per_field in per_doc.items():
+                    score = 0.0
+                    for field, tf in per_field.items():
+                        length = self.doc_lengths[doc_id].get(field, 0)
+                        norm = tf * (self.K1 + 1) / (
+                            tf + self.K1 * (1 - self.B + self.B * length / avg_len[field]))
+                        score += SEARCH_FIELDS[field] * idf * norm
+                    term_scores[doc_id] = term_scores.get(doc_id, 0.0) + score
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [self.docs[doc_id] for doc_id, _ in ranked]
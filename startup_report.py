@@ -0,0 +1,130 @@
+"""
+Import-time report for the Streamlit pages.
+
+Measures, in a fresh interpreter per module, what each page adds on top of
+the router's imports at startup and what it defers until first use
+(lazy imports).
+
+Usage: python startup_report.py
+"""
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ROUTER = "app.py (router)"
+PAGE_FILES = {
+    ROUTER: "app.py",
+    "Veri Girişi": os.path.join("app_pages", "veri_girisi.py"),
+    "Raporlama (Admin)": os.path.join("app_pages", "raporlama.py"),
+}
+
+# Deferred inside helper modules rather than in the page itself (report_export)
+INDIRECT_LAZY_IMPORTS = {
+    "Raporlama (Admin)": ["docx", "reportlab.platypus"],
+}
+
+
+def script_imports(path):
+    """
+    (top-level, lazy) third-party and project modules imported by a script:
+    top-level imports run on every cold start, the ones inside functions or
+    blocks only when that code runs. Standard library modules are skipped.
+    """
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    top_level = {id(node) for node in tree.body}
+    eager, lazy = [], []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        target = eager if id(node) in top_level else lazy
+        for name in names:
+            if name.split(".")[0] not in sys.stdlib_module_names and name not in target:
+                target.append(name)
+    return eager, lazy
+
+
+def page_imports():
+    """
+    PAGE_IMPORTS and LAZY_IMPORTS as {page: [module, ...]}, read from the
+    scripts so they cannot drift. Pages list only what the router does
+    not import already.
+    """
+    eager, lazy = {}, {}
+    for page, path in PAGE_FILES.items():
+        eager[page], lazy[page] = script_imports(path)
+    router = set(eager[ROUTER])
+    for page in PAGE_FILES:
+        if page != ROUTER:
+            eager[page] = [m for m in eager[page] if m not in router]
+        lazy[page] = [m for m in lazy[page] + INDIRECT_LAZY_IMPORTS.get(page, [])
+                      if m not in eager[page] and m not in router]
+    return eager, lazy
+
+
+# Modules imported at the top of each page script (paid on every cold start),
+# and modules imported lazily, only when the feature is actually used
+PAGE_IMPORTS, LAZY_IMPORTS = page_imports()
+
+
+def measure_import(module, preloaded=()):
+    """
+    Returns the cumulative import time of `module` in microseconds,
+    measured with `python -X importtime` in a clean interpreter.
+    Modules in `preloaded` are imported first, so only the marginal
+    cost of `module` is counted.
+    Returns None if the module cannot be imported.
+    """
+    code = "".join(f"import {m}; " for m in preloaded) + f"import {module}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        return None
+
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    # The top-level module is the last line whose name has no leading spaces.
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].rstrip()
+        if name.strip() == module and not name.startswith("  "):
+            try:
+                cumulative = int(parts[1].strip())
+            except ValueError:
+                pass
+    return cumulative
+
+
+def format_ms(us):
+    if us is None:
+        return "yüklenemedi"
+    return f"{us / 1000:8.1f} ms"
+
+
+def main():
+    print("Sayfa başına import maliyeti (her modül ayrı, temiz bir yorumlayıcıda ölçülür)\n")
+    router_modules = PAGE_IMPORTS[ROUTER]
+    for page, modules in PAGE_IMPORTS.items():
+        preloaded = [] if page == ROUTER else router_modules
+        print(f"== {page}")
+        for module in modules:
+            print(f"   {module:<24} {format_ms(measure_import(module, preloaded))}")
+        for module in LAZY_IMPORTS.get(page, []):
+            print(f"   {module:<24} {format_ms(measure_import(module, router_modules))}  (lazy)")
+        print()
+
+
+if __name__ == "__main__":
+    main()
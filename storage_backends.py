@@ -0,0 +1,615 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, backoff_delays, get_hedge_pool, hedged_call
+from search_index import SEARCH_FIELDS, InvertedIndex, document_fields, parse_query
+from turkish_text import tr_lower
+
+# Column order shared by every backend (same as the Apps Script sheet header)
+COLUMNS = [
+    "id", "department", "publication_type", "authors_json", "publication_date", "title",
+    "journal_name", "volume", "issue", "pages", "publisher",
+    "location", "editors", "book_title", "project_status", "funding_agency",
+    "created_at", "citation", "citation_version"
+]
+
+# Narrow projection for callers that only count or group publications
+SUMMARY_FIELDS = ["id", "department", "publication_type", "publication_date"]
+
+
+def column_for(field):
+    """Record key -> storage column ('authors' is stored as 'authors_json')."""
+    return "authors_json" if field == "authors" else field
+
+
+def project(records, fields):
+    """Keeps only the given record keys (all keys when fields is None)."""
+    if fields is None:
+        return records
+    return [{key: record[key] for key in fields if key in record} for record in records]
+
+
+def publication_year(record):
+    """Year of publication_date as an int, None when it is missing or malformed."""
+    date = str(record.get('publication_date', '') or '')
+    return int(date[:4]) if date[:4].isdigit() else None
+
+
+def count_publications(records):
+    """
+    Grouped counts: [{'department', 'publication_type', 'year', 'count'}],
+    sorted by department, type and year (unknown years last).
+    """
+    counts = {}
+    for record in records:
+        key = (record.get('department') or "", record.get('publication_type') or "", publication_year(record))
+        counts[key] = counts.get(key, 0) + 1
+    return [
+        {'department': d, 'publication_type': t, 'year': y, 'count': n}
+        for (d, t, y), n in sorted(counts.items(), key=lambda item: (item[0][0], item[0][1], item[0][2] is None, item[0][2] or 0))
+    ]
+
+
+class StorageError(Exception):
+    """Raised by a backend when a read or write fails. The message is user-facing."""
+
+
+class _TransientError(StorageError):
+    """A failure worth retrying: no answer, a timeout, 429 or a 5xx."""
+
+
+class StorageBackend:
+    """
+    Interface every storage backend implements.
+    Records are plain dicts with the keys in COLUMNS, except that 'authors'
+    (a list of {'surname', 'name'} dicts) replaces 'authors_json'.
+    """
+    name = None
+
+    # Seconds an in-process search index is reused before it is rebuilt
+    SEARCH_INDEX_TTL = 300
+
+    def init(self):
+        """Prepares the store (schema, migrations). Safe to call on every rerun."""
+        pass
+
+    def add_publication(self, data):
+        """Stores one publication and returns its new id."""
+        raise NotImplementedError
+
+    def get_publications(self, start_date=None, end_date=None, fields=None):
+        """
+        Returns publications, optionally limited to a 'YYYY-MM-DD' date range.
+        fields: record keys to return (e.g. SUMMARY_FIELDS); None returns every key.
+        """
+        raise NotImplementedError
+
+    def update_citations(self, citations):
+        """
+        Overwrites stored citations: citations is [(publication id, citation, formatter version)].
+        Returns the number of rows updated.
+        """
+        raise NotImplementedError
+
+    def get_data_version(self):
+        """
+        Cheap change probe: a number that grows whenever publications are
+        added. None means the backend cannot tell, so callers must refetch.
+        """
+        return None
+
+    def get_publication_counts(self, start_date=None, end_date=None):
+        """
+        Publication counts by department x type x year (see count_publications).
+        The default implementation counts a summary projection in Python;
+        backends that can aggregate server-side override it.
+        """
+        return count_publications(self.get_publications(start_date, end_date, fields=SUMMARY_FIELDS))
+
+    def search(self, query, limit=50):
+        """
+        Full-text search over title, venue, publisher and author names.
+        Returns records best match first. The default implementation keeps an
+        in-process inverted index over get_publications(); backends with a
+        native full-text engine override it.
+        """
+        built_at, index = getattr(self, "_search_index", (0, None))
+        if index is None or time.time() - built_at > self.SEARCH_INDEX_TTL:
+            index = InvertedIndex.from_records(self.get_publications())
+            self._search_index = (time.time(), index)
+        return index.search(query, limit)
+
+
+def filter_by_date(records, start_date, end_date):
+    """Keeps records whose publication_date lies in [start_date, end_date]."""
+    if not (start_date and end_date):
+        return records
+    filtered = []
+    for item in records:
+        p_date = str(item.get('publication_date', ''))
+        if p_date >= start_date and p_date <= end_date:
+            filtered.append(item)
+    return filtered
+
+
+class AppsScriptBackend(StorageBackend):
+    """Google Sheet behind the Apps Script Web App (apps_script_kodu.js)."""
+    name = "apps_script"
+
+    REQUEST_TIMEOUT = (5, 30)  # seconds to connect / to wait for the answer
+    READ_ATTEMPTS = 3          # tries per idempotent request
+    READ_DEADLINE = 45         # seconds; no retry is started after this
+    HEDGE_PERCENTILE = 95      # a read slower than this gets a second, parallel request
+    HEDGE_MIN_SAMPLES = 10     # no hedging until this many latencies are known
+    HEDGE_MIN_DELAY = 0.5      # seconds
+
+    def __init__(self, url):
+        self.url = url
+        self._has_version = True   # cleared when the deployment predates mode=version
+        self.breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+        self._latency = {}         # request kind -> LatencyTracker
+        self._sleep = time.sleep
+
+    def add_publication(self, data):
+        # Clone data to avoid mutating original for display
+        payload = data.copy()
+
+        # Apps Script stores 'editors' as-is, so send it as a JSON string
+        # instead of letting it show up as [object Object] in the sheet.
+        # 'authors' is stringified by Apps Script itself.
+        if 'editors' in payload and isinstance(payload['editors'], list):
+            payload['editors'] = json.dumps(payload['editors'])
+
+        # Not retried: a request that timed out may still have added the row
+        result = self._call(lambda: self._request(requests.post, "add", json=payload), attempts=1)
+        if result.get("result") != "success":
+            raise StorageError(f"Kayıt Hatası: {result.get('error')}")
+        return result.get("id")
+
+    def update_citations(self, citations):
+        # Deployments without the update action would append the request as a new row
+        status = self._get({"mode": "version"})
+        if not (isinstance(status, dict) and status.get("citations")):
+            raise StorageError("Apps Script kodu güncel değil: atıf güncellemesi için "
+                               "apps_script_kodu.js dosyasını yeniden dağıtın.")
+
+        payload = {
+            "action": "update_citations",
+            "citations": [
+                {"id": pub_id, "citation": citation, "citation_version": version}
+                for pub_id, citation, version in citations
+            ],
+        }
+        # Rewriting the same citations twice is harmless, so failures are retried
+        result = self._call(lambda: self._request(requests.post, "update_citations", json=payload),
+                            attempts=self.READ_ATTEMPTS)
+        if result.get("result") != "success":
+            raise StorageError(f"Kayıt Hatası: {result.get('error')}")
+        return result.get("updated", 0)
+
+    def get_publications(self, start_date=None, end_date=None, fields=None):
+        params = {}
+        if start_date and end_date:
+            # The script reads only the yearly sheets overlapping the range
+            params.update(start=start_date, end=end_date)
+        if fields is not None:
+            # The date filter below needs publication_date even when it is not requested
+            requested = list(fields)
+            if start_date and end_date and "publication_date" not in requested:
+                requested.append("publication_date")
+            params["fields"] = ",".join(requested)
+
+        all_data = self._get(params)
+        if not isinstance(all_data, list):
+            return []
+
+        # Deployments older than the 'fields' and range parameters return every row and column
+        return project(filter_by_date(all_data, start_date, end_date), fields)
+
+    def get_data_version(self):
+        if not self._has_version:
+            return None
+        result = self._get({"mode": "version"})
+        if isinstance(result, dict) and "version" in result:
+            return int(result["version"])
+        if isinstance(result, list):
+            # Older deployments ignore the mode and send the whole sheet; stop asking
+            self._has_version = False
+            return None
+        # Anything else is a failed probe, not proof of an old deployment
+        raise StorageError("Veri Okuma Hatası: beklenmeyen sürüm yanıtı")
+
+    def get_publication_counts(self, start_date=None, end_date=None):
+        params = {"mode": "counts"}
+        if start_date and end_date:
+            params.update(start=start_date, end=end_date)
+
+        rows = self._get(params)
+        if not isinstance(rows, list):
+            return []
+        if rows and "count" not in rows[0]:
+            # Deployment without the counts mode answered with every record
+            return count_publications(filter_by_date(rows, start_date, end_date))
+        return rows
+
+    def _get(self, params):
+        kind = params.get("mode") or ("fields" if "fields" in params else "all")
+        data = self._call(lambda: self._request(requests.get, kind, params=params),
+                          attempts=self.READ_ATTEMPTS, hedge_kind=kind)
+        if isinstance(data, dict) and data.get("result") == "error":
+            raise StorageError(f"Veri Okuma Hatası: {data.get('error')}")
+        return data
+
+    def _request(self, send, kind, **kwargs):
+        """One HTTP request; returns the decoded JSON answer."""
+        started = time.monotonic()
+        try:
+            response = send(self.url, timeout=self.REQUEST_TIMEOUT, **kwargs)
+        except Exception as e:
+            raise _TransientError(f"Bağlantı Hatası: {str(e)}")
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise _TransientError(f"Sunucu Hatası: {response.status_code}")
+        if response.status_code != 200:
+            raise StorageError(f"Sunucu Hatası: {response.status_code}")
+
+        try:
+            data = response.json()
+        except ValueError:
+            # Quota and timeout pages from Google come back as HTML
+            raise _TransientError("Sunucu Hatası: geçersiz yanıt")
+        self._latency.setdefault(kind, LatencyTracker()).record(time.monotonic() - started)
+        return data
+
+    def _hedge_after(self, kind):
+        tracker = self._latency.get(kind)
+        if tracker is None or len(tracker) < self.HEDGE_MIN_SAMPLES:
+            return None
+        return max(self.HEDGE_MIN_DELAY, tracker.percentile(self.HEDGE_PERCENTILE))
+
+    def _call(self, request, attempts, hedge_kind=None):
+        """
+        request() through the circuit breaker. Transient failures are
+        retried up to `attempts` times with jittered backoff; reads
+        (hedge_kind set) also get a second request when the first is slower
+        than HEDGE_PERCENTILE of recent ones. While the breaker is open
+        calls fail at once, so pages fall back to cached data quickly.
+        """
+        deadline = time.monotonic() + self.READ_DEADLINE
+        delays = backoff_delays(attempts)
+        for attempt in range(attempts):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError as e:
+                raise StorageError(f"Sunucuya şu anda ulaşılamıyor, {e.retry_in:.0f} sn sonra "
+                                   f"yeniden denenecek.")
+            try:
+                if hedge_kind is None:
+                    result = request()
+                else:
+                    result = hedged_call(request, self._hedge_after(hedge_kind), get_hedge_pool())
+            except _TransientError:
+                self.breaker.record_failure()
+                if attempt == attempts - 1 or time.monotonic() + delays[attempt] > deadline:
+                    raise
+                self._sleep(delays[attempt])
+                continue
+            except StorageError:
+                # The server answered, so it is up
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return result
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Local SQLite store built on the publications.db schema.
+    Runs in WAL mode so many Streamlit sessions can read while one writes.
+    Each thread gets its own connection.
+    """
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS publications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            publication_type TEXT,
+            authors_json TEXT NOT NULL,
+            publication_date DATE NOT NULL,
+            title TEXT NOT NULL,
+            journal_name TEXT,
+            volume TEXT,
+            issue TEXT,
+            pages TEXT,
+            publisher TEXT,
+            location TEXT,
+            editors TEXT,
+            book_title TEXT,
+            project_status TEXT,
+            funding_agency TEXT,
+            created_at DATE DEFAULT CURRENT_DATE,
+            department TEXT,
+            citation TEXT,
+            citation_version INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS publication_authors (
+            publication_id INTEGER NOT NULL REFERENCES publications(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            surname TEXT,
+            name TEXT,
+            surname_key TEXT,
+            PRIMARY KEY (publication_id, position)
+        );
+    """
+
+    INDEXES = """
+        CREATE INDEX IF NOT EXISTS idx_publications_date ON publications(publication_date);
+        CREATE INDEX IF NOT EXISTS idx_publications_department ON publications(department, publication_date);
+        CREATE INDEX IF NOT EXISTS idx_publications_type ON publications(publication_type, publication_date);
+        CREATE INDEX IF NOT EXISTS idx_publication_authors_surname ON publication_authors(surname_key);
+    """
+
+    # Columns hold text already normalized by turkish_text.search_key
+    # (Turkish casefold + ASCII fold), so the stock unicode61 tokenizer is enough.
+    FTS_SCHEMA = f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS publications_fts USING fts5(
+            {', '.join(SEARCH_FIELDS)}, tokenize='unicode61'
+        );
+    """
+
+    def __init__(self, path="publications.db"):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self.has_fts = False
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def init(self):
+        with self._init_lock:
+            if self._initialized:
+                return
+            conn = self._connect()
+            with conn:
+                had_authors_table = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='publication_authors'"
+                ).fetchone() is not None
+                conn.executescript(self.SCHEMA)
+
+                # Older publications.db files predate these columns
+                columns = [row["name"] for row in conn.execute("PRAGMA table_info(publications)")]
+                for column, column_type in (("department", "TEXT"), ("citation", "TEXT"),
+                                            ("citation_version", "INTEGER")):
+                    if column not in columns:
+                        conn.execute(f"ALTER TABLE publications ADD COLUMN {column} {column_type}")
+
+                conn.executescript(self.INDEXES)
+
+                if not had_authors_table:
+                    self._backfill_authors(conn)
+
+                self.has_fts = self._init_fts(conn)
+            self._initialized = True
+
+    def _init_fts(self, conn):
+        """Creates and backfills the FTS5 index. Returns False if FTS5 is not compiled in."""
+        had_fts_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name='publications_fts'"
+        ).fetchone() is not None
+        try:
+            conn.executescript(self.FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+
+        if not had_fts_table:
+            for row in conn.execute(f"SELECT {', '.join(COLUMNS)} FROM publications").fetchall():
+                self._index_fts(conn, row["id"], self._row_to_record(row))
+        return True
+
+    def _index_fts(self, conn, publication_id, pub):
+        fields = document_fields(pub)
+        conn.execute(
+            f"INSERT OR REPLACE INTO publications_fts (rowid, {', '.join(fields)}) "
+            f"VALUES (?, {', '.join('?' for _ in fields)})",
+            [publication_id, *fields.values()]
+        )
+
+    def _backfill_authors(self, conn):
+        rows = conn.execute("SELECT id, authors_json FROM publications").fetchall()
+        for row in rows:
+            try:
+                authors = json.loads(row["authors_json"] or "[]")
+            except ValueError:
+                authors = []
+            self._insert_authors(conn, row["id"], authors)
+
+    @staticmethod
+    def _surname_key(surname):
+        # Turkish-aware lowercase so "YILMAZ" and "Yılmaz" share a key
+        return tr_lower(str(surname or "").strip())
+
+    def _insert_authors(self, conn, publication_id, authors):
+        if not isinstance(authors, list):
+            return
+        conn.executemany(
+            "INSERT OR REPLACE INTO publication_authors "
+            "(publication_id, position, surname, name, surname_key) VALUES (?, ?, ?, ?, ?)",
+            [
+                (publication_id, pos, auth.get("surname", ""), auth.get("name", ""),
+                 self._surname_key(auth.get("surname", "")))
+                for pos, auth in enumerate(authors)
+                if isinstance(auth, dict)
+            ]
+        )
+
+    def add_publication(self, data):
+        self.init()
+        editors = data.get("editors", "")
+        if isinstance(editors, list):
+            editors = json.dumps(editors, ensure_ascii=False)
+        authors = data.get("authors") or []
+
+        row = {
+            "department": data.get("department", ""),
+            "publication_type": data.get("publication_type", ""),
+            "authors_json": json.dumps(authors, ensure_ascii=False),
+            "publication_date": data.get("publication_date", ""),
+            "title": data.get("title", ""),
+            "journal_name": data.get("journal_name", ""),
+            "volume": data.get("volume", ""),
+            "issue": data.get("issue", ""),
+            "pages": data.get("pages", ""),
+            "publisher": data.get("publisher", ""),
+            "location": data.get("location", ""),
+            "editors": editors or "",
+            "book_title": data.get("book_title", ""),
+            "project_status": data.get("project_status", ""),
+            "funding_agency": data.get("funding_agency", ""),
+            "created_at": datetime.now().strftime("%Y-%m-%d"),
+            "citation": data.get("citation", ""),
+            "citation_version": data.get("citation_version"),
+        }
+        columns = ", ".join(row)
+        placeholders = ", ".join("?" for _ in row)
+
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    f"INSERT INTO publications ({columns}) VALUES ({placeholders})",
+                    [("" if v is None and k != "citation_version" else v) for k, v in row.items()]
+                )
+                new_id = cursor.lastrowid
+                self._insert_authors(conn, new_id, authors)
+                if self.has_fts:
+                    self._index_fts(conn, new_id, {**data, "authors": authors})
+        except sqlite3.Error as e:
+            raise StorageError(f"Kayıt Hatası: {str(e)}")
+        return new_id
+
+    def update_citations(self, citations):
+        self.init()
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.executemany(
+                    "UPDATE publications SET citation = ?, citation_version = ? WHERE id = ?",
+                    [(citation, version, pub_id) for pub_id, citation, version in citations]
+                )
+        except sqlite3.Error as e:
+            raise StorageError(f"Kayıt Hatası: {str(e)}")
+        return cursor.rowcount
+
+    def _row_to_record(self, row):
+        record = {}
+        for key in row.keys():
+            value = row[key]
+            if key == "authors_json":
+                try:
+                    record["authors"] = json.loads(value) if value else []
+                except ValueError:
+                    record["authors"] = []
+            else:
+                record[key] = "" if value is None else value
+        return record
+
+    def get_publications(self, start_date=None, end_date=None, fields=None):
+        self.init()
+        columns = COLUMNS if fields is None else [column_for(f) for f in fields if column_for(f) in COLUMNS] or ["id"]
+        sql = f"SELECT {', '.join(columns)} FROM publications"
+        params = []
+        if start_date and end_date:
+            sql += " WHERE publication_date BETWEEN ? AND ?"
+            params = [start_date, end_date]
+        sql += " ORDER BY id"
+
+        try:
+            rows = self._connect().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            raise StorageError(f"Veri Okuma Hatası: {str(e)}")
+        return [self._row_to_record(row) for row in rows]
+
+    def get_data_version(self):
+        # AUTOINCREMENT keeps the highest id ever handed out in sqlite_sequence;
+        # publications are only ever inserted, so it works as a version number.
+        # Citation rewrites do not move it: a cached copy with the old citation
+        # still reads correctly, since stale citations are formatted on the fly.
+        self.init()
+        try:
+            row = self._connect().execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'publications'"
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise StorageError(f"Veri Okuma Hatası: {str(e)}")
+        return row[0] if row else 0
+
+    def get_publication_counts(self, start_date=None, end_date=None):
+        self.init()
+        sql = (
+            "SELECT COALESCE(department, '') AS department, COALESCE(publication_type, '') AS publication_type, "
+            "substr(publication_date, 1, 4) AS year, COUNT(*) AS count "
+            "FROM publications"
+        )
+        params = []
+        if start_date and end_date:
+            sql += " WHERE publication_date BETWEEN ? AND ?"
+            params = [start_date, end_date]
+        sql += " GROUP BY department, publication_type, year ORDER BY department, publication_type, year"
+
+        try:
+            rows = self._connect().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            raise StorageError(f"Veri Okuma Hatası: {str(e)}")
+        return [
+            {
+                'department': row['department'],
+                'publication_type': row['publication_type'],
+                'year': int(row['year']) if (row['year'] or "").isdigit() else None,
+                'count': row['count'],
+            }
+            for row in rows
+        ]
+
+    def search(self, query, limit=50):
+        self.init()
+        if not self.has_fts:
+            return super().search(query, limit)
+
+        terms = parse_query(query)
+        if not terms:
+            return []
+        # Every term as a quoted prefix query: "kamu"* AND "politikasi"*
+        match = " AND ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(w) for w in SEARCH_FIELDS.values())
+        sql = (
+            f"SELECT {', '.join('p.' + c for c in COLUMNS)} FROM publications_fts "
+            f"JOIN publications p ON p.id = publications_fts.rowid "
+            f"WHERE publications_fts MATCH ? "
+            f"ORDER BY bm25(publications_fts, {weights}) LIMIT ?"
+        )
+        try:
+            rows = self._connect().execute(sql, [match, limit]).fetchall()
+        except sqlite3.Error as e:
+            raise StorageError(f"Arama Hatası: {str(e)}")
+        return [self._row_to_record(row) for row in rows]
+
+
+BACKENDS = {
+    AppsScriptBackend.name: AppsScriptBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
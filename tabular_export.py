@@ -0,0 +1,130 @@
+"""
+Tabular export (CSV / Excel): one row per publication with authors and
+editors flattened, e.g. for the accreditation office.
+Rows are produced lazily and written in chunks, so memory stays flat for
+long date ranges.
+"""
+import csv
+import io
+
+import apa_formatter
+from citation_styles import DEFAULT_STYLE, STYLE_LABELS
+
+# (record key, column header); 'authors', 'editors', 'year' and 'citation' are derived.
+# The citation header gets the style appended, e.g. 'Atıf - APA 6' (see table_headers)
+TABLE_COLUMNS = [
+    ('id', 'ID'),
+    ('department', 'Bölüm'),
+    ('publication_type', 'Yayın Türü'),
+    ('authors', 'Yazarlar'),
+    ('author_count', 'Yazar Sayısı'),
+    ('publication_date', 'Yayın Tarihi'),
+    ('year', 'Yıl'),
+    ('title', 'Başlık'),
+    ('journal_name', 'Dergi'),
+    ('volume', 'Cilt'),
+    ('issue', 'Sayı'),
+    ('pages', 'Sayfalar'),
+    ('book_title', 'Kitap / Bildiri Kitabı'),
+    ('editors', 'Editörler'),
+    ('publisher', 'Yayınevi'),
+    ('location', 'Yer'),
+    ('project_status', 'Proje Durumu'),
+    ('funding_agency', 'Destekleyen Kurum'),
+    ('created_at', 'Kayıt Tarihi'),
+    ('citation', 'Atıf'),
+]
+
+# Rows per write
+CHUNK_SIZE = 500
+
+
+def flatten_people(people):
+    """[{'surname': 'Yılmaz', 'name': 'Ahmet'}, ...] -> 'Yılmaz, Ahmet; Demir, Ayşe'"""
+    if isinstance(people, str):
+        return people
+    if not isinstance(people, list):
+        return ""
+    names = []
+    for person in people:
+        if isinstance(person, dict):
+            name = ", ".join(p for p in (str(person.get('surname', '') or '').strip(),
+                                         str(person.get('name', '') or '').strip()) if p)
+            if name:
+                names.append(name)
+    return "; ".join(names)
+
+
+def table_headers(style=DEFAULT_STYLE):
+    """Column headers in TABLE_COLUMNS order, naming the citation style."""
+    return [f"{header} - {STYLE_LABELS[style]}" if key == 'citation' else header
+            for key, header in TABLE_COLUMNS]
+
+
+def publication_row(pub, style=DEFAULT_STYLE):
+    """One table row (values in TABLE_COLUMNS order), with the citation in `style`."""
+    row = []
+    for key, _ in TABLE_COLUMNS:
+        if key in ('authors', 'editors'):
+            value = flatten_people(pub.get(key, []))
+        elif key == 'author_count':
+            authors = pub.get('authors', [])
+            value = len(authors) if isinstance(authors, list) else 0
+        elif key == 'year':
+            date = str(pub.get('publication_date', '') or '')
+            value = int(date[:4]) if date[:4].isdigit() else ""
+        elif key == 'citation':
+            # Plain text: the *italic* markers only make sense in Markdown
+            value = apa_formatter.get_citation(pub, style).replace('*', '')
+        else:
+            value = pub.get(key, "")
+            value = "" if value is None else value
+        row.append(value)
+    return row
+
+
+def iter_rows(publications, style=DEFAULT_STYLE):
+    for pub in publications:
+        yield publication_row(pub, style)
+
+
+def iter_csv_chunks(publications, chunk_size=CHUNK_SIZE, style=DEFAULT_STYLE):
+    """Yields the CSV text in pieces of chunk_size rows (the header comes first)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(table_headers(style))
+    pending = 1
+    for row in iter_rows(publications, style):
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def write_csv(publications, out, chunk_size=CHUNK_SIZE, style=DEFAULT_STYLE):
+    """Writes the table to a text file object (open it with newline='')."""
+    for chunk in iter_csv_chunks(publications, chunk_size, style):
+        out.write(chunk)
+
+
+def write_xlsx(publications, out, sheet_title='Yayınlar', style=DEFAULT_STYLE):
+    """
+    Writes the table as an Excel workbook to a path or binary file object.
+    Uses openpyxl's write-only mode, which streams rows to disk instead of
+    keeping the whole sheet in memory.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_title)
+    sheet.append(table_headers(style))
+    for row in iter_rows(publications, style):
+        # Control characters (e.g. from pasted text) are not allowed in xlsx cells
+        sheet.append([ILLEGAL_CHARACTERS_RE.sub('', v) if isinstance(v, str) else v for v in row])
+    workbook.save(out)
@@ -0,0 +1,37 @@
+from author_resolution import AuthorResolver, blocking_key
+
+def test_author_resolution():
+    print("Testing Author Resolution...")
+
+    assert blocking_key("Yılmaz", "Ahmet") == blocking_key("YILMAZ", "A.") == "yilmaz|a"
+
+    pubs = [
+        {'id': 1, 'authors': [{'surname': 'Yılmaz', 'name': 'Ahmet'}, {'surname': 'Demir', 'name': 'Can'}]},
+        {'id': 2, 'authors': [{'surname': 'Yilmaz', 'name': 'A.'}]},
+        {'id': 3, 'authors': [{'surname': 'YILMAZ', 'name': 'Ahmet'}]},
+        {'id': 4, 'authors': [{'surname': 'Yılmaz', 'name': 'Ali'}]},
+    ]
+    resolver = AuthorResolver()
+    resolver.add_publications(pubs)
+
+    ahmet = resolver.publication_authors[1][0]
+    assert resolver.publication_authors[2] == [ahmet]
+    assert resolver.publication_authors[3] == [ahmet]
+    assert resolver.publication_authors[4] != [ahmet]
+    assert resolver.publications_of(ahmet) == {1, 2, 3}
+    assert resolver.display_name(ahmet) == "Yılmaz, Ahmet"
+    print("Variants merged: PASS")
+
+    # Surname lookup is Turkish/ASCII-insensitive
+    assert set(resolver.find("yılmaz")) == {ahmet, resolver.publication_authors[4][0]}
+    assert resolver.find("YIL") == resolver.find("Yil")
+
+    # Incremental: a re-added publication does not change anything, ids stay stable
+    resolver.add_publication(pubs[0])
+    resolver.add_publication({'id': 5, 'authors': [{'surname': 'Yilmaz', 'name': 'Ahmet'}]})
+    assert resolver.publication_authors[5] == [ahmet]
+    assert resolver.publications_of(ahmet) == {1, 2, 3, 5}
+    print("Incremental & Stable Ids: PASS")
+
+if __name__ == "__main__":
+    test_author_resolution()
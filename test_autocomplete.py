@@ -0,0 +1,79 @@
+import random
+import time
+from autocomplete import AutocompleteIndex, PrefixTrie
+from turkish_text import search_key
+
+def test_autocomplete():
+    print("Testing Autocomplete...")
+
+    trie = PrefixTrie()
+    for text, count in [("Amme İdaresi Dergisi", 5), ("Ankara Üniversitesi SBF Dergisi", 2),
+                        ("Ameliyat Notları", 1), ("İktisat Dergisi", 3)]:
+        trie.add(text, count)
+
+    # Ranked by frequency; case and Turkish characters do not matter
+    assert trie.complete("a") == ["Amme İdaresi Dergisi", "Ankara Üniversitesi SBF Dergisi", "Ameliyat Notları"]
+    assert trie.complete("AM") == trie.complete("âm") == ["Amme İdaresi Dergisi", "Ameliyat Notları"]
+    assert trie.complete("iktisat") == trie.complete("İKTİSAT") == ["İktisat Dergisi"]
+    assert trie.complete("amx") == [] and trie.complete("a", limit=1) == ["Amme İdaresi Dergisi"]
+    # Prefixes longer than the trie depth are still matched exactly
+    assert trie.complete("ankara universitesi s") == ["Ankara Üniversitesi SBF Dergisi"]
+    assert trie.complete("universitesi sbf dergisi") == ["Ankara Üniversitesi SBF Dergisi"]
+    assert trie.complete("ankara universitesi x") == []
+    # Later words of an entry are found too
+    assert trie.complete("idare") == ["Amme İdaresi Dergisi"]
+    assert trie.complete("derg") == ["Amme İdaresi Dergisi", "İktisat Dergisi", "Ankara Üniversitesi SBF Dergisi"]
+    print("Prefix & Word Matches: PASS")
+
+    # Incremental updates re-rank; the most used spelling is shown
+    trie.add("ameliyat notları")
+    trie.add("  Ameliyat   Notları ")
+    assert trie.count("AMELIYAT NOTLARI") == 3
+    assert trie.complete("am") == ["Amme İdaresi Dergisi", "Ameliyat Notları"]
+    trie.add("ameliyat notları", 3)
+    assert trie.complete("am") == ["ameliyat notları", "Amme İdaresi Dergisi"]
+    print("Incremental Ranking: PASS")
+
+    # Per-node top lists stay exact against a brute-force ranking
+    rng = random.Random(7)
+    trie = PrefixTrie(top_k=5)
+    counts = {}
+    words = ["".join(rng.choice("abcçd") for _ in range(rng.randint(1, 6))) for _ in range(300)]
+    for _ in range(3000):
+        word = rng.choice(words)
+        trie.add(word)
+        # "aç" and "ac" are one entry
+        counts[search_key(word)] = counts.get(search_key(word), 0) + 1
+    for prefix in ["", "a", "ab", "c", "ç", "dd", "bca"]:
+        key = search_key(prefix)
+        expected = sorted((k for k in counts if k.startswith(key)), key=lambda k: (-counts[k], k))[:5]
+        assert [search_key(w) for w in trie.complete(prefix)] == expected, prefix
+    print("Top-K Matches Brute Force: PASS")
+
+    index = AutocompleteIndex()
+    pub = {
+        'id': 1, 'authors': [{'surname': 'Yılmaz', 'name': 'Ahmet'}], 'journal_name': 'Amme İdaresi Dergisi',
+        'editors': [{'surname': 'Yıldız', 'name': 'Ayşe'}], 'publisher': 'Seçkin', 'location': 'Ankara',
+    }
+    index.add(pub)
+    index.add(pub)   # already seen
+    index.add({'id': 2, 'authors': [{'surname': 'YILMAZ', 'name': 'Ali'}], 'editors': '[]'})
+    assert len(index) == 2
+    assert index.suggest('surname', 'yil') == ["Yılmaz", "Yıldız"]
+    assert index.suggest('name', 'a') == ["Ahmet", "Ali", "Ayşe"]
+    assert index.suggest('publisher', 'sec') == ["Seçkin"] and index.suggest('book_title', 'a') == []
+    print("Index From Records: PASS")
+
+    # Lookups stay in the microsecond range regardless of size
+    big = PrefixTrie()
+    for i in range(20000):
+        big.add(f"{rng.choice(['Dergi', 'Journal', 'Review'])} {i} {rng.random()}")
+    started = time.perf_counter()
+    for _ in range(2000):
+        big.complete("journ")
+    per_lookup = (time.perf_counter() - started) / 2000
+    assert per_lookup < 50e-6, per_lookup
+    print(f"Lookup Speed ({per_lookup * 1e6:.1f} µs): PASS")
+
+if __name__ == "__main__":
+    test_autocomplete()
@@ -0,0 +1,53 @@
+import io
+import bibtex_export
+import bibtex_helper
+
+def test_bibtex_export():
+    print("Testing BibTeX Export...")
+
+    pubs = [
+        {
+            'id': 1, 'publication_type': 'Makale', 'publication_date': '2024-05-15',
+            'authors': [{'surname': 'Yılmaz', 'name': 'Ahmet'}, {'surname': 'Demir', 'name': 'Ayşe'}],
+            'title': 'Kamu Politikası {ve} Islah', 'journal_name': 'Amme İdaresi Dergisi',
+            'volume': '57', 'issue': '2', 'pages': '1-20'
+        },
+        {
+            'id': 2, 'publication_type': 'Kitap Bölümü', 'publication_date': '2024-01-01',
+            'authors': [{'surname': 'Yılmaz', 'name': 'Ahmet'}],
+            'editors': [{'surname': 'Smith', 'name': 'Jane'}],
+            'title': 'Kamu Maliyesi', 'book_title': 'Büyük Kitap', 'publisher': 'Yayınevi', 'location': 'Ankara'
+        },
+        {
+            'id': 3, 'publication_type': 'Proje', 'publication_date': '2023-03-01',
+            'authors': [{'surname': 'Öz', 'name': 'Can'}],
+            'title': 'Bir Proje', 'funding_agency': 'TÜBİTAK', 'project_status': 'Devam Ediyor'
+        },
+    ]
+
+    assert bibtex_export.citation_key(pubs[0]) == 'yilmaz2024kamu'
+    assert bibtex_export.citation_key(pubs[2]) == 'oz2023proje'
+
+    out = io.StringIO()
+    assert bibtex_export.write_bibtex(pubs, out) == 3
+    text = out.getvalue()
+    assert '@article{yilmaz2024kamu,' in text
+    assert '@incollection{yilmaz2024kamua,' in text
+    assert 'note = {TÜBİTAK, Devam Ediyor}' in text
+    print("Entries & Keys: PASS")
+
+    # Reading the export back gives the original fields
+    entries, errors = bibtex_helper.parse_bibtex_file(text)
+    assert errors == []
+    assert entries[0]['publication_type'] == 'Makale'
+    assert entries[0]['authors'] == pubs[0]['authors']
+    assert entries[0]['title'] == 'Kamu Politikası ve Islah'
+    assert (entries[0]['journal_name'], entries[0]['issue'], entries[0]['pages']) == ('Amme İdaresi Dergisi', '2', '1-20')
+    assert entries[1]['publication_type'] == 'Kitap Bölümü'
+    assert entries[1]['editors'] == pubs[1]['editors']
+    assert (entries[1]['book_title'], entries[1]['location']) == ('Büyük Kitap', 'Ankara')
+    assert entries[1]['publication_date'].year == 2024
+    print("Round Trip: PASS")
+
+if __name__ == "__main__":
+    test_bibtex_export()
@@ -0,0 +1,81 @@
+from concurrent.futures import ProcessPoolExecutor
+import bibtex_helper
+
+BIB = """% exported by the library
+@string{jpa = "Amme İdaresi Dergisi"}
+
+@article{yilmaz2020,
+  author = {Yılmaz, Ahmet and Demir, Ayşe},
+  title = {Kamu {Politikası}},
+  journal = jpa,
+  year = {2020}
+}
+
+@comment{ignored}
+
+@incollection{kaya2021,
+  author = {Mehmet Kaya},
+  editor = {Smith, John},
+  title = {Bölüm},
+  booktitle = {Kitap},
+  address = {Ankara},
+  year = {2021},
+  note = {a line that starts with an at sign:
+@see the appendix}
+}
+
+@book{broken,
+  title = {unclosed,
+  year = {2019}
+}
+
+@inproceedings{bad2, title = no quotes here, year = {2019}}
+
+@book(last2022,
+  author = {Öz, Can},
+  title = {Son},
+  year = {2022}
+)
+"""
+
+def test_bibtex_parsing():
+    print("Testing BibTeX Parsing...")
+
+    entries, errors = bibtex_helper.parse_bibtex_file(BIB)
+    assert [e['title'] for e in entries] == ['Kamu Politikası', 'Bölüm', 'Son']
+    assert entries[0]['journal_name'] == 'Amme İdaresi Dergisi'
+    assert entries[0]['authors'] == [{'surname': 'Yılmaz', 'name': 'Ahmet'}, {'surname': 'Demir', 'name': 'Ayşe'}]
+    assert entries[1]['authors'] == [{'surname': 'Kaya', 'name': 'Mehmet'}]
+    assert entries[1]['publication_type'] == 'Kitap Bölümü' and entries[1]['location'] == 'Ankara'
+    assert [(number, key) for number, key, _ in errors] == [(3, 'broken'), (4, 'bad2')]
+    print("Entries & Errors: PASS")
+
+    # Two entries on one line form one block: the second is kept, the later ones still match
+    same_line = ("@article{a, title={A}, year={2020}} @article{b, title={B}, year={2020}}\n"
+                 "@article{c, title={C}, year={2020}}\n"
+                 "@article{d, title={D}, year={2020}}\n")
+    entries, errors = bibtex_helper.parse_bibtex_file(same_line)
+    assert [e['title'] for e in entries] == ['A', 'B', 'C', 'D'] and errors == []
+    entries, errors = bibtex_helper.parse_bibtex_file(same_line + "@book{e, title = no quotes, year={2019}}\n")
+    assert len(entries) == 4 and [(number, key) for number, key, _ in errors] == [(4, 'e')]
+    print("Entries Sharing A Line: PASS")
+
+    # Split into one-entry chunks and parsed by workers: same result, same order
+    big = BIB * 20
+    serial = bibtex_helper.parse_bibtex_file(big)
+    original = bibtex_helper.MIN_CHUNK_SIZE
+    bibtex_helper.MIN_CHUNK_SIZE = 1
+    try:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parallel = bibtex_helper.parse_bibtex_file(big, executor=executor)
+    finally:
+        bibtex_helper.MIN_CHUNK_SIZE = original
+    assert parallel == serial
+    assert len(serial[0]) == 60 and serial[1][-1][0] == 99
+    print("Parallel == Serial: PASS")
+
+    assert bibtex_helper.parse_bibtex(BIB)['title'] == 'Kamu Politikası'
+    assert bibtex_helper.parse_bibtex_entries("not a bib file") == []
+
+if __name__ == "__main__":
+    test_bibtex_parsing()
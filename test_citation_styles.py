@@ -0,0 +1,72 @@
+import apa_formatter
+import citation_styles
+
+BASE = {
+    'authors': [{'surname': 'Yılmaz', 'name': 'Ahmet'}, {'surname': 'Demir', 'name': 'Ayşe Nur'}],
+    'editors': [{'surname': 'Kaya', 'name': 'Ali'}],
+    'publication_date': '2024-03-01', 'title': 'Kamu Politikası',
+    'journal_name': 'Amme İdaresi Dergisi', 'volume': '57', 'issue': '2', 'pages': '1--20',
+    'publisher': 'Seçkin', 'location': 'Ankara', 'book_title': 'Yönetim Yazıları',
+}
+
+def test_citation_styles():
+    print("Testing Citation Styles...")
+
+    article = {**BASE, 'publication_type': 'Makale'}
+    chapter = {**BASE, 'publication_type': 'Kitap Bölümü'}
+    book = {**BASE, 'publication_type': 'Kitap'}
+
+    # APA 6 is the format the application has always produced
+    assert apa_formatter.format_apa_6(article) == \
+        "Yılmaz, A., Demir, A. N. (2024). Kamu Politikası. *Amme İdaresi Dergisi*, *57*(2): 1-20."
+    assert apa_formatter.format_apa_6(chapter) == (
+        "Yılmaz, A., Demir, A. N. (2024). Kamu Politikası. In A. Kaya (Ed.), *Yönetim Yazıları* (pp. 1-20). "
+        "Ankara: Seçkin."
+    )
+    # Missing values drop their optional groups and the separators in front of them
+    assert apa_formatter.format_apa_6({'publication_type': 'Makale', 'title': 'Başlık',
+                                       'volume': '3', 'pages': '5-9'}) == "Başlık. *3*: 5-9."
+    assert apa_formatter.format_apa_6({'publication_type': 'Kitap', 'title': 'Neden?',
+                                       'publisher': 'Seçkin'}) == "*Neden?*. Seçkin."
+    assert apa_formatter.format_apa_6({'publication_type': 'Tez'}) == citation_styles.UNKNOWN_FORMAT
+    print("APA 6: PASS")
+
+    assert citation_styles.format_citation(article, 'apa7') == \
+        "Yılmaz, A., & Demir, A. N. (2024). Kamu Politikası. *Amme İdaresi Dergisi*, *57*(2), 1-20."
+    assert citation_styles.format_citation(book, 'apa7') == "Yılmaz, A., & Demir, A. N. (2024). *Kamu Politikası*. Seçkin."
+    assert citation_styles.format_citation(article, 'chicago') == (
+        'Yılmaz, Ahmet, and Ayşe Nur Demir. 2024. "Kamu Politikası." *Amme İdaresi Dergisi* 57 (2): 1-20.'
+    )
+    assert citation_styles.format_citation(chapter, 'chicago') == (
+        'Yılmaz, Ahmet, and Ayşe Nur Demir. 2024. "Kamu Politikası." In *Yönetim Yazıları*, edited by Ali Kaya, 1-20. '
+        'Ankara: Seçkin.'
+    )
+    assert citation_styles.format_citation(article, 'mla') == (
+        'Yılmaz, Ahmet, and Ayşe Nur Demir. "Kamu Politikası." *Amme İdaresi Dergisi*, vol. 57, no. 2, 2024, pp. 1-20.'
+    )
+    three = {**book, 'authors': BASE['authors'] + [{'surname': 'Kaya', 'name': 'Ali'}]}
+    assert citation_styles.format_citation(three, 'mla') == "Yılmaz, Ahmet, et al. *Kamu Politikası*. Seçkin, 2024."
+    assert citation_styles.format_citation(three, 'apa7').startswith("Yılmaz, A., Demir, A. N., & Kaya, A. (2024).")
+    print("APA 7, Chicago, MLA: PASS")
+
+    # One compiled renderer per (style, type), reused
+    assert citation_styles.renderer('mla', 'Makale') is citation_styles.renderer('mla', 'Makale')
+    try:
+        citation_styles.format_citation(article, 'harvard')
+        assert False, "unknown style accepted"
+    except ValueError:
+        pass
+    try:
+        citation_styles._parse("<({year}).")
+        assert False, "unbalanced template accepted"
+    except ValueError:
+        pass
+
+    # Stored citations are APA 6; other styles are always formatted
+    stored = apa_formatter.with_citation(article)
+    assert apa_formatter.get_citation({**stored, 'citation': 'saklı'}) == 'saklı'
+    assert apa_formatter.get_citation({**stored, 'citation': 'saklı'}, 'apa7').startswith("Yılmaz, A., &")
+    print("Renderer Cache & Stored Citations: PASS")
+
+if __name__ == "__main__":
+    test_citation_styles()
@@ -0,0 +1,219 @@
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+import apa_formatter
+import db_manager
+from autocomplete import AutocompleteIndex
+from test_helpers import make_pubs
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_conditional_refresh():
+    print("Testing Conditional Refresh...")
+
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        with open("storage_backend.txt", "w") as f:
+            f.write("sqlite")
+        backend = db_manager.get_backend()
+        for pub in make_pubs(5):
+            pub.pop('id')
+            backend.add_publication(pub)
+
+        fetches = []
+        original = backend.get_publications
+        backend.get_publications = lambda *args, **kwargs: fetches.append(args) or original(*args, **kwargs)
+
+        assert len(db_manager.load_publications()) == 5
+        assert len(db_manager.load_publications('2024-01-01', '2024-12-31')) == 5
+        assert db_manager.load_publications(summary=True)[0] == {
+            'id': 1, 'department': 'İktisat', 'publication_type': 'Makale', 'publication_date': '2024-01-01'
+        }
+        assert len(fetches) == 1
+        print("Unchanged Version Served From Cache: PASS")
+
+        # A save elsewhere bumps the version. The snapshot is served until it
+        # is PUBLICATIONS_FRESH_FOR old, then once more while the background
+        # refresher downloads the new data
+        extra = make_pubs(1)[0]
+        extra.pop('id')
+        original.__self__.add_publication(extra)
+        assert len(db_manager.load_publications()) == 5
+        snapshot = db_manager._publications_cache[backend]
+        snapshot.checked_at -= db_manager.PUBLICATIONS_FRESH_FOR + 1
+        assert len(db_manager.load_publications()) == 5
+        assert wait_until(lambda: len(db_manager.load_publications()) == 6)
+        assert len(fetches) == 2
+        print("Changed Version Refetched In Background: PASS")
+
+        # Backend down: even a snapshot too old to serve unchecked is better than nothing
+        with mock.patch.object(backend, "get_data_version", side_effect=db_manager.StorageError("Sunucu Hatası: 503")):
+            db_manager._publications_cache[backend].checked_at -= db_manager.PUBLICATIONS_MAX_STALE + 1
+            assert len(db_manager.load_publications()) == 6
+            assert db_manager._publications_cache[backend].error == "Sunucu Hatası: 503"
+        print("Last Good Snapshot Served On Failure: PASS")
+
+        # Warm-up loads in the background, before anyone asks
+        db_manager._invalidate_publications(backend)
+        db_manager.warm_up()
+        assert wait_until(lambda: backend in db_manager._publications_cache)
+        assert len(fetches) == 3
+        assert len(db_manager.load_publications()) == 6 and len(fetches) == 3
+        print("Warm-Up: PASS")
+
+        # Counts fall back to the snapshot while the backend is failing
+        with mock.patch.object(backend, "get_publication_counts", side_effect=db_manager.StorageError("Sunucu Hatası: 502")):
+            counts = db_manager.get_publication_counts()
+        assert sum(row['count'] for row in counts) == 6
+        print("Counts From Snapshot On Failure: PASS")
+    finally:
+        os.chdir(cwd)
+
+def test_stored_citations():
+    print("Testing Stored Citations...")
+
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        with open("storage_backend.txt", "w") as f:
+            f.write("sqlite")
+        backend = db_manager.get_backend()
+        pubs = make_pubs(3)
+        for pub in pubs:
+            pub.pop('id')
+
+        # Saved through the app: the citation is stored with the record
+        with mock.patch.object(db_manager, "st"):
+            assert db_manager.add_publication(pubs[0])
+        stored = db_manager.load_publications()[0]
+        assert stored['citation'] == apa_formatter.format_apa_6(pubs[0])
+        assert str(stored['citation_version']) == str(apa_formatter.FORMATTER_VERSION)
+        with mock.patch.object(apa_formatter, "format_apa_6", side_effect=AssertionError("formatted again")):
+            assert apa_formatter.get_citation(stored) == stored['citation']
+        print("Citation Stored At Save: PASS")
+
+        # Rows saved without one, or by an older formatter, are rewritten in bulk
+        backend.add_publication(pubs[1])
+        backend.add_publication({**pubs[2], 'citation': 'eski', 'citation_version': 0})
+        progress = []
+        assert db_manager.regenerate_citations(on_progress=lambda done, total: progress.append((done, total))) == 2
+        assert progress == [(2, 2)]
+        for pub in db_manager.load_publications():
+            assert apa_formatter.has_current_citation(pub)
+            assert pub['citation'] == apa_formatter.format_apa_6(pub)
+        assert db_manager.regenerate_citations() == 0
+        print("Stale Citations Regenerated: PASS")
+    finally:
+        os.chdir(cwd)
+
+def test_request_coalescing():
+    print("Testing Request Coalescing...")
+
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        with open("storage_backend.txt", "w") as f:
+            f.write("sqlite")
+        backend = db_manager.get_backend()
+        for pub in make_pubs(5):
+            pub.pop('id')
+            backend.add_publication(pub)
+
+        calls = []
+        release = threading.Event()
+        original = backend.get_publications
+
+        def slow_fetch(*args, **kwargs):
+            calls.append(args)
+            release.wait(5)
+            return original(*args, **kwargs)
+
+        backend.get_publications = slow_fetch
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(db_manager.load_publications())) for _ in range(10)]
+        for t in threads:
+            t.start()
+        time.sleep(0.2)   # everyone is waiting on the one request in flight
+        release.set()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+        assert len(results) == 10 and all(len(r) == 5 for r in results)
+        print("Concurrent Fetches Share One Request: PASS")
+
+        # A failure reaches every waiter, and the next call tries again
+        flight = db_manager._SingleFlight()
+        release.clear()
+        errors = []
+
+        def failing():
+            calls.append('fail')
+            release.wait(5)
+            raise db_manager.StorageError("Sunucu Hatası: 500")
+
+        def call():
+            try:
+                flight.do('key', failing)
+            except db_manager.StorageError as e:
+                errors.append(str(e))
+
+        calls.clear()
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for t in threads:
+            t.start()
+        time.sleep(0.2)
+        release.set()
+        for t in threads:
+            t.join()
+        assert calls == ['fail'] and errors == ["Sunucu Hatası: 500"] * 5
+        assert flight.do('key', lambda: 42) == 42
+        print("Errors Shared, Not Kept: PASS")
+    finally:
+        os.chdir(cwd)
+
+def test_autocomplete_suggestions():
+    print("Testing Autocomplete Suggestions...")
+
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        with open("storage_backend.txt", "w") as f:
+            f.write("sqlite")
+        backend = db_manager.get_backend()
+        for pub in make_pubs(3):
+            pub.pop('id')
+            backend.add_publication(pub)
+
+        with mock.patch.object(db_manager, "_autocomplete_index", AutocompleteIndex()):
+            # Nothing cached yet: the form does not wait, a background load starts
+            assert db_manager.suggest('surname', 'yaz') == []
+            assert wait_until(lambda: db_manager.suggest('surname', 'yaz') == ['Yazar0', 'Yazar1', 'Yazar2'])
+            assert db_manager.suggest('surname', 'y') == []   # shorter than AUTOCOMPLETE_MIN_PREFIX
+            print("Suggestions From Stored Records: PASS")
+
+            # Saves through the app are suggested at once, ranked by use
+            for _ in range(2):
+                extra = make_pubs(1)[0]
+                extra.pop('id')
+                extra['journal_name'] = 'Dış Politika Dergisi'
+                assert db_manager.add_publication(extra)
+            assert db_manager.suggest('journal_name', 'DIS') == ['Dış Politika Dergisi']
+            assert db_manager.suggest('journal_name', 'derg') == ['Dergi', 'Dış Politika Dergisi']
+            print("Incremental Updates: PASS")
+    finally:
+        os.chdir(cwd)
+
+if __name__ == "__main__":
+    test_conditional_refresh()
+    test_stored_citations()
+    test_request_coalescing()
+    test_autocomplete_suggestions()
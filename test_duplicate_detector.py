@@ -0,0 +1,35 @@
+from duplicate_detector import DuplicateIndex, title_shingles, jaccard
+
+def test_duplicate_detector():
+    print("Testing Near-Duplicate Detection...")
+
+    stored = [
+        {'id': 1, 'title': 'Türkiye\'de Kamu Politikası Analizi', 'publication_date': '2024-03-01',
+         'authors': [{'surname': 'Yılmaz', 'name': 'Ahmet'}]},
+        {'id': 2, 'title': 'Para Politikası ve Enflasyon', 'publication_date': '2023-01-01',
+         'authors': [{'surname': 'Demir', 'name': 'Can'}]},
+    ]
+    index = DuplicateIndex()
+    for pub in stored:
+        index.add(pub)
+
+    # Same paper entered by a co-author: different case, diacritics, punctuation
+    same = {'title': 'TURKIYE\'DE KAMU POLITIKASI ANALIZI.', 'publication_date': '2024-06-01',
+            'authors': [{'surname': 'Kaya', 'name': 'Ali'}, {'surname': 'Yilmaz', 'name': 'A.'}]}
+    matches = index.find_duplicates(same)
+    assert [m[0]['id'] for m in matches] == [1]
+    print("Near-duplicate found: PASS")
+
+    # Similar title but no shared author / years far apart -> not a duplicate
+    other_author = dict(same, authors=[{'surname': 'Kaya', 'name': 'Ali'}])
+    assert index.find_duplicates(other_author) == []
+    other_year = dict(same, publication_date='2019-01-01')
+    assert index.find_duplicates(other_year) == []
+
+    # Different title
+    assert index.find_duplicates({'title': 'Maliye Teorisi', 'publication_date': '2024-01-01'}) == []
+    assert jaccard(title_shingles('Para Politikası'), title_shingles('PARA POLİTİKASI')) == 1.0
+    print("Distinct publications kept: PASS")
+
+if __name__ == "__main__":
+    test_duplicate_detector()
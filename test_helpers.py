@@ -0,0 +1,16 @@
+"""Shared fixtures for the test scripts."""
+
+
+def make_pubs(n):
+    """n simple records: departments and types round-robin, one author each, all dated 2024-01-01."""
+    depts = ["İktisat", "Maliye", "İşletme"]
+    types = ["Makale", "Kitap", "Bildiri"]
+    return [
+        {
+            'id': i, 'department': depts[i % 3], 'publication_type': types[(i // 3) % 3],
+            'authors': [{'surname': f'Yazar{i}', 'name': 'Ali'}], 'publication_date': '2024-01-01',
+            'title': f'Başlık {i}', 'journal_name': 'Dergi', 'publisher': 'Yayınevi', 'location': 'Ankara',
+            'book_title': 'Kongre'
+        }
+        for i in range(n)
+    ]
@@ -0,0 +1,46 @@
+import contextlib
+import io
+import json
+import load_test
+from load_test import LocalServer, run_load
+
+def test_load_test():
+    print("Testing Load Test Harness...")
+
+    with LocalServer(write_ms=20, read_ms=5) as server:
+        result = run_load(server.url, users=4, duration=0.5, think_time=0.01, seed=1)
+        summary = result.summary()
+        assert summary['requests'] > 0 and summary['error_rate'] == 0
+        assert set(summary['operations']) == {'submit', 'report', 'counts'}
+        submit = summary['operations']['submit']
+        latency = submit['latency_ms']
+        assert latency['p50'] <= latency['p95'] <= latency['p99'] <= latency['p100']
+        # Every request holds the lock for at least its service time
+        assert latency['p50'] >= 20
+        assert len(server.records) == submit['requests']
+    print("Throughput & Percentiles: PASS")
+
+    # As in the script, saves that cannot get the lock in time fail...
+    with LocalServer(write_ms=100, lock_timeout=0.05) as server:
+        summary = run_load(server.url, users=4, duration=0.5, mix={'submit': 1}, think_time=0).summary()
+        submit = summary['operations']['submit']
+        assert submit['errors'] > 0 and 0 < summary['error_rate'] < 1
+        assert load_test.LOCK_BUSY_ERROR in submit['error_messages']
+        assert len(server.records) == submit['requests'] - submit['errors']
+    # ...while reads go ahead without the lock and are counted, not failed
+    with LocalServer(read_ms=100, lock_timeout=0.05) as server:
+        summary = run_load(server.url, users=4, duration=0.5, mix={'report': 1}, think_time=0).summary()
+        assert summary['error_rate'] == 0 and server.unlocked_reads > 0
+    print("Lock Timeouts: PASS")
+
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        assert load_test.main(["--local", "--users", "2", "--duration", "0.3", "--mix", "report=1",
+                               "--server-read-ms", "5", "--think-time", "0", "-q", "--json"]) == 0
+    report = json.loads(out.getvalue())
+    assert report['users'] == 2 and list(report['operations']) == ['report']
+    assert report['unlocked_reads'] == 0
+    print("Command Line: PASS")
+
+if __name__ == "__main__":
+    test_load_test()
@@ -0,0 +1,72 @@
+from publication_query import PublicationQuery, QueryIndexes
+
+def make_records():
+    depts = ["İktisat", "Maliye", "İşletme", None]
+    types = ["Makale", "Kitap", "Bildiri"]
+    return [
+        {
+            'id': i, 'department': depts[i % 4], 'publication_type': types[i % 3],
+            'publication_date': f"{2020 + i % 5}-0{1 + i % 9}-15",
+        }
+        for i in range(200)
+    ]
+
+def test_publication_query():
+    print("Testing Publication Query...")
+    records = make_records()
+    indexes = QueryIndexes(records)
+
+    def ids(query):
+        return [r['id'] for r in query]
+
+    def expected(predicate):
+        return [r['id'] for r in records if predicate(r)]
+
+    for idx in (None, indexes):
+        base = PublicationQuery(records, idx)
+
+        # Conditions combine; results keep the original record order
+        query = base.between('2021-01-01', '2022-12-31').where(department='Maliye')
+        assert ids(query) == expected(lambda r: r['department'] == 'Maliye'
+                                      and '2021-01-01' <= r['publication_date'] <= '2022-12-31')
+        assert ids(query.where(publication_type='Kitap')) == expected(
+            lambda r: r['department'] == 'Maliye' and r['publication_type'] == 'Kitap'
+            and '2021-01-01' <= r['publication_date'] <= '2022-12-31')
+
+        # Date ranges narrow; one-sided ranges are ignored
+        assert ids(base.between('2020-01-01', '2022-12-31').between('2022-01-01', '2030-01-01')) == expected(
+            lambda r: r['publication_date'].startswith('2022'))
+        assert ids(base.between('2021-01-01', None)) == list(range(200))
+
+        # None / '' conditions are ignored, contradicting ones match nothing
+        assert ids(base.where(department=None, publication_type='')) == list(range(200))
+        assert not base.where(department='Maliye').where(department='İktisat').exists()
+
+        assert ids(base.where_in('publication_type', ['Kitap', 'Bildiri'])) == expected(
+            lambda r: r['publication_type'] != 'Makale')
+        assert ids(base.filter(lambda r: r['id'] < 5)) == [0, 1, 2, 3, 4]
+
+        assert base.where(department='Maliye').count() == 50
+        assert base.where(department='Ekonometri').exists() is False
+        assert base.where(department='Ekonometri').to_list() == []
+
+        # One-pass grouping, first-seen order, defaults for empty keys
+        groups = base.group_by('department', 'publication_type', defaults={'department': 'Belirtilmemiş'})
+        assert list(groups) == ["İktisat", "Maliye", "İşletme", "Belirtilmemiş"]
+        assert sum(len(pubs) for by_type in groups.values() for pubs in by_type.values()) == 200
+        assert [r['id'] for r in groups["Maliye"]["Kitap"]] == expected(
+            lambda r: r['department'] == 'Maliye' and r['publication_type'] == 'Kitap')
+    print("Query conditions (with and without indexes): PASS")
+
+    # The query starts from the smallest index bucket instead of every record
+    visited = []
+    query = PublicationQuery(records, indexes).where(department='Maliye').filter(lambda r: visited.append(r) or True)
+    assert len(query.to_list()) == 50 and len(visited) == 50
+
+    # Indexes built for another list are not used
+    copy = list(records)
+    assert PublicationQuery(copy, indexes)._indexes is None
+    print("Index use: PASS")
+
+if __name__ == "__main__":
+    test_publication_query()
@@ -0,0 +1,65 @@
+import json
+from email.utils import formatdate
+import query_api
+from storage_backends import StorageError
+from test_helpers import make_pubs
+
+def test_query_api():
+    print("Testing Query API...")
+
+    data = {'records': make_pubs(30), 'loads': 0, 'fail': False}
+    now = [1000.0]
+
+    def loader():
+        if data['fail']:
+            raise StorageError("Sunucu Hatası: 500")
+        data['loads'] += 1
+        return [dict(p) for p in data['records']]
+
+    service = query_api.QueryService(loader=loader, ttl=60, clock=lambda: now[0])
+
+    status, headers, body = service.handle('/citations', 'department=Maliye&type=Kitap&limit=2')
+    assert status == 200
+    payload = json.loads(body)
+    assert payload['total'] == 3 and len(payload['items']) == 2
+    assert payload['items'][0]['citation'].startswith('Yazar')
+    etag, last_modified = headers['ETag'], headers['Last-Modified']
+    print("Filtered Citations: PASS")
+
+    status, _, body = service.handle('/publications', 'person=yazar2&start=2024-01-01')
+    assert status == 200
+    assert sorted(p['id'] for p in json.loads(body)['items']) == [2] + list(range(20, 30))
+
+    assert service.handle('/publications', 'limit=x')[0] == 400
+    assert service.handle('/publications', 'sort=title')[0] == 400
+    assert service.handle('/nope', '')[0] == 404
+    print("Person & Validation: PASS")
+
+    # Same query again: served from the cache, conditional requests get 304
+    status, _, _ = service.handle('/citations', 'limit=2&type=Kitap&department=Maliye', {'If-None-Match': etag})
+    assert status == 304
+    assert service.handle('/citations', 'department=Maliye&type=Kitap&limit=2', {'If-Modified-Since': last_modified})[0] == 304
+    assert data['loads'] == 1
+    print("ETag & Last-Modified: PASS")
+
+    # After the TTL: unchanged data keeps its validators, changed data gets new ones
+    now[0] += 61
+    status, headers, _ = service.handle('/citations', 'department=Maliye&type=Kitap&limit=2')
+    assert data['loads'] == 2 and headers['ETag'] == etag and headers['Last-Modified'] == last_modified
+
+    data['records'][13]['title'] = 'Yeni Başlık'
+    now[0] += 61
+    status, headers, body = service.handle('/citations', 'department=Maliye&type=Kitap&limit=2')
+    assert headers['ETag'] != etag and headers['Last-Modified'] == formatdate(now[0], usegmt=True)
+    assert 'Yeni Başlık' in json.loads(body)['items'][1]['citation']
+    print("Reload: PASS")
+
+    # Backend outage: the last snapshot keeps being served
+    data['fail'] = True
+    now[0] += 61
+    assert service.handle('/citations', 'department=Maliye')[0] == 200
+    assert query_api.QueryService(loader=loader).handle('/publications', '')[0] == 503
+    print("Outage: PASS")
+
+if __name__ == "__main__":
+    test_query_api()
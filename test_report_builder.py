@@ -0,0 +1,84 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import report_builder
+from test_helpers import make_pubs
+
+def _dies_in_worker(chunk):
+    # Kills the worker process that gets chunk 2; runs normally in the main process
+    if chunk == 2 and multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return chunk * 10
+
+def test_report_builder():
+    print("Testing Report Builder...")
+    pubs = make_pubs(1200)
+
+    serial = report_builder.build_report(pubs, report_builder.REPORT_DETAILED)
+    assert [blocks[0] for blocks in serial] == [('h1', 'İktisat (400 yayın)'), ('h1', 'İşletme (400 yayın)'), ('h1', 'Maliye (400 yayın)')]
+
+    flat = report_builder.build_report(pubs, report_builder.REPORT_BY_TYPE)
+    numbers = [block[1] for blocks in flat for block in blocks]
+    assert numbers == list(range(1, 1201))
+
+    progress = []
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = report_builder.build_report(pubs, report_builder.REPORT_DETAILED, executor=executor,
+                                               on_progress=lambda done, total: progress.append((done, total)))
+        assert parallel == serial
+        assert progress[-1] == (3, 3)
+        print("Parallel == Serial: PASS")
+
+        merged = report_builder.build_docx(serial, executor=executor)
+
+    from docx import Document
+    doc = Document(io.BytesIO(merged.getvalue()))
+    texts = [p.text for p in doc.paragraphs]
+    assert texts[0] == 'Akademik Yayın Raporu'
+    assert sum(1 for t in texts if t.startswith('1. ')) == 9
+    assert len(texts) == 1 + 3 + 9 + 1200
+    print("DOCX Merge: PASS")
+
+    # Concurrent sessions share one pool
+    created = []
+
+    class SlowPool:
+        def __init__(self, **kwargs):
+            time.sleep(0.05)
+            created.append(self)
+
+    original = report_builder.ProcessPoolExecutor
+    report_builder.ProcessPoolExecutor = SlowPool
+    report_builder._process_pool = None
+    try:
+        pools = []
+        threads = [threading.Thread(target=lambda: pools.append(report_builder.get_process_pool())) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(created) == 1 and all(pool is created[0] for pool in pools)
+    finally:
+        report_builder.ProcessPoolExecutor = original
+        report_builder._process_pool = None
+    print("Shared Process Pool: PASS")
+
+    # A dead worker breaks the pool: the work finishes here and the shared pool is replaced
+    for run in (lambda pool: report_builder.run_chunks(_dies_in_worker, [1, 2, 3], pool),
+                lambda pool: list(report_builder.iter_chunks(_dies_in_worker, [1, 2, 3], pool))):
+        pool = ProcessPoolExecutor(max_workers=1)
+        report_builder._process_pool = pool
+        try:
+            assert run(pool) == [10, 20, 30]
+            assert report_builder._process_pool is None
+            assert run(pool) == [10, 20, 30]   # the broken pool is no longer used
+        finally:
+            pool.shutdown()
+            report_builder._process_pool = None
+    print("Broken Process Pool: PASS")
+
+if __name__ == "__main__":
+    test_report_builder()
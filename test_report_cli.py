@@ -0,0 +1,64 @@
+import csv
+import io
+import os
+import tempfile
+import report_cli
+from storage_backends import SQLiteBackend
+from test_helpers import make_pubs
+
+def test_report_cli():
+    print("Testing Report CLI...")
+
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    try:
+        # Same configuration files as the app, read from the working directory
+        with open("storage_backend.txt", "w") as f:
+            f.write("sqlite")
+        backend = SQLiteBackend("publications.db")
+        backend.init()
+        for pub in make_pubs(30):
+            pub.pop('id')
+            backend.add_publication(pub)
+
+        assert report_cli.main(["-q", "-o", "rapor.md"]) == 0
+        with open("rapor.md", encoding="utf-8") as f:
+            text = f.read()
+        assert text.startswith("# Akademik Yayın Raporu")
+        assert "## İktisat (10 yayın)" in text
+        print("Markdown: PASS")
+
+        assert report_cli.main(["-q", "--style", "mla", "--report", "all", "-o", "mla.md"]) == 0
+        with open("mla.md", encoding="utf-8") as f:
+            text = f.read()
+        assert '1. Yazar0, Ali. "Başlık 0." *Dergi*, 2024.' in text
+        print("Citation Style: PASS")
+
+        assert report_cli.main(["-q", "--report", "type", "--type", "Kitap", "--department", "Maliye", "-o", "kitap.csv"]) == 0
+        with open("kitap.csv", encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == report_cli.CSV_HEADER
+        assert [row[2] for row in rows[1:]] == ["1", "2", "3"]
+        assert all(row[3] == "Kitap" and "*" not in row[4] for row in rows[1:])
+        print("CSV & Filters: PASS")
+
+        assert report_cli.main(["-q", "--report", "person", "--person", "yazar2", "-o", "kisi.docx", "--workers", "0"]) == 0
+        from docx import Document
+        with open("kisi.docx", "rb") as f:
+            texts = [p.text for p in Document(io.BytesIO(f.read())).paragraphs]
+        assert any(t.endswith("Yazar2, Ali (1 yayın)") for t in texts)
+        print("DOCX Person Report: PASS")
+
+        assert report_cli.main(["-q", "--department", "İktisat", "-o", "iktisat.bib"]) == 0
+        with open("iktisat.bib", encoding="utf-8") as f:
+            assert f.read().count("\n@") + 1 == 10
+        print("BibTeX: PASS")
+
+        assert report_cli.main(["-q", "--start", "2030-01-01", "-o", "bos.md"]) == 1
+        print("Empty Result: PASS")
+    finally:
+        os.chdir(cwd)
+
+if __name__ == "__main__":
+    test_report_cli()
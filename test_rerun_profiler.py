@@ -0,0 +1,68 @@
+import marshal
+import time
+import rerun_profiler
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def test_rerun_profiler():
+    print("Testing Rerun Profiler...")
+
+    state = {'admin_unlocked': True}
+    # Off by default: sections cost nothing and nothing is recorded
+    assert rerun_profiler.begin(state, "Sayfa") is None
+    with rerun_profiler.section("Form"):
+        pass
+    rerun_profiler.finish(state, None)
+    assert rerun_profiler.HISTORY_KEY not in state
+
+    rerun_profiler.configure(state, True)
+    profile = rerun_profiler.begin(state, "Raporlama")
+    with rerun_profiler.section("Veri yükleme"):
+        busy(0.01)
+    with rerun_profiler.section("Rapor"):
+        for _ in range(3):
+            with rerun_profiler.section("Atıflar"):
+                busy(0.005)
+    busy(0.005)
+    rerun_profiler.finish(state, profile)
+
+    rows = {name: (depth, seconds, calls) for name, depth, seconds, calls in profile.rows()}
+    assert list(rows) == ["Veri yükleme", "Rapor", "Atıflar", "(bölüm dışı)"]
+    assert rows["Atıflar"][0] == 1 and rows["Atıflar"][2] == 3
+    assert rows["Rapor"][1] >= rows["Atıflar"][1] >= 0.015
+    assert rows["(bölüm dışı)"][1] >= 0.005
+    # Top-level sections and the rest add up to the total
+    top = sum(seconds for depth, seconds, _ in rows.values() if depth == 0)
+    assert abs(top - profile.total) < 1e-6
+    assert profile.stats is None and profile.stats_bytes() is None
+    assert [item['label'] for item in state[rerun_profiler.HISTORY_KEY]] == ["Raporlama"]
+    print("Section Timings: PASS")
+
+    rerun_profiler.configure(state, True, use_cprofile=True)
+    profile = rerun_profiler.begin(state, "Raporlama")
+    # Only one rerun is cProfiled at a time
+    other = rerun_profiler.RerunProfile("Veri Girişi", use_cprofile=True)
+    other.stop()
+    assert other.stats is None and "cProfile" in other.note
+    with rerun_profiler.section("Meşgul"):
+        busy(0.01)
+    rerun_profiler.finish(state, profile)
+    text = profile.to_text(state[rerun_profiler.HISTORY_KEY][:-1])
+    assert "Meşgul" in text and "Önceki çalıştırmalar" in text and "cumulative" in text and "busy" in text
+    stats = marshal.loads(profile.stats_bytes())
+    assert any(func[2] == "busy" for func in stats)
+    assert len(state[rerun_profiler.HISTORY_KEY]) == 2
+    print("cProfile & Download: PASS")
+
+    # Admin only: logging out stops profiling; switching it off drops the history
+    state['admin_unlocked'] = False
+    assert rerun_profiler.begin(state, "Veri Girişi") is None
+    rerun_profiler.configure(state, False)
+    assert rerun_profiler.HISTORY_KEY not in state
+    print("Admin Only: PASS")
+
+if __name__ == "__main__":
+    test_rerun_profiler()
@@ -0,0 +1,106 @@
+import threading
+import time
+from resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, HedgePool, backoff_delays, get_hedge_pool, hedged_call
+
+def test_resilience():
+    print("Testing Resilience Helpers...")
+
+    tracker = LatencyTracker(window=100)
+    assert tracker.percentile(95) is None
+    for ms in range(1, 201):
+        tracker.record(ms / 1000)
+    # Only the last 100 samples count
+    assert len(tracker) == 100
+    assert tracker.percentile(50) == 0.15 and tracker.percentile(95) == 0.195 and tracker.percentile(100) == 0.2
+    print("Latency Percentiles: PASS")
+
+    assert backoff_delays(1) == []
+    assert backoff_delays(5, base=0.5, cap=4, rng=lambda: 1.0) == [0.5, 1.0, 2.0, 4.0]
+    delays = backoff_delays(4, base=0.5, cap=4)
+    assert all(0 <= d <= limit for d, limit in zip(delays, [0.5, 1.0, 2.0]))
+    print("Jittered Backoff: PASS")
+
+    executor = get_hedge_pool()
+    calls = []
+    slow_first = threading.Event()
+
+    def request():
+        calls.append(1)
+        if len(calls) == 1:
+            slow_first.wait(2)   # the first request hangs
+            return "slow"
+        return "fast"
+
+    started = time.monotonic()
+    assert hedged_call(request, 0.05, executor) == "fast"
+    assert time.monotonic() - started < 1 and len(calls) == 2
+    slow_first.set()
+
+    # Fast enough: no second request
+    calls.clear()
+    assert hedged_call(lambda: calls.append(1) or "ok", 1, executor) == "ok" and len(calls) == 1
+
+    # A failing hedge does not hide the other request's result
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            time.sleep(0.2)
+            return "late"
+        raise ValueError("hedge failed")
+
+    assert hedged_call(flaky, 0.05, executor) == "late"
+
+    # Not hedging: the call runs in the calling thread, not in the pool
+    caller = threading.current_thread()
+    assert hedged_call(lambda: threading.current_thread() is caller, None, executor)
+
+    # A pool busy with abandoned requests never delays a call: it runs directly, unhedged
+    busy = HedgePool(max_workers=1)
+    release = threading.Event()
+    assert busy.try_submit(lambda: release.wait(2)) is not None
+    assert busy.try_submit(lambda: None) is None
+    started = time.monotonic()
+    assert hedged_call(lambda: threading.current_thread() is caller, 0.01, busy)
+    assert time.monotonic() - started < 0.5
+    release.set()
+    print("Hedged Calls: PASS")
+
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=lambda: now[0])
+
+    def fail():
+        raise ValueError("down")
+
+    for _ in range(3):
+        try:
+            breaker.call(fail)
+        except ValueError:
+            pass
+    assert breaker.state == CircuitBreaker.OPEN
+    try:
+        breaker.call(lambda: "not called")
+        assert False, "open circuit let a call through"
+    except CircuitOpenError as e:
+        assert e.retry_in == 30
+
+    # Half-open: a single trial call; failing it opens the circuit again
+    now[0] = 31
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+    try:
+        breaker.before_call()
+        assert False, "second trial call allowed"
+    except CircuitOpenError:
+        pass
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] = 62
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+    print("Circuit Breaker: PASS")
+
+if __name__ == "__main__":
+    test_resilience()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+from search_index import InvertedIndex
+from turkish_text import search_key
+from storage_backends import SQLiteBackend
+
+PUBS = [
+    {'id': 1, 'title': 'Türkiye\'de Kamu Politikası Analizi', 'journal_name': 'Amme İdaresi Dergisi',
+     'authors': [{'surname': 'Yılmaz', 'name': 'Ahmet'}], 'publication_date': '2024-01-01'},
+    {'id': 2, 'title': 'Kamu Politikalarında Değişim', 'book_title': 'Politika Yazıları',
+     'publisher': 'İmge', 'authors': [{'surname': 'Işık', 'name': 'Ayşe'}], 'publication_date': '2023-01-01'},
+    {'id': 3, 'title': 'Para Politikası', 'journal_name': 'İktisat Dergisi',
+     'authors': [{'surname': 'Demir', 'name': 'Can'}], 'publication_date': '2022-01-01'},
+]
+
+def test_search():
+    print("Testing Full-Text Search...")
+
+    # Turkish casefold: I -> ı, İ -> i, then ASCII fold
+    assert search_key("IŞIK") == search_key("ışık") == "isik"
+    assert search_key("İMGE") == "imge"
+
+    index = InvertedIndex.from_records(PUBS)
+    assert [p['id'] for p in index.search("kamu politikası")] == [1]
+    # Terms are prefixes: "politika" also finds "Politikalarında"
+    ids = [p['id'] for p in index.search("kamu politika")]
+    assert sorted(ids) == [1, 2]
+    assert [p['id'] for p in index.search("ISIK")] == [2]
+    assert [p['id'] for p in index.search("amme")] == [1]
+    print("In-process Index: PASS")
+
+    backend = SQLiteBackend(os.path.join(tempfile.mkdtemp(), "search.db"))
+    backend.init()
+    assert backend.has_fts
+    for pub in PUBS:
+        backend.add_publication({k: v for k, v in pub.items() if k != 'id'})
+    titles = [p['title'] for p in backend.search("KAMU politika")]
+    assert len(titles) == 2 and 'Para Politikası' not in titles
+    assert [p['title'] for p in backend.search("işık")] == ['Kamu Politikalarında Değişim']
+    assert backend.search("yok böyle bir şey") == []
+    print("SQLite FTS5: PASS")
+
+if __name__ == "__main__":
+    test_search()
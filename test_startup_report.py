@@ -0,0 +1,35 @@
+import os
+import re
+import sys
+import startup_report
+
+def test_startup_report():
+    print("Testing Startup Report...")
+
+    eager, lazy = startup_report.PAGE_IMPORTS, startup_report.LAZY_IMPORTS
+    router = eager[startup_report.ROUTER]
+    assert {'streamlit', 'db_manager', 'rerun_profiler'} <= set(router)
+    assert {'turkish_text', 'apa_formatter'} <= set(eager["Veri Girişi"])
+    assert {'citation_styles', 'report_builder', 'report_export'} <= set(eager["Raporlama (Admin)"])
+    # Pages list only what the router has not imported; the standard library is left out
+    assert not any(m in router for page, modules in eager.items() if page != startup_report.ROUTER for m in modules)
+    assert 'datetime' not in eager["Veri Girişi"]
+    assert 'bibtex_helper' in lazy["Veri Girişi"] and 'docx' in lazy["Raporlama (Admin)"]
+    print("Page Imports: PASS")
+
+    # Every top-level import line of every page is in the report
+    for page, path in startup_report.PAGE_FILES.items():
+        with open(os.path.join(startup_report.ROOT, path), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        for line in lines:
+            match = re.match(r"(?:import|from)\s+([\w.]+)", line)
+            if match and match.group(1).split(".")[0] not in sys.stdlib_module_names:
+                assert match.group(1) in eager[page] + router, (page, line)
+    print("No Drift: PASS")
+
+    assert startup_report.measure_import("json") is not None
+    assert startup_report.measure_import("no_such_module_xyz") is None
+    print("Measure Import: PASS")
+
+if __name__ == "__main__":
+    test_startup_report()
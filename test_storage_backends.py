@@ -0,0 +1,201 @@
+import os
+import sqlite3
+import tempfile
+from unittest import mock
+import requests
+from storage_backends import SUMMARY_FIELDS, AppsScriptBackend, SQLiteBackend, StorageBackend, StorageError
+
+def test_sqlite_backend():
+    print("Testing SQLite Backend...")
+
+    path = os.path.join(tempfile.mkdtemp(), "test_publications.db")
+    backend = SQLiteBackend(path)
+    backend.init()
+
+    conn = backend._connect()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    for idx in ["idx_publications_date", "idx_publications_department",
+                "idx_publications_type", "idx_publication_authors_surname"]:
+        assert idx in indexes, idx
+    print("Schema & WAL: PASS")
+
+    data1 = {
+        'department': 'İktisat',
+        'publication_type': 'Makale',
+        'authors': [{'surname': 'Yılmaz', 'name': 'Ahmet'}],
+        'publication_date': '2024-05-15',
+        'title': 'Paper One',
+        'journal_name': 'J1', 'volume': '1', 'issue': '1', 'pages': '1-2'
+    }
+    data2 = {
+        'department': 'Maliye',
+        'publication_type': 'Kitap Bölümü',
+        'authors': [{'surname': 'Doe', 'name': 'John'}],
+        'editors': [{'surname': 'Smith', 'name': 'Jane'}],
+        'publication_date': '2025-06-20',
+        'title': 'Chapter Two',
+        'book_title': 'Big Book', 'publisher': 'Pub', 'location': 'Ankara'
+    }
+    id1 = backend.add_publication(data1)
+    id2 = backend.add_publication(data2)
+    assert id2 == id1 + 1
+
+    all_pubs = backend.get_publications()
+    assert len(all_pubs) == 2
+    assert all_pubs[0]['authors'] == [{'surname': 'Yılmaz', 'name': 'Ahmet'}]
+    assert all_pubs[0]['department'] == 'İktisat'
+
+    results_2025 = backend.get_publications('2025-01-01', '2025-12-31')
+    assert len(results_2025) == 1
+    assert results_2025[0]['title'] == 'Chapter Two'
+    print("Add & Date Filtering: PASS")
+
+    keys = [row[0] for row in conn.execute("SELECT surname_key FROM publication_authors ORDER BY publication_id")]
+    assert keys == ['yılmaz', 'doe']
+    print("Author Index: PASS")
+
+    summary = backend.get_publications(fields=SUMMARY_FIELDS)
+    assert summary[1] == {'id': id2, 'department': 'Maliye', 'publication_type': 'Kitap Bölümü',
+                          'publication_date': '2025-06-20'}
+    narrow = backend.get_publications('2024-01-01', '2024-12-31', fields=['authors', 'publication_type'])
+    assert narrow == [{'authors': [{'surname': 'Yılmaz', 'name': 'Ahmet'}], 'publication_type': 'Makale'}]
+    print("Field Projection: PASS")
+
+    backend.add_publication({**data1, 'title': 'Paper Three'})
+    counts = backend.get_publication_counts()
+    assert counts == [
+        {'department': 'Maliye', 'publication_type': 'Kitap Bölümü', 'year': 2025, 'count': 1},
+        {'department': 'İktisat', 'publication_type': 'Makale', 'year': 2024, 'count': 2},
+    ]
+    # The generic Python implementation gives the same answer
+    assert StorageBackend.get_publication_counts(backend) == counts
+    assert backend.get_publication_counts('2025-01-01', '2025-12-31') == counts[:1]
+    print("Aggregate Counts: PASS")
+
+    version = backend.get_data_version()
+    assert version == 3
+    backend.add_publication({**data1, 'title': 'Paper Four'})
+    assert backend.get_data_version() == version + 1
+    print("Data Version: PASS")
+
+    assert backend.get_publications()[0]['citation'] == ''
+    id5 = backend.add_publication({**data1, 'title': 'Paper Five', 'citation': 'Yılmaz, A. (2024).', 'citation_version': 1})
+    assert backend.get_publications(fields=['id', 'citation', 'citation_version'])[-1] == {
+        'id': id5, 'citation': 'Yılmaz, A. (2024).', 'citation_version': 1
+    }
+    assert backend.update_citations([(id1, 'Rewritten', 2), (999, 'Missing', 2)]) == 1
+    assert backend.get_publications(fields=['citation', 'citation_version'])[0] == {'citation': 'Rewritten', 'citation_version': 2}
+    print("Stored Citations: PASS")
+
+    # Databases created before the citation columns are migrated on init
+    old_path = os.path.join(tempfile.mkdtemp(), "old.db")
+    old = sqlite3.connect(old_path)
+    old.execute("CREATE TABLE publications (id INTEGER PRIMARY KEY AUTOINCREMENT, publication_type TEXT, "
+                "authors_json TEXT NOT NULL, publication_date DATE NOT NULL, title TEXT NOT NULL, "
+                "journal_name TEXT, volume TEXT, issue TEXT, pages TEXT, publisher TEXT, location TEXT, "
+                "editors TEXT, book_title TEXT, project_status TEXT, funding_agency TEXT, "
+                "created_at DATE DEFAULT CURRENT_DATE)")
+    old.execute("INSERT INTO publications (publication_type, authors_json, publication_date, title) "
+                "VALUES ('Makale', '[]', '2020-01-01', 'Old')")
+    old.commit()
+    old.close()
+    migrated = SQLiteBackend(old_path).get_publications()
+    assert migrated[0]['title'] == 'Old' and migrated[0]['citation'] == '' and migrated[0]['department'] == ''
+    print("Citation Column Migration: PASS")
+
+class FakeResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        if self._data is None:
+            raise ValueError("HTML error page")
+        return self._data
+
+def test_apps_script_resilience():
+    print("Testing Apps Script Resilience...")
+
+    backend = AppsScriptBackend("https://example.invalid/exec")
+    backend._sleep = lambda seconds: None
+
+    # Transient failures are retried, then the answer is used
+    answers = [requests.ConnectionError("reset"), FakeResponse(503), FakeResponse(200, {"version": 7})]
+
+    def get(url, **kwargs):
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    with mock.patch("storage_backends.requests.get", side_effect=get) as fake_get:
+        assert backend.get_data_version() == 7
+        assert fake_get.call_count == 3
+        assert fake_get.call_args.kwargs["timeout"] == AppsScriptBackend.REQUEST_TIMEOUT
+    print("Retries: PASS")
+
+    # Only the full-sheet list of an old deployment turns the version probe off
+    with mock.patch("storage_backends.requests.get", return_value=FakeResponse(200, {"status": "?"})):
+        try:
+            backend.get_data_version()
+            assert False, "unexpected reply accepted"
+        except StorageError:
+            pass
+    with mock.patch("storage_backends.requests.get", return_value=FakeResponse(200, {"version": 8})):
+        assert backend.get_data_version() == 8
+    with mock.patch("storage_backends.requests.get", return_value=FakeResponse(200, [{'id': 1}])) as fake_get:
+        assert backend.get_data_version() is None and backend.get_data_version() is None
+        assert fake_get.call_count == 1
+    backend._has_version = True
+    print("Version Probe: PASS")
+
+    # The date range goes to the script, which reads only the overlapping yearly sheets;
+    # rows outside it are still dropped if an older deployment ignores it
+    rows = [{'id': 1, 'publication_date': '2023-12-31'}, {'id': 2, 'publication_date': '2024-02-01'}]
+    with mock.patch("storage_backends.requests.get", return_value=FakeResponse(200, rows)) as fake_get:
+        assert backend.get_publications('2024-01-01', '2024-12-31', fields=['id']) == [{'id': 2}]
+        assert fake_get.call_args.kwargs["params"] == {
+            'start': '2024-01-01', 'end': '2024-12-31', 'fields': 'id,publication_date'
+        }
+    print("Date Range Sent: PASS")
+
+    # Errors reported by the script itself are not retried
+    with mock.patch("storage_backends.requests.get",
+                    return_value=FakeResponse(200, {"result": "error", "error": "Sayfa yok"})) as fake_get:
+        try:
+            backend.get_publications()
+            assert False, "script error ignored"
+        except StorageError as e:
+            assert "Sayfa yok" in str(e)
+        assert fake_get.call_count == 1
+
+    # Writes that may have been applied are never repeated
+    with mock.patch("storage_backends.requests.post", side_effect=requests.Timeout("slow")) as fake_post:
+        try:
+            backend.add_publication({'title': 'T'})
+            assert False, "timeout ignored"
+        except StorageError:
+            pass
+        assert fake_post.call_count == 1
+    print("No Retry For Script Errors & Writes: PASS")
+
+    # A backend that keeps failing trips the breaker; later calls fail at once
+    with mock.patch("storage_backends.requests.get", return_value=FakeResponse(502)) as fake_get:
+        for _ in range(2):
+            try:
+                backend.get_publication_counts()
+            except StorageError:
+                pass
+        calls = fake_get.call_count
+        try:
+            backend.get_publications()
+            assert False, "open circuit called the backend"
+        except StorageError as e:
+            assert "ulaşılamıyor" in str(e)
+        assert fake_get.call_count == calls
+    print("Circuit Breaker: PASS")
+
+if __name__ == "__main__":
+    test_sqlite_backend()
+    test_apps_script_resilience()
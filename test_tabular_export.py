@@ -0,0 +1,49 @@
+import csv
+import io
+import tabular_export
+from test_helpers import make_pubs
+
+def test_tabular_export():
+    print("Testing Tabular Export...")
+
+    pubs = make_pubs(1203)
+    pubs[0]['editors'] = [{'surname': 'Smith', 'name': 'Jane'}, {'surname': 'Doe', 'name': ''}]
+    pubs[0]['authors'].append({'surname': 'Demir', 'name': 'Ayşe'})
+
+    chunks = list(tabular_export.iter_csv_chunks(pubs, chunk_size=500))
+    assert len(chunks) == 3
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    headers = tabular_export.table_headers()
+    assert rows[0] == headers
+    assert len(rows) == 1 + 1203
+    first = dict(zip(headers, rows[1]))
+    assert first['Yazarlar'] == 'Yazar0, Ali; Demir, Ayşe'
+    assert first['Yazar Sayısı'] == '2'
+    assert first['Editörler'] == 'Smith, Jane; Doe'
+    assert first['Yıl'] == '2024'
+    assert '*' not in first['Atıf - APA 6'] and first['Atıf - APA 6'].startswith('Yazar0, A., Demir, A.')
+
+    # The citation column follows the chosen style
+    apa7 = list(csv.reader(io.StringIO(next(tabular_export.iter_csv_chunks(pubs[:1], style='apa7')))))
+    assert apa7[0][-1] == 'Atıf - APA 7' and apa7[0][:-1] == headers[:-1]
+    assert apa7[1][-1] != first['Atıf - APA 6'] and apa7[1][-1].startswith('Yazar0, A., & Demir, A.')
+    print("CSV: PASS")
+
+    from openpyxl import load_workbook
+    buffer = io.BytesIO()
+    pubs[1]['title'] = 'Başlık\x01 1'
+    tabular_export.write_xlsx(pubs, buffer)
+    sheet = load_workbook(io.BytesIO(buffer.getvalue()), read_only=True).active
+    xlsx_rows = list(sheet.iter_rows(values_only=True))
+    assert list(xlsx_rows[0]) == headers
+    assert len(xlsx_rows) == 1 + 1203
+    assert xlsx_rows[2][headers.index('Başlık')] == 'Başlık 1'
+    assert xlsx_rows[1][headers.index('Yıl')] == 2024
+    buffer = io.BytesIO()
+    tabular_export.write_xlsx(pubs[:1], buffer, style='mla')
+    sheet = load_workbook(io.BytesIO(buffer.getvalue()), read_only=True).active
+    assert next(sheet.iter_rows(values_only=True))[-1] == 'Atıf - MLA 9'
+    print("Excel: PASS")
+
+if __name__ == "__main__":
+    test_tabular_export()
@@ -0,0 +1,43 @@
+import turkish_text
+
+def test_turkish_text():
+    print("Testing Turkish Text Normalization...")
+
+    assert turkish_text.tr_lower("IŞIK İZMİR") == "ışık izmir"
+    assert turkish_text.tr_upper("ışık izmir") == "IŞIK İZMİR"
+    assert turkish_text.search_key("YILMAZ") == turkish_text.search_key("Yılmaz") == "yilmaz"
+    assert turkish_text.search_key("Kamu Politikası") == "kamu politikasi"
+    print("Casefold & Search Keys: PASS")
+
+    assert turkish_text.title_case("IŞIK VE GÖLGE") == "Işık ve Gölge"
+    assert turkish_text.title_case("istanbul için bir yol") == "İstanbul için bir Yol"
+    assert turkish_text.title_case("türkiye'de KAMU yönetimi") == "Türkiye'de Kamu Yönetimi"
+    assert turkish_text.title_case("ve sonra") == "Ve Sonra"
+    assert turkish_text.title_case("İZMİR İLE ISPARTA") == "İzmir ile Isparta"
+    print("Title Case: PASS")
+
+    # English titles and acronyms keep a dotted i: no Turkish letters, no Turkish lowercase
+    assert turkish_text.title_case("POLITICS AND THE IMF") == "Politics And The Imf"
+    assert turkish_text.title_case("Analysis of FDI in the EU") == "Analysis Of Fdi İn The Eu"
+    assert turkish_text.title_case("COVID-19 CRISIS") == "Covid-19 Crisis"
+    assert turkish_text.title_case("JOURNAL OF PUBLIC ECONOMICS") == "Journal Of Public Economics"
+    print("English Titles & Acronyms: PASS")
+
+    record = turkish_text.title_case_publication({
+        'department': 'Siyaset Bilimi ve Kamu Yönetimi',
+        'publication_date': '2024-01-01',
+        'pages': '10-20',
+        'title': 'kamu POLİTİKASI',
+        'authors': [{'surname': 'YILMAZ', 'name': 'ahmet'}],
+        'editors': [{'surname': 'ışık', 'name': 'İPEK'}],
+    })
+    assert record['title'] == "Kamu Politikası"
+    # All caps without Turkish letters cannot be told from English: 'YILMAZ' -> 'Yilmaz'
+    # (search keys fold ı to i, so matching and duplicate detection are unaffected)
+    assert record['authors'] == [{'name': 'Ahmet', 'surname': 'Yilmaz'}]
+    assert record['editors'] == [{'name': 'İpek', 'surname': 'Işık'}]
+    assert record['department'] == 'Siyaset Bilimi ve Kamu Yönetimi'
+    print("Publication Normalization: PASS")
+
+if __name__ == "__main__":
+    test_turkish_text()
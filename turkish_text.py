@@ -0,0 +1,100 @@
+import re
+from functools import lru_cache
+
+# Precompiled translation tables. Python's str.lower()/upper() follow the
+# default Unicode mapping (I -> i, i -> I), which is wrong for Turkish.
+_TR_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_TR_UPPER = str.maketrans({'i': 'İ', 'ı': 'I'})
+_ASCII_FOLD = str.maketrans('ıiğüşöçâîûİIĞÜŞÖÇÂÎÛ', 'iigusocaiuIIGUSOCAIU')
+
+# Words that stay lowercase inside a title (Turkish articles, conjunctions, prepositions)
+LOWERCASE_WORDS = {'ve', 'veya', 'ile', 'için', 'de', 'da', 'den', 'dan', 'bir', 'bu', 'şu', 'o'}
+
+# Keys of a publication record that are not free text and must not be title-cased
+NON_TEXT_FIELDS = {'department', 'publication_type', 'publication_date', 'volume', 'issue', 'pages',
+                   'id', 'created_at'}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+# Letters that only occur in Turkish words; only such words get the Turkish I/ı lowercase
+_TURKISH_LETTERS_RE = re.compile('[ğüşöçıİĞÜŞÖÇ]')
+
+
+def tr_lower(text):
+    """Turkish-correct lowercase: 'IŞIK' -> 'ışık', 'İZMİR' -> 'izmir'."""
+    return str(text).translate(_TR_LOWER).lower()
+
+
+def tr_upper(text):
+    """Turkish-correct uppercase: 'izmir' -> 'İZMİR', 'ışık' -> 'IŞIK'."""
+    return str(text).translate(_TR_UPPER).upper()
+
+
+def ascii_fold(text):
+    """Replaces Turkish letters with their ASCII base letter: 'Işık' -> 'Isik'."""
+    return str(text).translate(_ASCII_FOLD)
+
+
+@lru_cache(maxsize=65536)
+def search_key(text):
+    """
+    Normalized key for matching and indexing: Turkish casefold, then ASCII fold.
+    'YILMAZ', 'Yılmaz' and 'yilmaz' all give 'yilmaz'. Memoized per distinct string.
+    """
+    if not text:
+        return ""
+    return ascii_fold(tr_lower(text))
+
+
+@lru_cache(maxsize=65536)
+def title_case(text):
+    """
+    Convert text to Title Case with Turkish character support.
+    Handles: İ/i, I/ı in the first letter; the rest of a word is lowercased
+    the Turkish way only if the word has Turkish letters, so 'IŞIK' gives
+    'Işık' but 'POLITICS' and 'FDI' give 'Politics' and 'Fdi'
+    Preserves: Conjunctions like "ve", "için", "ile" in lowercase (except the first word)
+    """
+    if not text or not isinstance(text, str):
+        return text
+
+    result = []
+    for i, word in enumerate(_WHITESPACE_RE.split(text.strip())):
+        lowered = tr_lower(word) if _TURKISH_LETTERS_RE.search(word) else word.lower()
+        if i > 0 and lowered in LOWERCASE_WORDS:
+            result.append(lowered)
+        else:
+            # An uppercase first letter is kept as typed ('I' stays 'I'); 'i' -> 'İ', 'ı' -> 'I'
+            first = word[:1] if word[:1].isupper() else tr_upper(word[:1])
+            result.append(first + lowered[1:])
+
+    return ' '.join(result)
+
+
+def title_case_people(people):
+    """Applies title_case to the name and surname of each author/editor dict."""
+    if not isinstance(people, list):
+        return people
+    return [
+        {
+            'name': title_case(person.get('name', '')),
+            'surname': title_case(person.get('surname', ''))
+        }
+        for person in people
+        if isinstance(person, dict)
+    ]
+
+
+def title_case_publication(data):
+    """
+    Returns a copy of a publication record with authors, editors and all free
+    text fields in Turkish title case. Used on save and on bulk import.
+    """
+    normalized = {}
+    for key, value in data.items():
+        if key in ('authors', 'editors'):
+            normalized[key] = title_case_people(value)
+        elif isinstance(value, str) and key not in NON_TEXT_FIELDS:
+            normalized[key] = title_case(value)
+        else:
+            normalized[key] = value
+    return normalized